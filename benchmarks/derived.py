@@ -0,0 +1,134 @@
+""" Benchmark of the derived data of `XcProject` and `XcTarget`.
+
+Generates a project in memory and times reports that read derived sets of files
+inside loops, with the derived data memoized and with the derived data computed
+again at each access, as they were before being memoized.
+
+    python -m benchmarks.derived --files 50000 --targets 50
+"""
+
+import argparse
+import random
+import time
+
+from xcanalyzer.language.models import SwiftType, SwiftTypeType, SwiftAccessibility
+from xcanalyzer.xcodeproject.generators import XcProjReporter
+from xcanalyzer.xcodeproject.models import XcFile, XcGroup, XcProject, XcTarget
+
+
+class UncachedDerivedData(dict):
+    """ Derived data storage which keeps nothing. """
+
+    def __setitem__(self, key, value):
+        pass
+
+
+def generate_project(files_count, targets_count, seed=0):
+    """ Project of `files_count` files in groups of 100 files, shared between `targets_count` targets. """
+    randomizer = random.Random(seed)
+
+    extensions = ['swift'] * 10 + ['m'] * 5 + ['h'] * 4 + ['png']
+
+    groups = []
+    files = []
+    for file_index in range(files_count):
+        group_index = file_index // 100
+        if group_index == len(groups):
+            groups.append(XcGroup('/Group{}'.format(group_index), '/Group{}'.format(group_index)))
+
+        xc_file = XcFile('/Group{}/File{}.{}'.format(group_index, file_index, randomizer.choice(extensions)))
+        if xc_file.is_swift:
+            xc_file.swift_types = [SwiftType(SwiftTypeType.CLASS, 'Type{}'.format(file_index), SwiftAccessibility.INTERNAL)]
+            if randomizer.random() < 0.2:
+                extended_type_name = 'Type{}'.format(randomizer.randrange(files_count))
+                xc_file.swift_types.append(SwiftType(SwiftTypeType.EXTENSION, extended_type_name, SwiftAccessibility.INTERNAL))
+        elif xc_file.is_objc:
+            xc_file.objc_types = []
+
+        groups[-1].files.add(xc_file)
+        files.append(xc_file)
+
+    # 10% of the files are in no target
+    targets = []
+    target_files_count = files_count * 9 // 10
+    for target_index in range(targets_count):
+        target_files = files[target_index * target_files_count // targets_count:(target_index + 1) * target_files_count // targets_count]
+        target = XcTarget('Target{}'.format(target_index),
+                          XcTarget.Type.FRAMEWORK,
+                          product_name='Target{}'.format(target_index),
+                          build_configurations=list(),
+                          source_files={f for f in target_files if f.is_swift or f.is_objc_m},
+                          header_files={f for f in target_files if f.is_objc_h},
+                          resource_files={f for f in target_files if f.filepath.endswith('.png')})
+        if targets:
+            target.dependencies = set(randomizer.sample(targets, min(3, len(targets))))
+        targets.append(target)
+
+    project = XcProject('/', 'Bench', build_configurations=list(), targets=targets, groups=groups, files=set())
+    project.swift_files_parsed = True
+    project.objc_files_parsed = True
+
+    return project
+
+
+def _disable_derived_data_cache(project):
+    project._derived_data = UncachedDerivedData()
+
+    for target in project.targets:
+        target._derived_data = UncachedDerivedData()
+
+
+def _timed_reports(project, names_count):
+    durations = dict()
+    file_names = sorted(f.filename for f in project.files)[-names_count:]
+
+    start = time.perf_counter()
+    XcProjReporter(project).find_orphan_target_missing_files(ignored_dirpaths=set(), ignored_dirs=set())
+    durations['find_orphan_target_missing_files'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for file_name in file_names:
+        project.file_with_name(file_name)
+    durations['file_with_name x{}'.format(names_count)] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    project.target_swift_extensions_grouped_by_scope
+    durations['target_swift_extensions_grouped_by_scope'] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for target in project.targets:
+        target.dependant_source_files | project.target_less_h_files
+    durations['dependant_source_files of every target'] = time.perf_counter() - start
+
+    return durations
+
+
+def run(files_count, targets_count, names_count, seed=0):
+    uncached_project = generate_project(files_count, targets_count, seed)
+    _disable_derived_data_cache(uncached_project)
+    uncached_durations = _timed_reports(uncached_project, names_count)
+
+    cached_project = generate_project(files_count, targets_count, seed)
+    cached_durations = _timed_reports(cached_project, names_count)
+
+    return {report: (uncached_durations[report], cached_durations[report]) for report in cached_durations.keys()}
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the derived data of XcProject and XcTarget.")
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=50000)
+    argument_parser.add_argument('--targets', dest='targets_count', type=int, default=50)
+    argument_parser.add_argument('--names', dest='names_count', type=int, default=200)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    results = run(args.files_count, args.targets_count, args.names_count, args.seed)
+
+    print('{} files, {} targets'.format(args.files_count, args.targets_count))
+    print('{:<45} {:>10} {:>10}'.format('', 'uncached', 'memoized'))
+    for (report, (uncached_duration, cached_duration)) in results.items():
+        print('{:<45} {:>9.3f}s {:>9.3f}s'.format(report, uncached_duration, cached_duration))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+""" Benchmark of the sets of Swift types.
+
+Generates Swift types with inner types, a part of them being extensions of a
+few SDK types, then times the building of the set of every type and of its
+inner types, as `XcTarget.swift_types_filtered` does, with the cached key and
+flattened inner types of `SwiftType`, and with the previous implementation,
+which hashed alike the inner types and extensions of a same name, compared
+fullnames computed again at each comparison and rebuilt the sets of inner types
+recursively.
+
+    python -m benchmarks.identity --types 20000
+    python -m benchmarks.identity --types 100000 --skip-legacy
+"""
+
+import argparse
+import random
+import time
+
+from xcanalyzer.language.models import SwiftAccessibility, SwiftType, SwiftTypeType
+
+
+class LegacySwiftType(SwiftType):
+    """ Swift type with the previous implementation of the equality and of the inner types. """
+
+    __slots__ = ()
+
+    def __eq__(self, other):
+        return self.type_identifier == other.type_identifier and \
+            self.fullname == other.fullname and \
+            self.accessibility == other.accessibility and \
+            (self.type_identifier != SwiftTypeType.EXTENSION or self.discriminant == other.discriminant)
+
+    def __hash__(self):
+        return hash((self.type_identifier, self.name, self.accessibility))
+
+    @property
+    def fullname(self):
+        names = [self.name]
+
+        parent = self.parent_type
+        while parent:
+            names.append(parent.name)
+            parent = parent.parent_type
+
+        return '.'.join(reversed(names))
+
+    def inner_types_all_filtered(self, type_not_in=set()):
+        results = set()
+
+        for inner_type in self.inner_types:
+            results.add(inner_type)
+            results |= inner_type.inner_types_all
+
+        return {t for t in results if t.type_identifier not in type_not_in}
+
+
+EXTENDED_TYPE_NAMES = ['String', 'Int', 'Date', 'UIView', 'UIViewController', 'UIColor', 'URL', 'Array']
+KINDS = [SwiftTypeType.CLASS, SwiftTypeType.STRUCT, SwiftTypeType.ENUM, SwiftTypeType.PROTOCOL]
+
+
+def generate_types(types_count, swift_type_class, seed=0):
+    """ Top level Swift types of about `types_count` types, inner types included. """
+    randomizer = random.Random(seed)
+
+    top_level_types = list()
+    count = 0
+    while count < types_count:
+        index = len(top_level_types)
+
+        # One type out of five is an extension of an SDK type, with the file and index as discriminant
+        if index % 5 == 0:
+            swift_type = swift_type_class(SwiftTypeType.EXTENSION,
+                                          randomizer.choice(EXTENDED_TYPE_NAMES),
+                                          SwiftAccessibility.INTERNAL,
+                                          discriminant='/File{}.swift_{}'.format(index // 10, index))
+        else:
+            swift_type = swift_type_class(randomizer.choice(KINDS), 'Type{}'.format(index), SwiftAccessibility.INTERNAL)
+        count += 1
+
+        # Inner types, with inner types of their own
+        inner_types = list()
+        for inner_index in range(randomizer.randrange(4)):
+            inner_type = swift_type_class(randomizer.choice(KINDS), 'Inner{}'.format(inner_index), SwiftAccessibility.PRIVATE)
+            inner_type.parent_type = swift_type
+            count += 1
+
+            if randomizer.random() < 0.3:
+                inner_inner_type = swift_type_class(SwiftTypeType.ENUM, 'Kind', SwiftAccessibility.PRIVATE)
+                inner_inner_type.parent_type = inner_type
+                inner_type.inner_types = [inner_inner_type]
+                count += 1
+
+            inner_types.append(inner_type)
+
+        if inner_types:
+            swift_type.inner_types = inner_types
+        top_level_types.append(swift_type)
+
+    return top_level_types
+
+
+def types_set(top_level_types, type_not_in):
+    """ Set of the types and of their inner types, as built by `XcTarget.swift_types_filtered`. """
+    results = set(t for t in top_level_types if t.type_identifier not in type_not_in)
+
+    for swift_type in top_level_types:
+        results |= swift_type.inner_types_all_filtered(type_not_in=type_not_in)
+
+    return results
+
+
+def _timed_sets(top_level_types, repeat):
+    durations = list()
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        all_types = types_set(top_level_types, type_not_in=set())
+        non_extension_types = types_set(top_level_types, type_not_in={SwiftTypeType.EXTENSION})
+        durations.append(time.perf_counter() - start)
+
+    return (len(all_types), len(non_extension_types)), durations
+
+
+def run(types_count, repeat=3, seed=0, legacy=True):
+    counts, durations = _timed_sets(generate_types(types_count, SwiftType, seed), repeat)
+
+    result = {
+        'types_count': counts[0],
+        'seconds': durations,
+    }
+
+    # The previous implementation is quadratic in the count of types with a same name
+    if legacy:
+        legacy_counts, legacy_durations = _timed_sets(generate_types(types_count, LegacySwiftType, seed), repeat)
+        result['legacy_seconds'] = legacy_durations
+        result['identical'] = legacy_counts == counts
+
+    return result
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the sets of Swift types.")
+    argument_parser.add_argument('--types', dest='types_count', type=int, default=100000)
+    argument_parser.add_argument('--repeat', dest='repeat', type=int, default=3)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    argument_parser.add_argument('--skip-legacy', dest='skip_legacy', action='store_true',
+                                 help="Does not time the previous implementation, which takes minutes above 20000 types.")
+    args = argument_parser.parse_args()
+
+    result = run(args.types_count, args.repeat, args.seed, legacy=not args.skip_legacy)
+
+    print('{} distinct types'.format(result['types_count']))
+    print('{:<20} {:>10} {:>10}'.format('', 'first', 'next'))
+    timings = [('Cached key', result['seconds'])]
+    if 'legacy_seconds' in result:
+        timings.insert(0, ('Fullname by access', result['legacy_seconds']))
+    for (label, durations) in timings:
+        print('{:<20} {:>9.3f}s {:>9.3f}s'.format(label, durations[0], min(durations[1:] or durations)))
+    if 'identical' in result:
+        print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+""" Benchmark of the loading of an Xcode project.
+
+Builds a large pbxproj by replicating the objects of the sample project, then
+times `XcProjectParser.load` and measures its peak memory with the lean loader,
+which reads the decoded objects directly, and with the `pbxproj.XcodeProject`
+wrapper.
+
+    python -m benchmarks.load --copies 200
+"""
+
+import argparse
+import tempfile
+import time
+import tracemalloc
+
+from xcanalyzer.xcodeproject.parsers import XcProjectParser
+from xcanalyzer.xcodeproject.tests.helpers import generate_tree, project_summary, write_project
+
+
+def _timed_load(folder_path, lean_load):
+    project_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, lean_load=lean_load)
+
+    start = time.perf_counter()
+    project_parser.load()
+    duration = time.perf_counter() - start
+
+    return project_parser.xc_project, duration
+
+
+def _peak_memory_of_load(folder_path, lean_load):
+    project_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, lean_load=lean_load)
+
+    tracemalloc.start()
+    project_parser.load()
+    _, peak_size = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return peak_size
+
+
+def run(copies_count):
+    with tempfile.TemporaryDirectory() as folder_path:
+        tree = generate_tree(copies_count)
+        write_project(folder_path, tree)
+        objects_count = len(tree['objects'])
+
+        wrapper_project, wrapper_duration = _timed_load(folder_path, lean_load=False)
+        lean_project, lean_duration = _timed_load(folder_path, lean_load=True)
+
+        wrapper_peak_size = _peak_memory_of_load(folder_path, lean_load=False)
+        lean_peak_size = _peak_memory_of_load(folder_path, lean_load=True)
+
+    return {
+        'objects_count': objects_count,
+        'targets_count': len(lean_project.targets),
+        'wrapper_seconds': wrapper_duration,
+        'lean_seconds': lean_duration,
+        'wrapper_peak_bytes': wrapper_peak_size,
+        'lean_peak_bytes': lean_peak_size,
+        'identical': project_summary(wrapper_project) == project_summary(lean_project),
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the loading of an Xcode project.")
+    argument_parser.add_argument('--copies', dest='copies_count', type=int, default=200)
+    args = argument_parser.parse_args()
+
+    result = run(args.copies_count)
+
+    print('{} copies of the sample project: {} objects, {} targets'.format(args.copies_count,
+                                                                         result['objects_count'],
+                                                                         result['targets_count']))
+    print('pbxproj.XcodeProject: {:.3f}s, peak {:.1f} MB'.format(result['wrapper_seconds'], result['wrapper_peak_bytes'] / 1e6))
+    print('Lean loader:          {:.3f}s, peak {:.1f} MB'.format(result['lean_seconds'], result['lean_peak_bytes'] / 1e6))
+    print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
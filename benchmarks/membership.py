@@ -0,0 +1,135 @@
+""" Benchmark of the target membership of the project files.
+
+Generates a project in memory, then times the membership reports of
+`XcProjReporter` (files shared between targets and files counters) and the
+targets of some files, with the file ids and bitsets of `XcProject`, and with
+loops over sets of files, as they were before. The first run of the bitsets
+includes the building of the file index and of the bitsets of the targets.
+
+    python -m benchmarks.membership --files 80000 --targets 200
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from xcanalyzer.xcodeproject.generators import XcProjReporter
+from .derived import generate_project
+
+
+def legacy_shared_files(project):
+    """ Targets of the files of at least two targets, by filepath. """
+    file_targets = dict()
+
+    for target in project.targets:
+        for target_file in target.files:
+            if target_file in file_targets:
+                file_targets[target_file].add(target)
+            else:
+                file_targets[target_file] = set([target])
+
+    return {f.filepath: targets for (f, targets) in file_targets.items() if len(targets) >= 2}
+
+
+def legacy_files_counters(project):
+    """ Counts of the files of the targets, by kind. """
+    source_files = set()
+    resource_files = set()
+    header_files = set()
+    linked_files = set()
+
+    for target in project.targets:
+        source_files |= target.source_files
+        resource_files |= target.resource_files
+        header_files |= target.header_files
+        linked_files |= target.linked_files
+
+    header_files |= project.target_less_h_files
+
+    swift_count = len([f for f in source_files if f.is_swift])
+    objc_count = len([f for f in source_files if f.is_objc_m])
+
+    return {
+        'source': len(source_files),
+        'swift': swift_count,
+        'm': objc_count,
+        'other_source': len(source_files) - swift_count - objc_count,
+        'resource': len(resource_files),
+        'header': len(header_files),
+        'linked': len(linked_files),
+        'total': len(source_files) + len(resource_files) + len(header_files) + len(linked_files),
+    }
+
+
+def legacy_membership(project, files):
+    return (legacy_shared_files(project),
+            legacy_files_counters(project),
+            [[t for t in project.targets if f in t.files] for f in files])
+
+
+def bitset_membership(project, files):
+    output = io.StringIO()
+    with contextlib.redirect_stdout(output):
+        XcProjReporter(project).print_shared_files()
+
+    return (output.getvalue(),
+            XcProjReporter(project).files_counters,
+            [project.targets_of_file(f) for f in files])
+
+
+def _timed_membership(project, files, membership_function):
+    project.invalidate_derived_data()
+
+    # Derived files of the targets are not timed: both implementations use them
+    project.target_less_h_files
+    for target in project.targets:
+        target.files
+
+    durations = list()
+    for _ in range(2):
+        start = time.perf_counter()
+        results = membership_function(project, files)
+        durations.append(time.perf_counter() - start)
+
+    return results, durations
+
+
+def run(files_count, targets_count, queries_count, seed=0):
+    project = generate_project(files_count, targets_count, seed)
+    files = sorted(project.files, key=lambda f: f.filepath)[::max(1, files_count // queries_count)]
+
+    legacy_results, legacy_durations = _timed_membership(project, files, legacy_membership)
+    results, durations = _timed_membership(project, files, bitset_membership)
+
+    # Same shared filepaths, counters and targets by file
+    shared_filepaths = {line.split(' [')[0] for line in results[0].splitlines()}
+
+    return {
+        'legacy_seconds': legacy_durations,
+        'bitset_seconds': durations,
+        'identical': shared_filepaths == set(legacy_results[0].keys()) and
+                     results[1] == legacy_results[1] and
+                     [set(t) for t in results[2]] == [set(t) for t in legacy_results[2]],
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the target membership of the project files.")
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=80000)
+    argument_parser.add_argument('--targets', dest='targets_count', type=int, default=200)
+    argument_parser.add_argument('--queries', dest='queries_count', type=int, default=1000)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    result = run(args.files_count, args.targets_count, args.queries_count, args.seed)
+
+    print('{} files, {} targets'.format(args.files_count, args.targets_count))
+    print('{:<15} {:>10} {:>10}'.format('', 'first', 'next'))
+    for (label, durations) in [('Sets of files', result['legacy_seconds']), ('Bitsets', result['bitset_seconds'])]:
+        print('{:<15} {:>9.3f}s {:>9.3f}s'.format(label, *durations))
+    print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
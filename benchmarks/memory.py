@@ -0,0 +1,145 @@
+""" Benchmark of the memory used by the parsed models of a project.
+
+Generates the JSON structures of Swift files, as given by SourceKitten, and the
+sources of Objective-C files, then parses them into `XcFile`, `SwiftType` and
+`ObjcType` models and reports the bytes allocated by file and by type, with
+`tracemalloc`, and the size of the pickled models.
+
+    python -m benchmarks.memory --files 20000 --types 15
+"""
+
+import argparse
+import gc
+import json
+import pickle
+import random
+import tracemalloc
+
+from xcanalyzer.language.objc_scanner import objc_declarations
+from xcanalyzer.xcodeproject.models import XcFile
+from xcanalyzer.xcodeproject.parsers import ObjcFileParser, SwiftFileParser
+from .objc_scanner import generate_source
+
+
+SWIFT_KINDS = ['class'] * 4 + ['struct'] * 3 + ['enum'] * 2 + ['extension'] * 2 + ['protocol']
+INHERITED_TYPES = ['NSObject', 'Codable', 'Equatable', 'UIViewController', 'UITableViewDelegate']
+ACCESSIBILITIES = ['internal'] * 6 + ['public', 'private', 'fileprivate', 'open']
+
+
+def generate_swift_structure(file_index, types_count, randomizer):
+    """ JSON text of the SourceKitten structure of a Swift file declaring `types_count` types. """
+    substructures = list()
+
+    for index in range(types_count):
+        type_name = 'Type{}x{}'.format(file_index, index)
+
+        # Members whose types are used by the type, and inner types for some of them
+        members = [{'key.kind': 'source.lang.swift.decl.var.local',
+                    'key.name': 'member{}'.format(member_index),
+                    'key.typename': 'Type{}x{}'.format(randomizer.randrange(file_index + 1), randomizer.randrange(types_count))}
+                   for member_index in range(randomizer.randrange(3))]
+        if randomizer.random() < 0.3:
+            members.append({'key.kind': 'source.lang.swift.decl.enum',
+                            'key.name': 'Inner',
+                            'key.accessibility': 'source.lang.swift.accessibility.private'})
+
+        substructures.append({
+            'key.kind': 'source.lang.swift.decl.{}'.format(randomizer.choice(SWIFT_KINDS)),
+            'key.name': type_name,
+            'key.accessibility': 'source.lang.swift.accessibility.{}'.format(randomizer.choice(ACCESSIBILITIES)),
+            'key.inheritedtypes': [{'key.name': n} for n in randomizer.sample(INHERITED_TYPES, randomizer.randrange(3))],
+            'key.substructure': members,
+        })
+
+    return json.dumps({'key.substructure': substructures})
+
+
+def generate_corpus(files_count, types_count, seed=0):
+    """ Pairs of file path and JSON structure or Objective-C source, one file out of three being Objective-C. """
+    randomizer = random.Random(seed)
+
+    corpus = list()
+    for file_index in range(files_count):
+        if file_index % 3:
+            corpus.append(('/Sources/Folder{}/File{}.swift'.format(file_index // 100, file_index),
+                           generate_swift_structure(file_index, types_count, randomizer)))
+        else:
+            corpus.append(('/Sources/Folder{}/File{}.{}'.format(file_index // 100, file_index, 'h' if file_index % 2 else 'm'),
+                           generate_source(types_count, randomizer)))
+
+    return corpus
+
+
+def parse_corpus(corpus):
+    """ Parsed models of the files of the corpus. """
+    xc_files = list()
+
+    for (filepath, content) in corpus:
+        xc_file = XcFile(filepath)
+
+        if xc_file.is_swift:
+            swift_file_parser = SwiftFileParser('', xc_file)
+            swift_file_parser.set_swift_types(swift_file_parser.swift_types_from_structure(json.loads(content)))
+        else:
+            ObjcFileParser(None, xc_file).set_objc_types(*objc_declarations(content))
+
+        xc_files.append(xc_file)
+
+    return xc_files
+
+
+def types_count_of(xc_files):
+    count = 0
+
+    for xc_file in xc_files:
+        if xc_file.is_swift:
+            for swift_type in xc_file.swift_types:
+                count += 1 + len(swift_type.inner_types_all)
+        else:
+            count += len(xc_file.objc_types) + len(xc_file.objc_interfaces)
+
+    return count
+
+
+def run(files_count, types_count, seed=0):
+    corpus = generate_corpus(files_count, types_count, seed)
+
+    # Bytes still allocated once the intermediate structures are released
+    gc.collect()
+    tracemalloc.start()
+    xc_files = parse_corpus(corpus)
+    gc.collect()
+    allocated_bytes, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    models_count = types_count_of(xc_files)
+    pickled_bytes = len(pickle.dumps(xc_files, pickle.HIGHEST_PROTOCOL))
+
+    return {
+        'files_count': files_count,
+        'types_count': models_count,
+        'allocated_bytes': allocated_bytes,
+        'pickled_bytes': pickled_bytes,
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the memory used by the parsed models of a project.")
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=20000)
+    argument_parser.add_argument('--types', dest='types_count', type=int, default=15)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    result = run(args.files_count, args.types_count, args.seed)
+
+    print('{} files, {} types and interfaces'.format(result['files_count'], result['types_count']))
+    print('{:<10} {:>10} {:>12} {:>12}'.format('', 'MB', 'bytes/file', 'bytes/type'))
+    for (label, size) in [('allocated', result['allocated_bytes']), ('pickled', result['pickled_bytes'])]:
+        print('{:<10} {:>10.1f} {:>12.0f} {:>12.0f}'.format(label,
+                                                          size / 1e6,
+                                                          size / result['files_count'],
+                                                          size / result['types_count']))
+
+
+if __name__ == '__main__':
+    main()
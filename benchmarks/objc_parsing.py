@@ -0,0 +1,104 @@
+""" Benchmark of the parsing of the Objective-C files of a project.
+
+Writes a generated Objective-C corpus to a temporary folder, then times
+`XcProjectParser.parse_objc_files` with one job and with several jobs, and
+checks that both give the same types and superclasses.
+
+    python -m benchmarks.objc_parsing --files 400 --declarations 500 --jobs 4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from xcanalyzer.xcodeproject.models import XcFile, XcProject, XcTarget
+from xcanalyzer.xcodeproject.parsers import XcProjectParser
+from .objc_scanner import generate_source
+
+
+def write_corpus(folder_path, files_count, declarations_count, seed=0):
+    """ Writes `files_count` generated headers and implementations in the folder, returns their paths. """
+    randomizer = random.Random(seed)
+
+    filepaths = list()
+    for index in range(files_count):
+        filepath = '/File{}.{}'.format(index, 'h' if index % 2 else 'm')
+        with open(folder_path + filepath, 'w') as opened_file:
+            opened_file.write(generate_source(declarations_count, randomizer))
+        filepaths.append(filepath)
+
+    return filepaths
+
+
+def generate_project(folder_path, filepaths, targets_count):
+    """ Project whose targets share the files, one file out of ten being a target less header. """
+    files = [XcFile(filepath) for filepath in filepaths]
+    target_files = [f for (index, f) in enumerate(files) if f.is_objc_m or index % 10]
+
+    targets = list()
+    for target_index in range(targets_count):
+        files_slice = target_files[target_index::targets_count]
+        targets.append(XcTarget('Target{}'.format(target_index),
+                                XcTarget.Type.FRAMEWORK,
+                                product_name='Target{}'.format(target_index),
+                                build_configurations=list(),
+                                source_files={f for f in files_slice if f.is_objc_m},
+                                header_files={f for f in files_slice if f.is_objc_h}))
+
+    return XcProject(folder_path, 'Bench', build_configurations=list(), targets=targets, groups=list(), files=set(files))
+
+
+def objc_types_summary(xc_project):
+    """ Comparable content of the Objective-C types of the project files. """
+    return sorted((f.filepath, [(t.type_identifier, t.name, t.super_class_name) for t in f.objc_types])
+                  for f in xc_project.files if f.is_objc)
+
+
+def _timed_parsing(folder_path, filepaths, targets_count, jobs):
+    project_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, jobs=jobs)
+    project_parser.xc_project = generate_project(folder_path, filepaths, targets_count)
+
+    start = time.perf_counter()
+    project_parser.parse_objc_files()
+    duration = time.perf_counter() - start
+
+    return objc_types_summary(project_parser.xc_project), duration
+
+
+def run(files_count, declarations_count, targets_count, jobs, seed=0):
+    with tempfile.TemporaryDirectory() as folder_path:
+        filepaths = write_corpus(folder_path, files_count, declarations_count, seed)
+        megabytes = sum(os.path.getsize(folder_path + filepath) for filepath in filepaths) / 1e6
+
+        serial_results, serial_duration = _timed_parsing(folder_path, filepaths, targets_count, jobs=1)
+        parallel_results, parallel_duration = _timed_parsing(folder_path, filepaths, targets_count, jobs=jobs)
+
+    return {
+        'megabytes': megabytes,
+        'serial_seconds': serial_duration,
+        'parallel_seconds': parallel_duration,
+        'identical': serial_results == parallel_results,
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the parsing of the Objective-C files of a project.")
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=400)
+    argument_parser.add_argument('--declarations', dest='declarations_count', type=int, default=500)
+    argument_parser.add_argument('--targets', dest='targets_count', type=int, default=5)
+    argument_parser.add_argument('--jobs', dest='jobs', type=int, default=os.cpu_count() or 1)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    result = run(args.files_count, args.declarations_count, args.targets_count, args.jobs, args.seed)
+
+    print('{} files, {:.1f} MB'.format(args.files_count, result['megabytes']))
+    print('1 job:             {:.3f}s'.format(result['serial_seconds']))
+    print('{} jobs:{}{:.3f}s'.format(args.jobs, ' ' * (11 - len(str(args.jobs))), result['parallel_seconds']))
+    print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,125 @@
+""" Benchmark of the scanning of Objective-C declarations.
+
+Generates a corpus of large Objective-C headers and implementations, then
+compares the throughput in MB/s of the single pass scanner used by
+`ObjcFileParser` with the previous implementation, which ran one regex per
+kind of declaration on every line.
+
+    python -m benchmarks.objc_scanner --files 20 --declarations 2000
+"""
+
+import argparse
+import random
+import re
+import time
+
+from xcanalyzer.language.models import ObjcEnumType, ObjcInterface, ObjcType, ObjcTypeType
+from xcanalyzer.language.objc_scanner import objc_declarations
+
+
+def legacy_objc_declarations(source):
+    """ Implementation of `objc_declarations` with one regex per kind of declaration and per line. """
+    objc_types = list()
+    objc_interfaces = list()
+
+    for line in source.splitlines(keepends=True):
+        for match in re.finditer(r'@interface\s+(\w+)\s*:\s*(\w+)', line):
+            objc_interfaces.append(ObjcInterface(class_name=match.group(1), super_class_name=match.group(2)))
+
+        for match in re.finditer(r'@implementation\s+(\w+)\s*(\{)?\s*$', line):
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.CLASS, name=match.group(1)))
+
+        for match in re.finditer(r'@implementation\s+(\w+)\s+\((\w*)\)', line):
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.CATEGORY, name=match.group(1), category_name=match.group(2)))
+
+        for enum_type in ObjcEnumType.ALL:
+            regex = r'typedef ' + enum_type + r'\(\w+, (\w+)\)( \{)?'
+            for match in re.finditer(regex, line):
+                objc_types.append(ObjcType(type_identifier=ObjcTypeType.ENUM, name=match.group(1)))
+
+        for match in re.finditer(r'#define (\w+) +', line):
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.MACRO_CONSTANT, name=match.group(1)))
+
+        for match in re.finditer(r'\* ?const +(\w+)', line):
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.CONSTANT, name=match.group(1)))
+
+        for match in re.finditer(r'@protocol (\w+) *[^\w; ].*', line):
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.PROTOCOL, name=match.group(1)))
+
+    return objc_types, objc_interfaces
+
+
+def generate_source(declarations_count, randomizer):
+    """ Objective-C source of `declarations_count` declarations, each followed by a few lines of code and comments. """
+    templates = [
+        '@interface Class{index} : NSObject <NSCopying>\n@property (nonatomic, strong) NSString *name{index};\n@end\n',
+        '@implementation Class{index}\n- (void)method{index} {{\n    NSLog(@"Class{index}");\n}}\n@end\n',
+        '@implementation NSString (Category{index})\n@end\n',
+        'typedef NS_ENUM(NSInteger, Enum{index}) {{\n    Enum{index}First,\n    Enum{index}Second\n}};\n',
+        'typedef NS_OPTIONS(NSUInteger, Options{index}) {{\n    Options{index}First = 1 << 0\n}};\n',
+        '#define macroConstant{index} @"value{index}"\n',
+        'extern NSString * const constant{index};\n',
+        '@protocol Protocol{index} <NSObject>\n- (void)protocolMethod{index};\n@end\n',
+    ]
+    filler_lines = [
+        '// Documentation of the next declaration\n',
+        '/* Block comment of the next declaration */\n',
+        '- (instancetype)initWithValue:(NSInteger)value count:(NSUInteger)count;\n',
+        '\n',
+    ]
+
+    lines = []
+    for index in range(declarations_count):
+        lines.extend(randomizer.choice(filler_lines) for _ in range(randomizer.randrange(1, 6)))
+        lines.append(randomizer.choice(templates).format(index=index))
+
+    return ''.join(lines)
+
+
+def declarations_summary(objc_types, objc_interfaces):
+    """ Comparable content of the declarations, whatever their order. """
+    return (sorted((t.type_identifier, t.name, t.category_name or '') for t in objc_types),
+            sorted((i.class_name, i.super_class_name) for i in objc_interfaces))
+
+
+def _timed_scanning(sources, scanner):
+    start = time.perf_counter()
+    results = [scanner(source) for source in sources]
+    duration = time.perf_counter() - start
+
+    return [declarations_summary(*r) for r in results], duration
+
+
+def run(files_count, declarations_count, seed=0):
+    randomizer = random.Random(seed)
+    sources = [generate_source(declarations_count, randomizer) for _ in range(files_count)]
+    megabytes = sum(len(source.encode('utf-8')) for source in sources) / 1e6
+
+    legacy_results, legacy_duration = _timed_scanning(sources, legacy_objc_declarations)
+    results, duration = _timed_scanning(sources, objc_declarations)
+
+    return {
+        'megabytes': megabytes,
+        'legacy_seconds': legacy_duration,
+        'scanner_seconds': duration,
+        'identical': legacy_results == results,
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the scanning of Objective-C declarations.")
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=20)
+    argument_parser.add_argument('--declarations', dest='declarations_count', type=int, default=2000)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    result = run(args.files_count, args.declarations_count, args.seed)
+
+    print('{} files, {:.1f} MB'.format(args.files_count, result['megabytes']))
+    print('Regex per line:    {:.3f}s, {:.1f} MB/s'.format(result['legacy_seconds'], result['megabytes'] / result['legacy_seconds']))
+    print('Single pass:       {:.3f}s, {:.1f} MB/s'.format(result['scanner_seconds'], result['megabytes'] / result['scanner_seconds']))
+    print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
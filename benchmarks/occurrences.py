@@ -0,0 +1,119 @@
+""" Benchmark of the search of type occurrences in source files.
+
+Compares `XcProjectParser._find_files_that_contains` with the previous
+implementation, which searched every line with one regex per type. The
+search is timed with an empty token index (cold), with an empty token
+index built by several jobs (cold, sharded) and with an index already
+built (warm).
+
+    python -m benchmarks.occurrences --types 2000 --files 200 --jobs 4
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from xcanalyzer.language.models import ObjcType, ObjcTypeType
+from xcanalyzer.xcodeproject.models import XcFile, XcProject
+from xcanalyzer.xcodeproject.parsers import XcProjectParser
+from xcanalyzer.xcodeproject.tests.helpers import legacy_find_files_that_contains, occurrences_summary
+
+
+def generate_sources(folder_path, types_count, files_count, lines_count, seed=0):
+    """ Writes Objective-C like files using the generated types and returns the project parser, types and files. """
+    randomizer = random.Random(seed)
+
+    type_names = ['BenchType{}'.format(index) for index in range(types_count)]
+    words = ['self', 'return', 'nil', 'NSString', 'init', 'value', 'count', '[', ']', '*', ';', '=', '.', ':']
+
+    xc_files = set()
+    for file_index in range(files_count):
+        xc_file = XcFile('/Bench{}.m'.format(file_index))
+        xc_files.add(xc_file)
+
+        lines = []
+        for _ in range(lines_count):
+            tokens = randomizer.choices(words, k=8)
+            if randomizer.random() < 0.3:
+                tokens.insert(randomizer.randrange(len(tokens) + 1), randomizer.choice(type_names))
+            prefix = '// ' if randomizer.random() < 0.05 else '    '
+            lines.append(prefix + ' '.join(tokens))
+
+        with open(''.join([folder_path, xc_file.filepath]), 'w') as opened_file:
+            opened_file.write('\n'.join(lines))
+            opened_file.write('\n')
+
+    xc_files_list = sorted(xc_files, key=lambda f: f.filepath)
+    swift_objc_types = set()
+    for (index, type_name) in enumerate(type_names):
+        objc_type = ObjcType(ObjcTypeType.CLASS, type_name)
+        objc_type.file = xc_files_list[index % files_count]
+        swift_objc_types.add(objc_type)
+
+    return bench_project_parser(folder_path, xc_files), swift_objc_types, xc_files
+
+
+def bench_project_parser(folder_path, xc_files, jobs=1):
+    """ Parser of a project made of the files, with an empty token index. """
+    project_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, jobs=jobs)
+    project_parser.xcode_proj_name = 'Bench.xcodeproj'
+    project_parser.xc_project = XcProject(folder_path, 'Bench', build_configurations=list(), targets=list(), groups=list(), files=xc_files)
+
+    return project_parser
+
+
+def run(types_count, files_count, lines_count, jobs=1, seed=0):
+    with tempfile.TemporaryDirectory() as folder_path:
+        project_parser, swift_objc_types, xc_files = generate_sources(folder_path, types_count, files_count, lines_count, seed)
+
+        start = time.perf_counter()
+        legacy_occurrences = legacy_find_files_that_contains(project_parser, swift_objc_types, xc_files)
+        legacy_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        occurrences = project_parser._find_files_that_contains(swift_objc_types, xc_files)
+        cold_duration = time.perf_counter() - start
+
+        start = time.perf_counter()
+        warm_occurrences = project_parser._find_files_that_contains(swift_objc_types, xc_files)
+        warm_duration = time.perf_counter() - start
+
+        sharded_project_parser = bench_project_parser(folder_path, xc_files, jobs=jobs)
+        start = time.perf_counter()
+        sharded_occurrences = sharded_project_parser._find_files_that_contains(swift_objc_types, xc_files)
+        sharded_duration = time.perf_counter() - start
+
+    legacy_summary = occurrences_summary(legacy_occurrences)
+
+    return {
+        'legacy_seconds': legacy_duration,
+        'cold_seconds': cold_duration,
+        'sharded_seconds': sharded_duration,
+        'warm_seconds': warm_duration,
+        'identical': legacy_summary == occurrences_summary(occurrences) == occurrences_summary(warm_occurrences) == occurrences_summary(sharded_occurrences),
+    }
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the search of type occurrences in source files.")
+    argument_parser.add_argument('--types', dest='types_count', type=int, default=2000)
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=200)
+    argument_parser.add_argument('--lines', dest='lines_count', type=int, default=200)
+    argument_parser.add_argument('--jobs', dest='jobs', type=int, default=os.cpu_count() or 1)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    result = run(args.types_count, args.files_count, args.lines_count, args.jobs, args.seed)
+
+    print('{} types, {} files of {} lines'.format(args.types_count, args.files_count, args.lines_count))
+    print('Regex by type: {:.3f}s'.format(result['legacy_seconds']))
+    print('Index (cold):  {:.3f}s'.format(result['cold_seconds']))
+    print('Index (cold, {} jobs): {:.3f}s'.format(args.jobs, result['sharded_seconds']))
+    print('Index (warm):  {:.3f}s'.format(result['warm_seconds']))
+    print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+""" Benchmark of the scaling of the building of the project model.
+
+Generates decoded pbxproj trees with one flat group of file references, and one
+target for every 100 files, each target depending on the previous one. Then
+times `XcProjectParser.build_project` for each count of file references: the
+time by file reference stays about the same when the building is linear.
+
+    python -m benchmarks.scaling --files 1000 10000 100000
+"""
+
+import argparse
+import time
+
+from xcanalyzer.xcodeproject.parsers import XcProjectParser
+from xcanalyzer.xcodeproject.tests.helpers import generate_flat_tree
+
+
+def _timed_build(tree):
+    project_parser = XcProjectParser('/Bench', verbose=False, cache_active=False)
+    project_parser.xcode_proj_name = 'Bench.xcodeproj'
+
+    start = time.perf_counter()
+    project_parser.build_project(tree)
+    duration = time.perf_counter() - start
+
+    return project_parser.xc_project, duration
+
+
+def run(files_counts):
+    results = list()
+
+    for files_count in files_counts:
+        tree = generate_flat_tree(files_count)
+        xc_project, duration = _timed_build(tree)
+
+        assert len(xc_project.files) == files_count
+
+        results.append({
+            'files_count': files_count,
+            'objects_count': len(tree['objects']),
+            'targets_count': len(xc_project.targets),
+            'seconds': duration,
+        })
+
+    return results
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the scaling of the building of the project model.")
+    argument_parser.add_argument('--files', dest='files_counts', type=int, nargs='+', default=[1000, 10000, 100000])
+    args = argument_parser.parse_args()
+
+    print('{:>10} {:>10} {:>8} {:>10} {:>12}'.format('files', 'objects', 'targets', 'seconds', 'µs by file'))
+    for result in run(args.files_counts):
+        print('{:>10} {:>10} {:>8} {:>10.3f} {:>12.1f}'.format(result['files_count'],
+                                                              result['objects_count'],
+                                                              result['targets_count'],
+                                                              result['seconds'],
+                                                              result['seconds'] * 1e6 / result['files_count']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,296 @@
+""" Benchmark suite of the phases of an analysis, at several project sizes.
+
+Generates a synthetic project for each size, records the `sourcekitten
+structure` output of its Swift files, with `sourcekitten` when it is on the
+`PATH` and with the in-process scanner otherwise, then times:
+- `XcProjectParser.load`, without cache and from the pickle cache,
+- `parse_swift_files`, replaying the recorded structures,
+- `parse_objc_files`,
+- `_find_files_that_contains` and `_find_types_that_contains` for the types
+  of every target, apart from extensions, categories and inner types,
+- `find_duplicate_type_names` for the app target,
+- `XcTarget.view_controllers` of every target,
+- the main `XcProjReporter` reports.
+
+Results are written as JSON with `--output`. With `--baseline`, they are
+compared to the results of a previous run: a phase slower than its baseline by
+more than the threshold is a regression, and the exit status is 1.
+
+    python -m benchmarks.suite --sizes small medium --output results.json
+    python -m benchmarks.suite --sizes small medium --baseline results.json --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import shutil
+import sys
+import tempfile
+import time
+
+from xcanalyzer.argparse import parse_ignored_folders
+from xcanalyzer.language.models import ObjcTypeType, SwiftTypeType
+from xcanalyzer.xcodeproject.generators import XcProjReporter
+from xcanalyzer.xcodeproject.parsers import NativeStructureReader, SourceKittenStructureReader, XcProjectParser
+from .swift_backends import RecordedStructureReader
+from .synthetic import SyntheticProjectGenerator
+
+
+# Version of the results format
+RESULTS_VERSION = 1
+
+# Options of the synthetic project generator by size
+SIZES = {
+    'small': {'targets_count': 3, 'files_per_target': 20},
+    'medium': {'targets_count': 10, 'files_per_target': 100},
+    'large': {'targets_count': 20, 'files_per_target': 300},
+}
+
+# Name of the app target of the synthetic projects
+APP_TARGET_NAME = 'SyntheticApp'
+
+
+class RecordedProjectParser(XcProjectParser):
+    """ Project parser reading the structures of the Swift files from recorded JSON files. """
+
+    def __init__(self, project_folder_path, structures_path, **kwargs):
+        super().__init__(project_folder_path, **kwargs)
+        self.structures_path = structures_path
+
+    def _swift_structure_reader(self):
+        return RecordedStructureReader(self.structures_path)
+
+
+def record_structures(xc_project, structures_path):
+    """ Records the structures of the Swift files of the project, and returns the name of the recording backend. """
+    structure_reader = SourceKittenStructureReader() if shutil.which('sourcekitten') else NativeStructureReader()
+
+    os.makedirs(structures_path, exist_ok=True)
+
+    swift_files = set()
+    for target in xc_project.targets:
+        swift_files |= target.swift_files
+
+    try:
+        for swift_file in swift_files:
+            filepath = xc_project.relative_path_for_file(swift_file)
+            structure_filepath = os.path.join(structures_path, '{}.json'.format(os.path.basename(filepath)))
+            with open(structure_filepath, 'w') as structure_file:
+                json.dump(structure_reader.structure(filepath), structure_file)
+    finally:
+        structure_reader.close()
+
+    return structure_reader.NAME
+
+
+def _timed(function, repeat, setup=None):
+    """ Durations of `function(setup())`, the setup being not timed. """
+    durations = list()
+
+    for _ in range(repeat):
+        argument = setup() if setup else None
+
+        start = time.perf_counter()
+        function(argument)
+        durations.append(time.perf_counter() - start)
+
+    return durations
+
+
+def _printed(function):
+    """ Calls the function with its output discarded, and returns its result. """
+    with contextlib.redirect_stdout(io.StringIO()):
+        return function()
+
+
+def _without_derived_data(xc_project):
+    xc_project.invalidate_derived_data()
+    for target in xc_project.targets:
+        target.invalidate_derived_data()
+
+    return xc_project
+
+
+def _without_types_derived_data(xc_project):
+    xc_project.invalidate_types_derived_data()
+
+    return xc_project
+
+
+def run_size(folder_path, generator_options, repeat=3, jobs=None):
+    """ Project summary and phases durations for a project generated with the options, in the given empty folder. """
+    project_folder_path = os.path.join(folder_path, 'Synthetic')
+    structures_path = os.path.join(folder_path, 'structures')
+    cache_folder_path = os.path.join(folder_path, 'cache')
+    os.makedirs(cache_folder_path)
+
+    project_summary = SyntheticProjectGenerator(**generator_options).write(project_folder_path)
+
+    def loaded_parser(cache_active=False):
+        parser = RecordedProjectParser(project_folder_path,
+                                       structures_path,
+                                       verbose=False,
+                                       cache_active=cache_active,
+                                       jobs=jobs,
+                                       cache_folder_path=cache_folder_path)
+        parser.load()
+        return parser
+
+    # Parsed project for the searches and the reports
+    parser = loaded_parser()
+    recorded_with = record_structures(parser.xc_project, structures_path)
+    parser.parse_swift_files()
+    parser.parse_objc_files()
+
+    xc_project = parser.xc_project
+    app_target = xc_project.target_with_name(APP_TARGET_NAME)
+
+    # Searched types, as for `find_occurrences_from_types`: no extensions nor categories,
+    # and no inner types, as the inner types of different types can have the same name.
+    swift_objc_types = set()
+    for target in xc_project.targets:
+        swift_objc_types |= {t for t in target.swift_types if t.type_identifier != SwiftTypeType.EXTENSION and t.fullname == t.name}
+        swift_objc_types |= {t for t in target.objc_types if t.type_identifier != ObjcTypeType.CATEGORY}
+    source_files = set(xc_project.source_files)
+
+    def parser_without_token_index():
+        parser._token_index = None
+        return parser
+
+    # Pickle cache of the project
+    loaded_parser(cache_active=True)
+
+    reporter = XcProjReporter(xc_project)
+    ignored_dirpaths, ignored_dirs = parse_ignored_folders({'DerivedData/', '.git/'})
+
+    phases = [
+        ('load_cold', lambda _: loaded_parser(), None),
+        ('load_cached', lambda _: loaded_parser(cache_active=True), None),
+        ('parse_swift_files', lambda p: p.parse_swift_files(), loaded_parser),
+        ('parse_objc_files', lambda p: p.parse_objc_files(), loaded_parser),
+        ('find_files_that_contains', lambda p: p._find_files_that_contains(swift_objc_types, source_files), parser_without_token_index),
+        ('find_types_that_contains', lambda p: _printed(lambda: p._find_types_that_contains(swift_objc_types, source_files)), parser_without_token_index),
+        ('find_duplicate_type_names', lambda _: parser.find_duplicate_type_names(from_target=app_target), lambda: _without_types_derived_data(xc_project)),
+        ('view_controllers', lambda p: [t.view_controllers for t in p.targets], lambda: _without_types_derived_data(xc_project)),
+        ('report_files_by_targets', lambda _: _printed(reporter.print_files_by_targets), lambda: _without_derived_data(xc_project)),
+        ('report_shared_files', lambda _: _printed(reporter.print_shared_files), lambda: _without_derived_data(xc_project)),
+        ('report_types', lambda _: _printed(lambda: (reporter.print_types_by_file(languages={'swift', 'objc'}, display_files=False),
+                                                     reporter.print_types_summary(languages={'swift', 'objc'}))),
+                         lambda: _without_derived_data(xc_project)),
+        ('report_view_controllers', lambda _: _printed(lambda: reporter.print_view_controllers(APP_TARGET_NAME)), lambda: _without_derived_data(xc_project)),
+        ('report_orphan_files', lambda _: reporter.find_orphan_files(ignored_dirpaths, ignored_dirs, mode='all'), lambda: _without_derived_data(xc_project)),
+    ]
+
+    results = {
+        'project': project_summary,
+        'recorded_with': recorded_with,
+        'phases': dict(),
+    }
+    for (name, function, setup) in phases:
+        durations = _timed(function, repeat, setup)
+        results['phases'][name] = {'seconds': durations, 'min_seconds': min(durations)}
+
+    return results
+
+
+def run(size_names, repeat=3, jobs=None, seed=0):
+    """ Results of the suite for the given sizes, as stored in JSON. """
+    results = {
+        'version': RESULTS_VERSION,
+        'python': platform.python_version(),
+        'repeat': repeat,
+        'seed': seed,
+        'sizes': dict(),
+    }
+
+    for size_name in size_names:
+        generator_options = dict(SIZES[size_name], seed=seed)
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            results['sizes'][size_name] = run_size(folder_path, generator_options, repeat, jobs)
+
+    return results
+
+
+def compare(results, baseline, threshold=0.2, noise_seconds=0.001):
+    """ Regressions of the results from the baseline, sorted by size and phase.
+
+    A phase regresses when its fastest duration exceeds the baseline one by more
+    than the `threshold` ratio and by more than `noise_seconds`. The phases and
+    sizes missing from one of the results are not compared.
+    """
+    if baseline.get('version') != results.get('version'):
+        raise ValueError("Baseline results version {} differs from {}.".format(baseline.get('version'), results.get('version')))
+
+    regressions = list()
+
+    for (size_name, size_results) in sorted(results['sizes'].items()):
+        baseline_phases = baseline['sizes'].get(size_name, dict()).get('phases', dict())
+
+        for (phase_name, phase_results) in sorted(size_results['phases'].items()):
+            if phase_name not in baseline_phases:
+                continue
+
+            seconds = phase_results['min_seconds']
+            baseline_seconds = baseline_phases[phase_name]['min_seconds']
+
+            if seconds > baseline_seconds * (1 + threshold) and seconds - baseline_seconds > noise_seconds:
+                regressions.append({
+                    'size': size_name,
+                    'phase': phase_name,
+                    'baseline_seconds': baseline_seconds,
+                    'seconds': seconds,
+                    'ratio': seconds / baseline_seconds if baseline_seconds else float('inf'),
+                })
+
+    return regressions
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark suite of the phases of an analysis, at several project sizes.")
+    argument_parser.add_argument('--sizes', dest='sizes', nargs='+', choices=list(SIZES), default=['small', 'medium'])
+    argument_parser.add_argument('--repeat', dest='repeat', type=int, default=3)
+    argument_parser.add_argument('-j', '--jobs', dest='jobs', type=int)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    argument_parser.add_argument('-o', '--output', dest='output', help='JSON file in which the results are written.')
+    argument_parser.add_argument('-b', '--baseline', dest='baseline', help='JSON file of the results to compare with.')
+    argument_parser.add_argument('-t', '--threshold', dest='threshold', type=float, default=0.2,
+                                 help='Slowdown ratio from the baseline above which a phase regresses.')
+    args = argument_parser.parse_args()
+
+    results = run(args.sizes, args.repeat, args.jobs, args.seed)
+
+    if args.output:
+        with open(args.output, 'w') as output_file:
+            json.dump(results, output_file, indent=2, sort_keys=True)
+
+    # Fastest durations by phase and size
+    phase_names = list(results['sizes'][args.sizes[0]]['phases'])
+    print('{:<26}'.format('') + ''.join('{:>12}'.format(s) for s in args.sizes))
+    for phase_name in phase_names:
+        durations = [results['sizes'][s]['phases'][phase_name]['min_seconds'] for s in args.sizes]
+        print('{:<26}'.format(phase_name) + ''.join('{:>11.4f}s'.format(d) for d in durations))
+
+    if not args.baseline:
+        return
+
+    with open(args.baseline) as baseline_file:
+        baseline = json.load(baseline_file)
+
+    regressions = compare(results, baseline, args.threshold)
+
+    print()
+    if not regressions:
+        print('No regression from {} (threshold {:.0%})'.format(args.baseline, args.threshold))
+        return
+
+    for regression in regressions:
+        print('Regression {size} {phase}: {baseline_seconds:.4f}s -> {seconds:.4f}s (x{ratio:.2f})'.format(**regression))
+    sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,124 @@
+""" Benchmark of the Swift structure backends.
+
+Times the parsing of the Swift types of the sample project files having a
+recorded `sourcekitten structure` output, with the recorded JSON replayed into
+`SwiftCodeParser` and with the in-process scanner, then checks that both give
+the same types. When a `sourcekitten` executable is on the `PATH`, the
+`sourcekitten` backend is timed as well, and so is the `sourcekitten-server`
+backend when its structure server command is given by `XCANALYZER_STRUCTURE_SERVER`.
+
+    python -m benchmarks.swift_backends --repeat 200
+"""
+
+import argparse
+import json
+import os
+import shutil
+import time
+
+from xcanalyzer.xcodeproject.models import XcFile
+from xcanalyzer.xcodeproject.parsers import NativeStructureReader, SourceKittenServerStructureReader, SourceKittenStructureReader, SwiftFileParser, SwiftStructureReader
+
+
+package_folder_path = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Absolute path of the sample Xcode project folder
+sample_project_folder_path = os.path.join(package_folder_path, 'SampleiOSApp')
+
+# Recorded outputs of `sourcekitten structure` for files of the sample project
+recorded_structures_path = os.path.join(package_folder_path, 'xcanalyzer', 'xcodeproject', 'tests', 'sourcekitten', 'structures')
+
+
+class RecordedStructureReader(SwiftStructureReader):
+    """ Structure of a Swift file read from its recorded `sourcekitten structure` output, named after the file. """
+
+    def __init__(self, structures_path=recorded_structures_path):
+        self.structures_path = structures_path
+
+    def structure(self, filepath):
+        structure_filepath = os.path.join(self.structures_path, '{}.json'.format(os.path.basename(filepath)))
+        with open(structure_filepath) as structure_file:
+            return json.load(structure_file)
+
+
+def recorded_xc_files(project_folder_path=sample_project_folder_path):
+    """ Swift files of the project having a recorded structure, sorted by path. """
+    filenames = {f[:-len('.json')] for f in os.listdir(recorded_structures_path)}
+
+    xc_files = []
+    for (dirpath, _, files) in os.walk(project_folder_path):
+        for filename in files:
+            if filename in filenames:
+                filepath = os.path.join(dirpath, filename)[len(project_folder_path):]
+                xc_files.append(XcFile(filepath))
+
+    return sorted(xc_files, key=lambda f: f.filepath)
+
+
+def swift_types_summary(swift_types):
+    """ Comparable content of the Swift types and of their inner types. """
+    return [(t.type_identifier,
+             t.fullname,
+             t.accessibility,
+             sorted(t.raw_inherited_types),
+             t.discriminant,
+             swift_types_summary(t.inner_types)) for t in swift_types]
+
+
+def _timed_parsing(xc_files, structure_reader, repeat_count):
+    results = dict()
+
+    start = time.perf_counter()
+    for _ in range(repeat_count):
+        file_parsers = [SwiftFileParser(sample_project_folder_path, f, structure_reader=structure_reader) for f in xc_files]
+        structures = structure_reader.structures([p.filepath for p in file_parsers])
+        for file_parser, file_structure in zip(file_parsers, structures):
+            results[file_parser.xc_file.filepath] = swift_types_summary(file_parser.swift_types_from_structure(file_structure))
+    structure_reader.close()
+    duration = time.perf_counter() - start
+
+    return results, duration
+
+
+def run(repeat_count):
+    xc_files = recorded_xc_files()
+
+    recorded_results, recorded_duration = _timed_parsing(xc_files, RecordedStructureReader(), repeat_count)
+    native_results, native_duration = _timed_parsing(xc_files, NativeStructureReader(), repeat_count)
+
+    result = {
+        'files_count': len(xc_files),
+        'recorded_seconds': recorded_duration,
+        'native_seconds': native_duration,
+        'identical': recorded_results == native_results,
+    }
+
+    if shutil.which('sourcekitten'):
+        _, result['sourcekitten_seconds'] = _timed_parsing(xc_files, SourceKittenStructureReader(), repeat_count)
+
+    server_reader = SourceKittenServerStructureReader()
+    if os.environ.get(server_reader.COMMAND_ENVIRONMENT_VARIABLE) and shutil.which(server_reader.command[0]):
+        _, result['sourcekitten_server_seconds'] = _timed_parsing(xc_files, server_reader, repeat_count)
+
+    return result
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the Swift structure backends.")
+    argument_parser.add_argument('--repeat', dest='repeat_count', type=int, default=200)
+    args = argument_parser.parse_args()
+
+    result = run(args.repeat_count)
+
+    print('{} files parsed {} times'.format(result['files_count'], args.repeat_count))
+    if 'sourcekitten_seconds' in result:
+        print('sourcekitten:              {:.3f}s'.format(result['sourcekitten_seconds']))
+    if 'sourcekitten_server_seconds' in result:
+        print('sourcekitten-server:       {:.3f}s'.format(result['sourcekitten_server_seconds']))
+    print('Recorded JSON replayed:    {:.3f}s'.format(result['recorded_seconds']))
+    print('Native scanner:            {:.3f}s'.format(result['native_seconds']))
+    print('Identical results: {}'.format(result['identical']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,423 @@
+""" Generator of synthetic Xcode projects.
+
+Writes a project folder with a `Synthetic.xcodeproj/project.pbxproj` and the
+Swift and Objective-C sources of its targets: framework targets depending on
+previous ones and an application target, each with nested groups, variant
+groups of localized strings, an `Info.plist`, and source files declaring types
+with inner types, view controller hierarchies and references to the types of
+the target and of its dependencies. The same options and seed give the same
+project, byte for byte.
+
+    python -m benchmarks.synthetic /tmp/Synthetic --targets 20 --files 500 --types 4
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+
+from pbxproj import XcodeProject
+
+from xcanalyzer.xcodeproject.tests.helpers import TreeGenerator
+
+
+SWIFT_KINDS = ['class', 'struct', 'struct', 'enum', 'protocol', 'extension']
+
+
+class SyntheticProjectGenerator():
+    """ Generator of a synthetic project folder, deterministic for a given seed. """
+
+    def __init__(self,
+                 targets_count=5,
+                 files_per_target=50,
+                 types_per_file=3,
+                 inner_types_depth=1,
+                 references_per_type=2,
+                 groups_depth=2,
+                 groups_per_group=3,
+                 variant_groups_per_target=1,
+                 dependencies_per_target=2,
+                 objc_ratio=0.25,
+                 view_controllers_ratio=0.2,
+                 seed=0):
+        self.targets_count = targets_count
+        self.files_per_target = files_per_target
+        self.types_per_file = types_per_file
+        self.inner_types_depth = inner_types_depth
+        self.references_per_type = references_per_type
+        self.groups_depth = groups_depth
+        self.groups_per_group = groups_per_group
+        self.variant_groups_per_target = variant_groups_per_target
+        self.dependencies_per_target = dependencies_per_target
+        self.objc_ratio = objc_ratio
+        self.view_controllers_ratio = view_controllers_ratio
+        self.seed = seed
+
+    # Targets and types
+
+    def _target_name(self, target_index):
+        if target_index == self.targets_count - 1:
+            return 'SyntheticApp'
+        return 'Module{}'.format(target_index)
+
+    def _plan_targets(self, randomizer):
+        """ Targets with their dependencies and the names of the types declared by each of their files. """
+        targets = list()
+
+        for target_index in range(self.targets_count):
+            dependencies = sorted(randomizer.sample(range(target_index), min(target_index, self.dependencies_per_target)))
+
+            files = list()
+            for file_index in range(self.files_per_target):
+                if randomizer.random() < self.objc_ratio:
+                    files.append({'language': 'objc', 'name': 'ObjcClass{}x{}'.format(target_index, file_index)})
+                else:
+                    kinds = ['class'] + [randomizer.choice(SWIFT_KINDS) for _ in range(self.types_per_file - 1)]
+                    files.append({'language': 'swift',
+                                  'name': 'File{}x{}'.format(target_index, file_index),
+                                  'types': [(kind, 'Type{}x{}x{}'.format(target_index, file_index, type_index))
+                                            for (type_index, kind) in enumerate(kinds)]})
+
+            targets.append({'index': target_index,
+                            'name': self._target_name(target_index),
+                            'dependencies': dependencies,
+                            'files': files})
+
+        return targets
+
+    def _visible_names(self, targets, target):
+        """ Swift types which can be extended or referenced, and Objective-C classes, of the target and of its dependencies. """
+        if 'visible_names' in target:
+            return target['visible_names']
+
+        swift_names = list()
+        objc_names = list()
+
+        for visible_target in [targets[i] for i in target['dependencies']] + [target]:
+            for source_file in visible_target['files']:
+                if source_file['language'] == 'objc':
+                    objc_names.append(source_file['name'])
+                else:
+                    swift_names.extend(n for (k, n) in source_file['types'] if k in {'class', 'struct', 'enum'})
+
+        target['visible_names'] = (swift_names, objc_names)
+        return target['visible_names']
+
+    def _super_class(self, randomizer, name, target, view_controllers):
+        """ Super class of a class: a view controller declared before in the target or in a dependency, or not. """
+        if randomizer.random() >= self.view_controllers_ratio:
+            return 'NSObject'
+
+        visible_view_controllers = list(view_controllers[target['index']][-10:])
+        for dependency_index in target['dependencies']:
+            visible_view_controllers.extend(view_controllers[dependency_index][-10:])
+
+        view_controllers[target['index']].append(name)
+        return randomizer.choice(visible_view_controllers + ['UIViewController'])
+
+    # Sources
+
+    def _swift_inner_types(self, randomizer, referenced_names, depth, indent):
+        if depth == 0:
+            return []
+
+        padding = '    ' * indent
+        lines = ['{}struct Inner{} {{'.format(padding, depth)]
+        lines.append('{}    let value: {}'.format(padding, randomizer.choice(referenced_names)))
+        lines.extend(self._swift_inner_types(randomizer, referenced_names, depth - 1, indent + 1))
+        lines.append('{}}}'.format(padding))
+
+        return lines
+
+    def _swift_source(self, randomizer, source_file, target, targets, view_controllers):
+        swift_names, objc_names = self._visible_names(targets, target)
+        referenced_names = swift_names + objc_names
+
+        lines = ['import UIKit']
+        lines.extend('import {}'.format(targets[i]['name']) for i in target['dependencies'])
+        lines.append('')
+
+        for (kind, name) in source_file['types']:
+            references = [randomizer.choice(referenced_names) for _ in range(self.references_per_type)]
+
+            if kind == 'class':
+                super_class = self._super_class(randomizer, name, target, view_controllers)
+                lines.append('class {}: {} {{'.format(name, super_class))
+                lines.extend('    var reference{}: {}?'.format(i, r) for (i, r) in enumerate(references))
+
+            elif kind == 'struct':
+                lines.append('struct {} {{'.format(name))
+                lines.extend('    let reference{}: {}'.format(i, r) for (i, r) in enumerate(references))
+
+            elif kind == 'enum':
+                lines.append('enum {} {{'.format(name))
+                lines.extend('    case reference{}({})'.format(i, r) for (i, r) in enumerate(references))
+
+            elif kind == 'protocol':
+                lines.append('protocol {} {{'.format(name))
+                lines.extend('    var reference{}: {} {{ get }}'.format(i, r) for (i, r) in enumerate(references))
+
+            else:
+                lines.append('extension {} {{'.format(randomizer.choice(swift_names or ['String'])))
+                lines.extend('    func use{}() -> {}? {{ return nil }}'.format(i, r) for (i, r) in enumerate(references))
+
+            if kind in {'class', 'struct', 'enum'}:
+                lines.extend(self._swift_inner_types(randomizer, referenced_names, self.inner_types_depth, 1))
+
+            lines.extend(['}', ''])
+
+        return '\n'.join(lines)
+
+    def _objc_sources(self, randomizer, source_file, target, targets, view_controllers):
+        _, objc_names = self._visible_names(targets, target)
+        name = source_file['name']
+        references = [randomizer.choice(objc_names) for _ in range(self.references_per_type)]
+
+        super_class = self._super_class(randomizer, name, target, view_controllers)
+
+        header_lines = ['#import <UIKit/UIKit.h>', '']
+        header_lines.extend('@class {};'.format(r) for r in sorted(set(references)))
+        header_lines.append('')
+        for enum_index in range(self.types_per_file - 1):
+            header_lines.extend(['typedef NS_ENUM(NSInteger, {}Kind{}) {{'.format(name, enum_index),
+                                 '    {}Kind{}First,'.format(name, enum_index),
+                                 '    {}Kind{}Second'.format(name, enum_index),
+                                 '};', ''])
+        header_lines.append('@interface {} : {}'.format(name, super_class))
+        header_lines.extend('@property (nonatomic, strong) {} *reference{};'.format(r, i) for (i, r) in enumerate(references))
+        header_lines.extend(['@end', ''])
+
+        implementation_lines = ['#import "{}.h"'.format(name), '', '@implementation {}'.format(name), '']
+        for (i, reference) in enumerate(references):
+            implementation_lines.extend(['- (void)use{} {{'.format(i),
+                                         '    {} *value = self.reference{}; // {}'.format(reference, i, reference),
+                                         '}', ''])
+        implementation_lines.extend(['@end', ''])
+
+        return '\n'.join(header_lines), '\n'.join(implementation_lines)
+
+    # Groups
+
+    def _group_paths(self, target_name):
+        """ Folder paths of the groups of the target, the target group first, in breadth first order. """
+        group_paths = [target_name]
+
+        level_paths = [target_name]
+        for depth in range(self.groups_depth):
+            level_paths = ['{}/Group{}x{}'.format(p, depth, i) for p in level_paths for i in range(self.groups_per_group)]
+            group_paths.extend(level_paths)
+
+        return group_paths
+
+    # Writing
+
+    def write(self, folder_path):
+        """ Writes the project in the folder, and returns the counts of what it contains. """
+        randomizer = random.Random(self.seed)
+        generator = TreeGenerator()
+        targets = self._plan_targets(randomizer)
+
+        summary = {'targets': len(targets), 'files': 0, 'swift_files': 0, 'objc_files': 0, 'swift_types': 0,
+                   'objc_classes': 0, 'view_controllers': 0}
+        view_controllers = {t['index']: list() for t in targets}
+
+        def write_file(relative_path, content):
+            filepath = os.path.join(folder_path, relative_path)
+            os.makedirs(os.path.dirname(filepath), exist_ok=True)
+            with open(filepath, 'w') as opened_file:
+                opened_file.write(content)
+
+        def add_file_reference(relative_path, file_type):
+            summary['files'] += 1
+            return generator.add({'isa': 'PBXFileReference',
+                                  'lastKnownFileType': file_type,
+                                  'path': os.path.basename(relative_path),
+                                  'sourceTree': '<group>'})
+
+        target_group_keys = list()
+        product_keys = list()
+        target_keys = list()
+
+        for target in targets:
+            is_app = target['index'] == self.targets_count - 1
+            group_paths = self._group_paths(target['name'])
+            group_children = {p: list() for p in group_paths}
+
+            sources_keys = list()
+            headers_keys = list()
+            resources_keys = list()
+
+            # Source files, spread over the groups
+            for (file_index, source_file) in enumerate(target['files']):
+                group_path = group_paths[file_index % len(group_paths)]
+
+                if source_file['language'] == 'swift':
+                    relative_path = '{}/{}.swift'.format(group_path, source_file['name'])
+                    write_file(relative_path, self._swift_source(randomizer, source_file, target, targets, view_controllers))
+
+                    file_key = add_file_reference(relative_path, 'sourcecode.swift')
+                    group_children[group_path].append(file_key)
+                    sources_keys.append(generator.add({'isa': 'PBXBuildFile', 'fileRef': file_key}))
+
+                    summary['swift_files'] += 1
+                    for (kind, _) in source_file['types']:
+                        summary['swift_types'] += 1
+                        if kind in {'class', 'struct', 'enum'}:
+                            summary['swift_types'] += self.inner_types_depth
+                else:
+                    header, implementation = self._objc_sources(randomizer, source_file, target, targets, view_controllers)
+
+                    for (extension, content, file_type) in [('h', header, 'sourcecode.c.h'), ('m', implementation, 'sourcecode.c.objc')]:
+                        relative_path = '{}/{}.{}'.format(group_path, source_file['name'], extension)
+                        write_file(relative_path, content)
+
+                        file_key = add_file_reference(relative_path, file_type)
+                        group_children[group_path].append(file_key)
+                        build_file_key = generator.add({'isa': 'PBXBuildFile', 'fileRef': file_key})
+                        (headers_keys if extension == 'h' else sources_keys).append(build_file_key)
+
+                    summary['objc_files'] += 2
+                    summary['objc_classes'] += 1
+
+            # Localized strings in variant groups
+            for variant_index in range(self.variant_groups_per_target):
+                filename = 'Localizable{}.strings'.format(variant_index)
+
+                variant_keys = list()
+                for language in ['en', 'fr']:
+                    relative_path = '{}/{}.lproj/{}'.format(target['name'], language, filename)
+                    write_file(relative_path, '"key{}" = "{}";\n'.format(variant_index, language))
+
+                    summary['files'] += 1
+                    variant_keys.append(generator.add({'isa': 'PBXFileReference',
+                                                       'lastKnownFileType': 'text.plist.strings',
+                                                       'name': language,
+                                                       'path': '{}.lproj/{}'.format(language, filename),
+                                                       'sourceTree': '<group>'}))
+
+                variant_group_key = generator.add({'isa': 'PBXVariantGroup', 'children': variant_keys, 'name': filename, 'sourceTree': '<group>'})
+                group_children[target['name']].append(variant_group_key)
+                resources_keys.append(generator.add({'isa': 'PBXBuildFile', 'fileRef': variant_group_key}))
+
+            # Info.plist, in the target group but built by no phase
+            info_plist_path = '{}/Info.plist'.format(target['name'])
+            write_file(info_plist_path, '<?xml version="1.0" encoding="UTF-8"?>\n<plist version="1.0">\n<dict/>\n</plist>\n')
+            group_children[target['name']].append(add_file_reference(info_plist_path, 'text.plist.xml'))
+
+            # Groups, from the deepest ones
+            group_keys = dict()
+            for group_path in reversed(group_paths):
+                children = list(group_children[group_path])
+                children[:0] = [group_keys[p] for p in group_paths if p.rsplit('/', 1)[0] == group_path and p != group_path]
+                group_keys[group_path] = generator.add({'isa': 'PBXGroup',
+                                                        'children': children,
+                                                        'path': group_path.rsplit('/', 1)[-1],
+                                                        'sourceTree': '<group>'})
+            target_group_keys.append(group_keys[target['name']])
+
+            # Product and build phases, linking the frameworks of the dependencies
+            product_path = '{}.{}'.format(target['name'], 'app' if is_app else 'framework')
+            product_keys.append(generator.add({'isa': 'PBXFileReference',
+                                               'explicitFileType': 'wrapper.application' if is_app else 'wrapper.framework',
+                                               'includeInIndex': '0',
+                                               'path': product_path,
+                                               'sourceTree': 'BUILT_PRODUCTS_DIR'}))
+
+            frameworks_keys = [generator.add({'isa': 'PBXBuildFile', 'fileRef': product_keys[i]}) for i in target['dependencies']]
+            build_phase_keys = [generator.add({'isa': 'PBXSourcesBuildPhase', 'buildActionMask': '2147483647', 'files': sources_keys, 'runOnlyForDeploymentPostprocessing': '0'}),
+                                generator.add({'isa': 'PBXFrameworksBuildPhase', 'buildActionMask': '2147483647', 'files': frameworks_keys, 'runOnlyForDeploymentPostprocessing': '0'}),
+                                generator.add({'isa': 'PBXResourcesBuildPhase', 'buildActionMask': '2147483647', 'files': resources_keys, 'runOnlyForDeploymentPostprocessing': '0'})]
+            if not is_app:
+                build_phase_keys.insert(0, generator.add({'isa': 'PBXHeadersBuildPhase', 'buildActionMask': '2147483647', 'files': headers_keys, 'runOnlyForDeploymentPostprocessing': '0'}))
+
+            dependency_keys = [generator.add({'isa': 'PBXTargetDependency', 'target': target_keys[i]}) for i in target['dependencies']]
+
+            target_keys.append(generator.add({
+                'isa': 'PBXNativeTarget',
+                'buildConfigurationList': self._add_configuration_list(generator, target['name'], info_plist_path),
+                'buildPhases': build_phase_keys,
+                'buildRules': [],
+                'dependencies': dependency_keys,
+                'name': target['name'],
+                'productName': target['name'],
+                'productReference': product_keys[-1],
+                'productType': 'com.apple.product-type.application' if is_app else 'com.apple.product-type.framework',
+            }))
+
+        summary['view_controllers'] = sum(len(names) for names in view_controllers.values())
+
+        # Project
+        products_group_key = generator.add({'isa': 'PBXGroup', 'children': product_keys, 'name': 'Products', 'sourceTree': '<group>'})
+        main_group_key = generator.add({'isa': 'PBXGroup', 'children': target_group_keys + [products_group_key], 'sourceTree': '<group>'})
+        root_key = generator.add({
+            'isa': 'PBXProject',
+            'attributes': {'LastUpgradeCheck': '1020', 'ORGANIZATIONNAME': 'Synthetic'},
+            'buildConfigurationList': self._add_configuration_list(generator, None, None),
+            'compatibilityVersion': 'Xcode 9.3',
+            'developmentRegion': 'en',
+            'hasScannedForEncodings': '0',
+            'knownRegions': ['en', 'fr', 'Base'],
+            'mainGroup': main_group_key,
+            'productRefGroup': products_group_key,
+            'projectDirPath': '',
+            'projectRoot': '',
+            'targets': target_keys,
+        })
+
+        xcodeproj_path = os.path.join(folder_path, 'Synthetic.xcodeproj')
+        os.makedirs(xcodeproj_path, exist_ok=True)
+        tree = {'archiveVersion': '1', 'classes': {}, 'objectVersion': '50', 'objects': generator.objects, 'rootObject': root_key}
+
+        # `pbxproj` warns about the build files of the frameworks phases while saving them
+        with contextlib.redirect_stdout(io.StringIO()):
+            XcodeProject(tree, os.path.join(xcodeproj_path, 'project.pbxproj')).save()
+
+        return summary
+
+    def _add_configuration_list(self, generator, target_name, info_plist_path):
+        """ Debug and Release configurations of the target, or of the project without target name. """
+        configuration_keys = list()
+
+        for configuration_name in ['Debug', 'Release']:
+            build_settings = {'SWIFT_VERSION': '5.0', 'IPHONEOS_DEPLOYMENT_TARGET': '12.0'}
+            if target_name:
+                build_settings.update({'INFOPLIST_FILE': info_plist_path,
+                                       'PRODUCT_BUNDLE_IDENTIFIER': 'com.synthetic.{}'.format(target_name),
+                                       'PRODUCT_NAME': '$(TARGET_NAME)'})
+
+            configuration_keys.append(generator.add({'isa': 'XCBuildConfiguration', 'buildSettings': build_settings, 'name': configuration_name}))
+
+        return generator.add({'isa': 'XCConfigurationList',
+                              'buildConfigurations': configuration_keys,
+                              'defaultConfigurationIsVisible': '0',
+                              'defaultConfigurationName': 'Release'})
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Generator of synthetic Xcode projects.")
+    argument_parser.add_argument('path', help='Folder in which the project is written.')
+    argument_parser.add_argument('--targets', dest='targets_count', type=int, default=5)
+    argument_parser.add_argument('--files', dest='files_per_target', type=int, default=50, help='Source files by target.')
+    argument_parser.add_argument('--types', dest='types_per_file', type=int, default=3, help='Types by source file.')
+    argument_parser.add_argument('--inner-depth', dest='inner_types_depth', type=int, default=1)
+    argument_parser.add_argument('--references', dest='references_per_type', type=int, default=2)
+    argument_parser.add_argument('--groups-depth', dest='groups_depth', type=int, default=2)
+    argument_parser.add_argument('--groups', dest='groups_per_group', type=int, default=3, help='Subgroups by group.')
+    argument_parser.add_argument('--variant-groups', dest='variant_groups_per_target', type=int, default=1)
+    argument_parser.add_argument('--dependencies', dest='dependencies_per_target', type=int, default=2)
+    argument_parser.add_argument('--objc-ratio', dest='objc_ratio', type=float, default=0.25)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    options = vars(args).copy()
+    folder_path = options.pop('path')
+    summary = SyntheticProjectGenerator(**options).write(folder_path)
+
+    print('{} written'.format(os.path.join(folder_path, 'Synthetic.xcodeproj')))
+    for (name, count) in summary.items():
+        print('{:>8} {}'.format(count, name.replace('_', ' ')))
+
+
+if __name__ == '__main__':
+    main()
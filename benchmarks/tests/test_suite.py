@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+import json
+import tempfile
+
+from ..suite import RESULTS_VERSION, compare, run_size
+
+
+class BenchmarkSuiteTests(TestCase):
+
+    def _results(self, seconds_by_phase, size_name='small'):
+        return {
+            'version': RESULTS_VERSION,
+            'sizes': {size_name: {'phases': {n: {'seconds': [s], 'min_seconds': s} for (n, s) in seconds_by_phase.items()}}},
+        }
+
+    # run_size
+
+    def test_run_size__gives_json_results_of_each_phase__for_a_generated_project(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            results = run_size(folder_path, {'targets_count': 2, 'files_per_target': 6, 'seed': 3}, repeat=2, jobs=1)
+
+        self.assertEqual(results['project']['targets'], 2)
+        self.assertTrue({'load_cold', 'load_cached', 'parse_swift_files', 'parse_objc_files',
+                         'find_files_that_contains', 'find_types_that_contains', 'find_duplicate_type_names',
+                         'view_controllers'} <= set(results['phases']))
+
+        for phase_results in results['phases'].values():
+            self.assertEqual(len(phase_results['seconds']), 2)
+            self.assertEqual(phase_results['min_seconds'], min(phase_results['seconds']))
+
+        self.assertEqual(json.loads(json.dumps(results)), results)
+
+    # compare
+
+    def test_compare__gives_phases_slower_than_threshold(self):
+        baseline = self._results({'load_cold': 0.1, 'parse_objc_files': 0.1})
+        results = self._results({'load_cold': 0.15, 'parse_objc_files': 0.11})
+
+        regressions = compare(results, baseline, threshold=0.2)
+
+        self.assertEqual([(r['size'], r['phase']) for r in regressions], [('small', 'load_cold')])
+        self.assertAlmostEqual(regressions[0]['ratio'], 1.5)
+
+    def test_compare__gives_no_regression__when_slowdown_is_below_noise(self):
+        baseline = self._results({'view_controllers': 0.0001})
+        results = self._results({'view_controllers': 0.0005})
+
+        self.assertEqual(compare(results, baseline, threshold=0.2), [])
+
+    def test_compare__ignores_phases_and_sizes_missing_from_baseline(self):
+        baseline = self._results({'load_cold': 0.1})
+        results = self._results({'load_cold': 0.1, 'parse_objc_files': 1.0})
+        results['sizes'].update(self._results({'load_cold': 1.0}, size_name='large')['sizes'])
+
+        self.assertEqual(compare(results, baseline, threshold=0.2), [])
+
+    def test_compare__raises_value_error__when_baseline_version_differs(self):
+        baseline = self._results({'load_cold': 0.1})
+        baseline['version'] = RESULTS_VERSION + 1
+
+        with self.assertRaises(ValueError):
+            compare(self._results({'load_cold': 0.1}), baseline)
@@ -0,0 +1,75 @@
+from unittest import TestCase
+
+import filecmp
+import os
+import tempfile
+
+from xcanalyzer.xcodeproject.parsers import XcProjectParser
+
+from ..synthetic import SyntheticProjectGenerator
+
+
+class SyntheticProjectGeneratorTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.folder_path = self.temporary_directory.name
+
+        self.generator = SyntheticProjectGenerator(targets_count=4,
+                                                   files_per_target=12,
+                                                   types_per_file=3,
+                                                   inner_types_depth=2,
+                                                   groups_depth=2,
+                                                   groups_per_group=2,
+                                                   seed=7)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _parsed_project(self, folder_path):
+        reader = XcProjectParser(folder_path, verbose=False, cache_active=False, swift_backend='native', jobs=1)
+        reader.load()
+        reader.parse_swift_files()
+        reader.parse_objc_files()
+
+        return reader.xc_project
+
+    # write
+
+    def test_write__gives_project_with_the_written_files_types_and_view_controllers(self):
+        summary = self.generator.write(self.folder_path)
+
+        xc_project = self._parsed_project(self.folder_path)
+
+        self.assertEqual(len(xc_project.targets), summary['targets'])
+        self.assertEqual(len(xc_project.files), summary['files'])
+        self.assertEqual(len([f for f in xc_project.files if f.is_swift]), summary['swift_files'])
+        self.assertEqual(len([f for f in xc_project.files if f.is_objc]), summary['objc_files'])
+        self.assertEqual(sum(len(t.swift_types) for t in xc_project.targets), summary['swift_types'])
+        self.assertEqual(sum(len(t.objc_classes) for t in xc_project.targets), summary['objc_classes'])
+        self.assertEqual(sum(len(t.view_controllers) for t in xc_project.targets), summary['view_controllers'])
+
+        for xc_file in xc_project.files:
+            self.assertTrue(os.path.isfile(xc_project.relative_path_for_file(xc_file)), xc_file.filepath)
+
+    def test_write__gives_nested_and_variant_groups__and_dependencies_on_previous_targets(self):
+        self.generator.write(self.folder_path)
+
+        xc_project = self._parsed_project(self.folder_path)
+
+        self.assertIn('/Module0/Group0x1/Group1x0', {g.group_path for g in xc_project.groups_filtered()})
+        self.assertIn('/Module0/Localizable0.strings', {g.group_path for g in xc_project.groups_filtered() if g.is_variant})
+        self.assertEqual(xc_project.target_with_name('Module0').dependencies, set())
+        self.assertTrue(xc_project.target_with_name('SyntheticApp').dependencies)
+
+    def test_write__gives_same_project__for_same_seed(self):
+        folder_paths = [os.path.join(self.folder_path, 'First'), os.path.join(self.folder_path, 'Second')]
+        for folder_path in folder_paths:
+            self.generator.write(folder_path)
+
+        relative_filepaths = [sorted(os.path.relpath(os.path.join(d, f), folder_path) for (d, _, filenames) in os.walk(folder_path) for f in filenames)
+                              for folder_path in folder_paths]
+        self.assertEqual(relative_filepaths[0], relative_filepaths[1])
+
+        _, mismatch, errors = filecmp.cmpfiles(*folder_paths, relative_filepaths[0], shallow=False)
+        self.assertEqual((mismatch, errors), ([], []))
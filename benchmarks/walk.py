@@ -0,0 +1,163 @@
+""" Benchmark of the walks of a project folder.
+
+Generates a folder with source folders, a `Pods` folder of vendored sources and
+a `.git` folder of objects, then times the empty folders report and the folder
+files of the orphan files report, ignoring `Pods` and `.git`, with the folder
+walker pruning ignored folders, and with `os.walk` filtering them after
+descending into them, as it was before.
+
+    python -m benchmarks.walk --sources 200 --vendored 2000 --files 20
+"""
+
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from xcanalyzer.argparse import parse_ignored_folders
+from xcanalyzer.xcodeproject.generators import FolderReporter, XcProjReporter
+from xcanalyzer.xcodeproject.models import XcProject
+
+
+def generate_folder(folder_path, sources_count, vendored_count, files_count, seed=0):
+    """ Source folders, vendored folders and git objects folders of `files_count` files each, some of them empty. """
+    randomizer = random.Random(seed)
+
+    folder_groups = [('Sources/Module{}/Folder{}', sources_count, '.swift'),
+                     ('Pods/Pod{}/Classes{}', vendored_count, '.m'),
+                     ('.git/objects/{:02x}/pack{}', vendored_count, '')]
+
+    for (dirpath_format, folders_count, extension) in folder_groups:
+        for index in range(folders_count):
+            dirpath = os.path.join(folder_path, dirpath_format.format(index // 10, index))
+            os.makedirs(dirpath)
+
+            # One folder out of twenty is empty
+            if randomizer.random() < 0.05:
+                continue
+
+            for file_index in range(files_count):
+                with open(os.path.join(dirpath, 'File{}{}'.format(file_index, extension)), 'w') as opened_file:
+                    opened_file.write('// File {}\n'.format(file_index))
+
+
+def legacy_find_empty_dirs(folder_path, ignored_dirpaths, ignored_dirs):
+    results = []
+
+    for (dirpath, dirnames, filenames) in os.walk(folder_path):
+        relative_dirpath = dirpath[len(folder_path):]
+        if not relative_dirpath:
+            continue
+
+        if [p for p in ignored_dirpaths if '{}/'.format(relative_dirpath).startswith('/{}/'.format(p))]:
+            continue
+        if ignored_dirs & set(relative_dirpath.split(os.path.sep)):
+            continue
+        if dirnames:
+            continue
+
+        unhidden_filenames = set([f for f in filenames if not f.startswith('.')])
+        if unhidden_filenames:
+            continue
+
+        hidden_filenames = sorted(set(filenames) - unhidden_filenames)
+        display = relative_dirpath
+        if hidden_filenames:
+            display += ' [{}]'.format(', '.join(hidden_filenames))
+        results.append(display)
+
+    return results
+
+
+def legacy_find_folder_filepaths(folder_path, ignored_dirpaths, ignored_dirs, ignored_files={'.DS_Store'}):
+    folder_filepaths = set()
+
+    for (dirpath, dirnames, filenames) in os.walk(folder_path):
+        relative_dirpath = dirpath[len(folder_path):]
+        folder_parts = relative_dirpath.split(os.path.sep)
+
+        if [p for p in ignored_dirpaths if '{}/'.format(relative_dirpath).startswith('/{}/'.format(p))]:
+            continue
+        if ignored_dirs & set(folder_parts):
+            continue
+        if '.xcodeproj' in relative_dirpath or '.xcworkspace' in relative_dirpath:
+            continue
+
+        if relative_dirpath.endswith('.xcassets') or relative_dirpath.endswith('.xcstickers'):
+            folder_filepaths.add(relative_dirpath)
+        elif '.xcassets' in relative_dirpath or '.xcstickers' in relative_dirpath:
+            pass
+        elif folder_parts[-1].endswith('.bundle'):
+            folder_filepaths.add(relative_dirpath)
+        elif [p for p in folder_parts if p.endswith('.bundle')]:
+            continue
+        else:
+            for filename in filenames:
+                if filename not in ignored_files:
+                    folder_filepaths.add(os.path.join(relative_dirpath, filename))
+
+    return folder_filepaths
+
+
+def _timed(function, repeat):
+    durations = list()
+
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        durations.append(time.perf_counter() - start)
+
+    return result, durations
+
+
+def run(sources_count, vendored_count, files_count, repeat=3, jobs=None, seed=0):
+    with tempfile.TemporaryDirectory() as folder_path:
+        generate_folder(folder_path, sources_count, vendored_count, files_count, seed)
+
+        ignored_dirpaths, ignored_dirs = parse_ignored_folders({'Pods/', '.git/', 'DerivedData/'})
+        project = XcProject(folder_path, 'Generated.xcodeproj', build_configurations=list(), targets=list(), groups=list(), files=set())
+
+        timings = [
+            ('empty_dirs', lambda: FolderReporter(folder_path, ignored_dirpaths, ignored_dirs, jobs=jobs).find_empty_dirs(),
+                           lambda: legacy_find_empty_dirs(folder_path, ignored_dirpaths, ignored_dirs)),
+            ('folder_filepaths', lambda: XcProjReporter(project)._find_folder_filepaths(ignored_dirpaths, ignored_dirs),
+                                 lambda: legacy_find_folder_filepaths(folder_path, ignored_dirpaths, ignored_dirs)),
+        ]
+
+        results = dict()
+        for (name, function, legacy_function) in timings:
+            result, durations = _timed(function, repeat)
+            legacy_result, legacy_durations = _timed(legacy_function, repeat)
+
+            results[name] = {
+                'seconds': durations,
+                'legacy_seconds': legacy_durations,
+                'identical': result == legacy_result,
+            }
+
+        return results
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Benchmark of the walks of a project folder.")
+    argument_parser.add_argument('--sources', dest='sources_count', type=int, default=200)
+    argument_parser.add_argument('--vendored', dest='vendored_count', type=int, default=2000)
+    argument_parser.add_argument('--files', dest='files_count', type=int, default=20)
+    argument_parser.add_argument('--repeat', dest='repeat', type=int, default=3)
+    argument_parser.add_argument('-j', '--jobs', dest='jobs', type=int)
+    argument_parser.add_argument('--seed', dest='seed', type=int, default=0)
+    args = argument_parser.parse_args()
+
+    results = run(args.sources_count, args.vendored_count, args.files_count, args.repeat, args.jobs, args.seed)
+
+    print('{:<18} {:>10} {:>10} {:>10}'.format('', 'os.walk', 'pruned', 'identical'))
+    for (name, result) in results.items():
+        print('{:<18} {:>9.3f}s {:>9.3f}s {:>10}'.format(name,
+                                                        min(result['legacy_seconds']),
+                                                        min(result['seconds']),
+                                                        str(result['identical'])))
+
+
+if __name__ == '__main__':
+    main()
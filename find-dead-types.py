@@ -3,86 +3,114 @@
 from termcolor import cprint
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_server_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import OccurrencesReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.servers import AnalysisClient
 from xcanalyzer.language.models import SwiftTypeType, ObjcTypeType
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all types that are unused in the project.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all types that are unused in the project.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# App name
-argument_parser.add_argument('app',
-                             help='Name of the iOS app target.')
+    # App name
+    argument_parser.add_argument('app',
+                                 help='Name of the iOS app target.')
 
-# Verbose
-argument_parser.add_argument('-v', '--verbose',
-                             dest='verbose',
-                             action='store_true', 
-                             help='Verbose display.')
+    # Verbose
+    argument_parser.add_argument('-v', '--verbose',
+                                 dest='verbose',
+                                 action='store_true', 
+                                 help='Verbose display.')
 
-# Display files
-argument_parser.add_argument('-d', '--display-files',
-                             dest='display_files',
-                             action='store_true', 
-                             help='Display files mode.')
+    # Display files
+    argument_parser.add_argument('-d', '--display-files',
+                                 dest='display_files',
+                                 action='store_true', 
+                                 help='Display files mode.')
 
+    # Jobs
+    add_jobs_argument(argument_parser)
 
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Analysis server
+    add_server_argument(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path, verbose=args.verbose)
 
-# Loading the project
-try:
-    xcode_project_reader.load()
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-    # Parse Swift files
-    xcode_project_reader.parse_swift_files()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-    # Parse Objective-C files (always because Swift extension can be of objc types)
-    xcode_project_reader.parse_objc_files()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
+    # Analysis server of the project
+    if args.server:
+        try:
+            print(AnalysisClient(path).query('report', script='find-dead-types', app=args.app, display_files=args.display_files), end='')
+        except XcodeProjectReadException as e:
+            print("An error occurred when querying the analysis server: {}".format(e.message))
+        return
 
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, verbose=args.verbose, jobs=args.jobs, swift_backend=args.swift_backend, tracer=tracer)
 
-# App target
-app_target = xcode_project_reader.xc_project.target_with_name(args.app)
-if not app_target:
-    raise ValueError("No app target found with name '{}'.".format(args.app))
+    # Loading the project
+    try:
+        xcode_project_reader.load()
 
-# Find occurrences
-swift_types = app_target.swift_types_dependencies_filtered(type_not_in={SwiftTypeType.EXTENSION})
-objc_types = app_target.objc_types_dependencies_filtered(type_not_in={ObjcTypeType.CATEGORY, ObjcTypeType.CONSTANT})  # temporary exclude constants from objc types
-type_occurrences_set = xcode_project_reader.find_type_occurrences_from_files(
-    # swift_types | objc_types,
-    objc_types,
-    from_target=app_target)
+        # Parse Swift files
+        xcode_project_reader.parse_swift_files()
 
-# Print occurrences for each type
-occurrences_reporter = OccurrencesReporter()
-occurrences_reporter.print_occurrences_of_multiple_types_in_files(type_occurrences_set, args.display_files)
+        # Parse Objective-C files (always because Swift extension can be of objc types)
+        xcode_project_reader.parse_objc_files()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
 
-# TODO:
-# save/load cache for type occurrences
-# report print really dead types: manage a mode:
-    # display all
-    # display only types with 0 outside occurrence
-    # display only types with exactly 1 inside occurrence (the declaration)
-    # ...
+
+
+    # App target
+    app_target = xcode_project_reader.xc_project.target_with_name(args.app)
+    if not app_target:
+        raise ValueError("No app target found with name '{}'.".format(args.app))
+
+    # Find occurrences
+    swift_types = app_target.swift_types_dependencies_filtered(type_not_in={SwiftTypeType.EXTENSION})
+    objc_types = app_target.objc_types_dependencies_filtered(type_not_in={ObjcTypeType.CATEGORY, ObjcTypeType.CONSTANT})  # temporary exclude constants from objc types
+    type_occurrences_set = xcode_project_reader.find_type_occurrences_from_files(
+        # swift_types | objc_types,
+        objc_types,
+        from_target=app_target)
+
+    # Print occurrences for each type
+    occurrences_reporter = OccurrencesReporter()
+    occurrences_reporter.print_occurrences_of_multiple_types_in_files(type_occurrences_set, args.display_files)
+
+    # TODO:
+    # save/load cache for type occurrences
+    # report print really dead types: manage a mode:
+        # display all
+        # display only types with 0 outside occurrence
+        # display only types with exactly 1 inside occurrence (the declaration)
+        # ...
+
+
+if __name__ == '__main__':
+    main()
@@ -1,60 +1,89 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_server_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter, OccurrencesReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.servers import AnalysisClient
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="Gives all the Swift or Obj-C types of the project from a given target that have the same names.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="Gives all the Swift or Obj-C types of the project from a given target that have the same names.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# App name
-argument_parser.add_argument('app',
-                             help='Name of the iOS app target.')
+    # App name
+    argument_parser.add_argument('app',
+                                 help='Name of the iOS app target.')
 
+    # Jobs
+    add_jobs_argument(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # Analysis server
+    add_server_argument(argument_parser)
 
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
 
-# Loading the project
-try:
-    xcode_project_reader.load()
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-    # Parse Swift files
-    xcode_project_reader.parse_swift_files()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-    # Parse Objective-C files (always because Swift extension can be of objc types)
-    xcode_project_reader.parse_objc_files()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
 
-# App target
-app_target = xcode_project_reader.xc_project.target_with_name(args.app)
-if not app_target:
-    raise ValueError("No app target found with name '{}'.".format(args.app))
+    # Analysis server of the project
+    if args.server:
+        try:
+            print(AnalysisClient(path).query('report', script='find-duplicate-type-names', app=args.app), end='')
+        except XcodeProjectReadException as e:
+            print("An error occurred when querying the analysis server: {}".format(e.message))
+        return
 
-# Find duplicates
-swift_duplicate_lists, objc_duplicate_lists, swift_objc_common_classes = xcode_project_reader.find_duplicate_type_names(from_target=app_target)
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, jobs=args.jobs, swift_backend=args.swift_backend, tracer=tracer)
 
+    # Loading the project
+    try:
+        xcode_project_reader.load()
 
-# Reporting
-occurrences_reporter = OccurrencesReporter()
-occurrences_reporter.print_duplicate_names(swift_duplicate_lists, objc_duplicate_lists, swift_objc_common_classes)
+        # Parse Swift files
+        xcode_project_reader.parse_swift_files()
+
+        # Parse Objective-C files (always because Swift extension can be of objc types)
+        xcode_project_reader.parse_objc_files()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+
+    # App target
+    app_target = xcode_project_reader.xc_project.target_with_name(args.app)
+    if not app_target:
+        raise ValueError("No app target found with name '{}'.".format(args.app))
+
+    # Find duplicates
+    swift_duplicate_lists, objc_duplicate_lists, swift_objc_common_classes = xcode_project_reader.find_duplicate_type_names(from_target=app_target)
+
+
+    # Reporting
+    occurrences_reporter = OccurrencesReporter()
+    occurrences_reporter.print_duplicate_names(swift_duplicate_lists, objc_duplicate_lists, swift_objc_common_classes)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,43 +1,58 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
-from xcanalyzer.argparse import parse_ignored_folders
+from xcanalyzer.argparse import parse_ignored_folders, add_path_argument, add_jobs_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.generators import FolderReporter
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="Find all empty sub folders of a folder. Ignore folders named `.git` and `DerivedData`.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="Find all empty sub folders of a folder. Ignore folders named `.git` and `DerivedData`.")
 
-# Project folder argument
-argument_parser.add_argument('path', help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# Ignore folders argument
-argument_parser.add_argument('-i', '--ignore-dir',
-                             action='append',
-                             dest='ignored_folders',
-                             metavar='<dirpath>',
-                             help='Path of a folder to ignore.')
+    # Ignore folders argument
+    argument_parser.add_argument('-i', '--ignore-dir',
+                                 action='append',
+                                 dest='ignored_folders',
+                                 metavar='<dirpath>',
+                                 help='Path of a folder to ignore.')
 
+    # Jobs
+    add_jobs_argument(argument_parser, help='Number of threads listing folders concurrently. Default is the number of CPUs.')
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
 
-# Parse ignored folders
-ignored_folders = set(args.ignored_folders or []) | {
-    'DerivedData/',
-    '.git/',
-}
-ignored_dirpaths, ignored_dirs = parse_ignored_folders(ignored_folders)
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-# Report
-reporter = FolderReporter(path, ignored_dirpaths, ignored_dirs)
-reporter.print_empty_dirs()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
+
+    # Parse ignored folders
+    ignored_folders = set(args.ignored_folders or []) | {
+        'DerivedData/',
+        '.git/',
+    }
+    ignored_dirpaths, ignored_dirs = parse_ignored_folders(ignored_folders)
+
+
+    # Report
+    reporter = FolderReporter(path, ignored_dirpaths, ignored_dirs, jobs=args.jobs)
+    with tracer.span('find_empty_dirs'):
+        reporter.print_empty_dirs()
+
+
+if __name__ == '__main__':
+    main()
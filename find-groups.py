@@ -2,45 +2,59 @@
 
 import argparse
 
+from xcanalyzer.argparse import add_path_argument, add_diagnostic_arguments
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="Find all xcodeproj groups with potential unconformance.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="Find all xcodeproj groups with potential unconformance.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# Sorted by name argument
-argument_parser.add_argument('-f', '--filter',
-                             choices=['all', 'empty', 'project_relative', 'without_folder', 'variant'],
-                             default='all',
-                             dest='filter_mode',
-                             help='Give the list of all, empty, relative to project, without folder or variant groups from the Xcode project.')
+    # Sorted by name argument
+    argument_parser.add_argument('-f', '--filter',
+                                 choices=['all', 'empty', 'project_relative', 'without_folder', 'variant'],
+                                 default='all',
+                                 dest='filter_mode',
+                                 help='Give the list of all, empty, relative to project, without folder or variant groups from the Xcode project.')
 
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(args.path, verbose=False)
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-# Loading the project
-try:
-    xcode_project_reader.load()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-if args.filter_mode == 'all':
-    reporter.print_groups()
-else:
-    reporter.print_groups(filter_mode=args.filter_mode)
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(args.path, verbose=False, tracer=tracer)
 
-if args.filter_mode == 'all':
-    reporter.print_all_groups_summary()
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    if args.filter_mode == 'all':
+        reporter.print_groups()
+    else:
+        reporter.print_groups(filter_mode=args.filter_mode)
+
+    if args.filter_mode == 'all':
+        reporter.print_all_groups_summary()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,40 +1,51 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all .h and .m files missing the corresponding .m, respectively .h file from the Xcode project. \
-                                                      Also detect .h files (respectively .m files) with same name in the projet.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all .h and .m files missing the corresponding .m, respectively .h file from the Xcode project. \
+                                                          Also detect .h files (respectively .m files) with same name in the projet.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-# Loading the project
-try:
-    xcode_project_reader.load()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-reporter.print_missing_objc_files()
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    reporter.print_missing_objc_files()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,68 +1,90 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
-from xcanalyzer.argparse import parse_ignored_folders
+from xcanalyzer.argparse import parse_ignored_folders, add_path_argument, add_server_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.servers import AnalysisClient
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List files from the folder not referenced in the Xcode project. Ignore folders named `.git` and `DerivedData`.")
-
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
-
-# Ignore folders argument
-argument_parser.add_argument('-d', '--ignore-dir',
-                             action='append',
-                             dest='ignored_folders',
-                             metavar='<dirpath>',
-                             help='Path or name of a folder to ignore.')
-
-# Mode
-argument_parser.add_argument('-m', '--mode',
-                             choices=['all', 'project', 'target', 'unreferenced', 'referenced'],
-                             dest='orphan_mode',
-                             default='all',
-                             help="Orphan mode:\
-                                   'referenced' means all *Info.plist and *.h files referenced by at least one target. \
-                                   'unreferenced' means all *Info.plist and *.h files in the project not referenced by any target. \
-                                   'project' means all files in the folder but not referenced in the project.\
-                                   'target' means all files in the project but not referenced by any target (excluding *Info.plist and *.h files).\
-                                   'all' (default) means all files in the folder but not referenced by any target (neither the project).")
-
-
-# --- Parse arguments ---
-args = argument_parser.parse_args()
-
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
-
-# Parse ignored folders
-ignored_folders = set(args.ignored_folders or []) | {
-    'DerivedData/',
-    '.git/',
-}
-ignored_dirpaths, ignored_dirs = parse_ignored_folders(ignored_folders)
-
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
-
-# Loading the project
-try:
-    xcode_project_reader.load()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
-
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-reporter.print_orphan_files(ignored_dirpaths,
-                            ignored_dirs,
-                            mode=args.orphan_mode)
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List files from the folder not referenced in the Xcode project. Ignore folders named `.git` and `DerivedData`.")
+
+    # Project folder argument
+    add_path_argument(argument_parser)
+
+    # Ignore folders argument
+    argument_parser.add_argument('-d', '--ignore-dir',
+                                 action='append',
+                                 dest='ignored_folders',
+                                 metavar='<dirpath>',
+                                 help='Path or name of a folder to ignore.')
+
+    # Mode
+    argument_parser.add_argument('-m', '--mode',
+                                 choices=['all', 'project', 'target', 'unreferenced', 'referenced'],
+                                 dest='orphan_mode',
+                                 default='all',
+                                 help="Orphan mode:\
+                                       'referenced' means all *Info.plist and *.h files referenced by at least one target. \
+                                       'unreferenced' means all *Info.plist and *.h files in the project not referenced by any target. \
+                                       'project' means all files in the folder but not referenced in the project.\
+                                       'target' means all files in the project but not referenced by any target (excluding *Info.plist and *.h files).\
+                                       'all' (default) means all files in the folder but not referenced by any target (neither the project).")
+
+    # Analysis server
+    add_server_argument(argument_parser)
+
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
+
+
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
+
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
+
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
+
+    # Analysis server of the project
+    if args.server:
+        try:
+            print(AnalysisClient(path).query('report', script='find-orphan-files', mode=args.orphan_mode, ignored_folders=args.ignored_folders or []), end='')
+        except XcodeProjectReadException as e:
+            print("An error occurred when querying the analysis server: {}".format(e.message))
+        return
+
+    # Parse ignored folders
+    ignored_folders = set(args.ignored_folders or []) | {
+        'DerivedData/',
+        '.git/',
+    }
+    ignored_dirpaths, ignored_dirs = parse_ignored_folders(ignored_folders)
+
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    reporter.print_orphan_files(ignored_dirpaths,
+                                ignored_dirs,
+                                mode=args.orphan_mode)
+
+
+if __name__ == '__main__':
+    main()
@@ -3,51 +3,80 @@
 from termcolor import cprint
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_server_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import OccurrencesReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.servers import AnalysisClient
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all occurrences of a Swift or Objective-C type in the code of the whole Xcode project.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all occurrences of a Swift or Objective-C type in the code of the whole Xcode project.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# App name
-argument_parser.add_argument('type',
-                             help='Name of the Swift or Objective-C type to search for.')
+    # App name
+    argument_parser.add_argument('type',
+                                 help='Name of the Swift or Objective-C type to search for.')
 
+    # Jobs
+    add_jobs_argument(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # Analysis server
+    add_server_argument(argument_parser)
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# Loading the project
-try:
-    xcode_project_reader.load()
 
-    # Parse Swift files
-    xcode_project_reader.parse_swift_files()
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-    # Parse Objective-C files (always because Swift extension can be of objc types)
-    xcode_project_reader.parse_objc_files()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-    # Find occurrences of the given type
-    type_occurrences = xcode_project_reader.find_type_and_occurrences_from_files(args.type)
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
-print()
-OccurrencesReporter().print_occurrences_of_one_type_in_files(type_occurrences)
+    # Analysis server of the project
+    if args.server:
+        try:
+            print(AnalysisClient(path).query('report', script='find-type-occurrences', type=args.type), end='')
+        except XcodeProjectReadException as e:
+            print("An error occurred when querying the analysis server: {}".format(e.message))
+        return
+
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, jobs=args.jobs, swift_backend=args.swift_backend, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+
+        # Parse Swift files
+        xcode_project_reader.parse_swift_files()
+
+        # Parse Objective-C files (always because Swift extension can be of objc types)
+        xcode_project_reader.parse_objc_files()
+
+        # Find occurrences of the given type
+        type_occurrences = xcode_project_reader.find_type_and_occurrences_from_files(args.type)
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    print()
+    OccurrencesReporter().print_occurrences_of_one_type_in_files(type_occurrences)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,39 +2,53 @@
 
 import argparse
 
+from xcanalyzer.argparse import add_path_argument, add_diagnostic_arguments
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all build settings by target and build configuration.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all build settings by target and build configuration.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# App name
-argument_parser.add_argument('target',
-                             nargs='?',
-                             default=None,
-                             help='Name of the iOS target to filter on. If not given, build settings for all targets are displayed.')
+    # App name
+    argument_parser.add_argument('target',
+                                 nargs='?',
+                                 default=None,
+                                 help='Name of the iOS target to filter on. If not given, build settings for all targets are displayed.')
 
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(args.path, verbose=True, cache_active=True)
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-# Loading the project
-try:
-    xcode_project_reader.load()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-reporter.print_build_settings(for_target=args.target)
-reporter.print_project_build_settings()
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(args.path, verbose=True, cache_active=True, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    reporter.print_build_settings(for_target=args.target)
+    reporter.print_project_build_settings()
+
+
+if __name__ == '__main__':
+    main()
@@ -2,42 +2,56 @@
 
 import argparse
 
+from xcanalyzer.argparse import add_path_argument, add_diagnostic_arguments
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all targets and files of the Xcode project.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all targets and files of the Xcode project.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# Only "shared" files between targets
-argument_parser.add_argument('-s', '--only-shared',
-                             dest='only_shared',
-                             action='store_true', 
-                             help='Give the list of files used by multiple targets.')
+    # Only "shared" files between targets
+    argument_parser.add_argument('-s', '--only-shared',
+                                 dest='only_shared',
+                                 action='store_true', 
+                                 help='Give the list of files used by multiple targets.')
 
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(args.path)
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-# Loading the project
-try:
-    xcode_project_reader.load()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-if args.only_shared:
-    reporter.print_shared_files()
-else:
-    reporter.print_files_by_targets()
-    reporter.print_files_summary()
\ No newline at end of file
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(args.path, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    if args.only_shared:
+        reporter.print_shared_files()
+    else:
+        reporter.print_files_by_targets()
+        reporter.print_files_summary()
+
+
+if __name__ == '__main__':
+    main()
@@ -1,65 +1,94 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_server_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.servers import AnalysisClient
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all types (protocols, extensions, structs, enums and classes) by file and by target.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all types (protocols, extensions, structs, enums and classes) by file and by target.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# Filter languages
-argument_parser.add_argument('-l', '--languages',
-                             choices=['all', 'swift', 'objc'],
-                             default='all',
-                             dest='language',
-                             help='Language for which the types are given: Objective-C, Swift or both.')
+    # Filter languages
+    argument_parser.add_argument('-l', '--languages',
+                                 choices=['all', 'swift', 'objc'],
+                                 default='all',
+                                 dest='language',
+                                 help='Language for which the types are given: Objective-C, Swift or both.')
 
-# Display files
-argument_parser.add_argument('-f', '--display-files',
-                             dest='display_files',
-                             action='store_true', 
-                             help='Display file paths in which the types are defined.')
+    # Display files
+    argument_parser.add_argument('-f', '--display-files',
+                                 dest='display_files',
+                                 action='store_true', 
+                                 help='Display file paths in which the types are defined.')
 
+    # Jobs
+    add_jobs_argument(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # Analysis server
+    add_server_argument(argument_parser)
 
-if args.language == 'all':
-    languages = {'swift', 'objc'}
-else:
-    languages = {args.language}
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
 
-# Loading the project
-try:
-    xcode_project_reader.load()
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-    # Parse Swift files
-    if 'swift' in languages:
-        xcode_project_reader.parse_swift_files()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-    # Parse Objective-C files (always because Swift extension can be of objc types)
-    xcode_project_reader.parse_objc_files()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-reporter.print_types_by_file(languages=languages, display_files=args.display_files)
-reporter.print_types_summary(languages=languages)
\ No newline at end of file
+    if args.language == 'all':
+        languages = {'swift', 'objc'}
+    else:
+        languages = {args.language}
+
+    # Analysis server of the project
+    if args.server:
+        try:
+            print(AnalysisClient(path).query('report', script='list-types', languages=sorted(languages), display_files=args.display_files), end='')
+        except XcodeProjectReadException as e:
+            print("An error occurred when querying the analysis server: {}".format(e.message))
+        return
+
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, jobs=args.jobs, swift_backend=args.swift_backend, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+
+        # Parse Swift files
+        if 'swift' in languages:
+            xcode_project_reader.parse_swift_files()
+
+        # Parse Objective-C files (always because Swift extension can be of objc types)
+        xcode_project_reader.parse_objc_files()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    reporter.print_types_by_file(languages=languages, display_files=args.display_files)
+    reporter.print_types_summary(languages=languages)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,49 +1,66 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="List all view controllers defined in the iOS app and its framework dependencies.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="List all view controllers defined in the iOS app and its framework dependencies.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# App name
-argument_parser.add_argument('app',
-                             help='Name of the iOS app target.')
+    # App name
+    argument_parser.add_argument('app',
+                                 help='Name of the iOS app target.')
 
+    # Jobs
+    add_jobs_argument(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
 
-# Loading the project
-try:
-    xcode_project_reader.load()
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-    # Parse Swift files
-    xcode_project_reader.parse_swift_files()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-    # Parse Objective-C files (always because Swift extension can be of objc types)
-    xcode_project_reader.parse_objc_files()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
-# Reporter
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-reporter.print_view_controllers(app=args.app)
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, jobs=args.jobs, swift_backend=args.swift_backend, tracer=tracer)
+
+    # Loading the project
+    try:
+        xcode_project_reader.load()
+
+        # Parse Swift files
+        xcode_project_reader.parse_swift_files()
+
+        # Parse Objective-C files (always because Swift extension can be of objc types)
+        xcode_project_reader.parse_objc_files()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+    # Reporter
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    reporter.print_view_controllers(app=args.app)
+
+
+if __name__ == '__main__':
+    main()
@@ -12,7 +12,7 @@ setuptools.setup(
     long_description=long_description,
     long_description_content_type="text/markdown",
     url="https://github.com/voyages-sncf-technologies/xcanalyzer",
-    packages=setuptools.find_packages(),
+    packages=setuptools.find_packages(exclude=['benchmarks', 'benchmarks.*']),
     classifiers=[
         "Programming Language :: Python :: 3",
         "License :: BSD 3-Clause License :: E-Voyageurs Technologies",
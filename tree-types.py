@@ -1,65 +1,82 @@
 #!/usr/bin/env python3
 
 import argparse
-import os
 
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_diagnostic_arguments, project_folder_path
 from xcanalyzer.xcodeproject.parsers import XcProjectParser
 from xcanalyzer.xcodeproject.generators import XcProjReporter
 from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
 
 
-# --- Arguments ---
-argument_parser = argparse.ArgumentParser(description="Gives all the Swift or Obj-C types of the project that use a given type.")
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="Gives all the Swift or Obj-C types of the project that use a given type.")
 
-# Project folder argument
-argument_parser.add_argument('path',
-                             help='Path of the folder containing your `.xcodeproj` folder.')
+    # Project folder argument
+    add_path_argument(argument_parser)
 
-# App name
-argument_parser.add_argument('app',
-                             help='Name of the iOS app target.')
+    # App name
+    argument_parser.add_argument('app',
+                                 help='Name of the iOS app target.')
 
-# Type name
-argument_parser.add_argument('type',
-                             help='Name of the Swift or Objective-C type to search from.')
+    # Type name
+    argument_parser.add_argument('type',
+                                 help='Name of the Swift or Objective-C type to search from.')
 
+    # Jobs
+    add_jobs_argument(argument_parser)
 
-# --- Parse arguments ---
-args = argument_parser.parse_args()
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
 
-# Argument: path => Remove ending slashes from path
-path = args.path
-while path and path[-1] == os.path.sep:
-    path = path[:-1]
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
 
 
-# Xcode code project reader
-xcode_project_reader = XcProjectParser(path)
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
 
-# Loading the project
-try:
-    xcode_project_reader.load()
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
 
-    # Parse Swift files
-    xcode_project_reader.parse_swift_files()
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
 
-    # Parse Objective-C files (always because Swift extension can be of objc types)
-    xcode_project_reader.parse_objc_files()
-except XcodeProjectReadException as e:
-    print("An error occurred when loading Xcode project: {}".format(e.message))
-    exit()
 
+    # Xcode code project reader
+    xcode_project_reader = XcProjectParser(path, jobs=args.jobs, swift_backend=args.swift_backend, tracer=tracer)
 
-# App target
-app_target = xcode_project_reader.xc_project.target_with_name(args.app)
-if not app_target:
-    raise ValueError("No app target found with name '{}'.".format(args.app))
+    # Loading the project
+    try:
+        xcode_project_reader.load()
 
-# Find occurrences
-occurrences_from_types = xcode_project_reader.find_type_occurrences_from_types(args.type, from_target=app_target)
+        # Parse Swift files
+        xcode_project_reader.parse_swift_files()
 
-# Reporter
-print()
-print("--- Occurrences results ---")
-reporter = XcProjReporter(xcode_project_reader.xc_project)
-reporter.print_types_occurrences_from_types(occurrences_from_types)
+        # Parse Objective-C files (always because Swift extension can be of objc types)
+        xcode_project_reader.parse_objc_files()
+    except XcodeProjectReadException as e:
+        print("An error occurred when loading Xcode project: {}".format(e.message))
+        return
+
+
+    # App target
+    app_target = xcode_project_reader.xc_project.target_with_name(args.app)
+    if not app_target:
+        raise ValueError("No app target found with name '{}'.".format(args.app))
+
+    # Find occurrences
+    occurrences_from_types = xcode_project_reader.find_type_occurrences_from_types(args.type, from_target=app_target)
+
+    # Reporter
+    print()
+    print("--- Occurrences results ---")
+    reporter = XcProjReporter(xcode_project_reader.xc_project)
+    reporter.print_types_occurrences_from_types(occurrences_from_types)
+
+
+if __name__ == '__main__':
+    main()
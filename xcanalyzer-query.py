@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+
+import argparse
+import json
+
+from xcanalyzer.argparse import add_path_argument, add_diagnostic_arguments, project_folder_path
+from xcanalyzer.xcodeproject.servers import AnalysisClient, AnalysisServer
+from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
+
+
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="Query the analysis server of an Xcode project, started with `xcanalyzer-server.py`, and print the JSON result.")
+
+    # Project folder argument
+    add_path_argument(argument_parser)
+
+    # Query
+    argument_parser.add_argument('query',
+                                 choices=AnalysisServer.QUERIES,
+                                 help='Query to answer.')
+
+    # Query arguments
+    argument_parser.add_argument('-a', '--argument',
+                                 action='append',
+                                 dest='arguments',
+                                 metavar='<name>=<value>',
+                                 help='Argument of the query, its value being read as JSON when possible, \
+                                 like `-a target=MyApp` or `-a languages=["swift"]`.')
+
+    # Socket
+    argument_parser.add_argument('-s', '--socket',
+                                 dest='socket_path',
+                                 metavar='<socketpath>',
+                                 help='Path of the Unix socket. Default is a path in the temporary folder derived from the project path.')
+
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
+
+
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
+
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
+
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
+
+    # Query arguments
+    arguments = dict()
+    for argument in args.arguments or []:
+        name, _, value = argument.partition('=')
+        try:
+            arguments[name] = json.loads(value)
+        except ValueError:
+            arguments[name] = value
+
+    # Query
+    try:
+        with tracer.span('query', query=args.query):
+            result = AnalysisClient(path, socket_path=args.socket_path).query(args.query, **arguments)
+    except XcodeProjectReadException as e:
+        print("An error occurred when querying the analysis server: {}".format(e.message))
+        return
+
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
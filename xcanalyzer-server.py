@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+
+import argparse
+
+from xcanalyzer.argparse import add_path_argument, add_jobs_argument, add_swift_backend_argument, add_diagnostic_arguments, project_folder_path
+from xcanalyzer.xcodeproject.servers import AnalysisServer
+from xcanalyzer.xcodeproject.exceptions import XcodeProjectReadException
+from xcanalyzer.xcodeproject.profilers import script_profiler
+from xcanalyzer.xcodeproject.tracers import script_tracer
+
+
+def main():
+    # --- Arguments ---
+    argument_parser = argparse.ArgumentParser(description="Keep the parsed Xcode project in memory to answer the queries of the other scripts \
+                                                           run with `--server`, or of `xcanalyzer-query.py`, from a Unix socket.")
+
+    # Project folder argument
+    add_path_argument(argument_parser)
+
+    # Socket
+    argument_parser.add_argument('-s', '--socket',
+                                 dest='socket_path',
+                                 metavar='<socketpath>',
+                                 help='Path of the Unix socket. Default is a path in the temporary folder derived from the project path.')
+
+    # Poll interval
+    argument_parser.add_argument('--poll-interval',
+                                 dest='poll_interval',
+                                 type=float,
+                                 default=0.5,
+                                 metavar='<seconds>',
+                                 help='Minimum duration between two polls of the changed files of the project. Default is 0.5 second.')
+
+    # Jobs
+    add_jobs_argument(argument_parser)
+
+    # Swift backend
+    add_swift_backend_argument(argument_parser)
+
+    # Trace and profile
+    add_diagnostic_arguments(argument_parser)
+
+
+    # --- Parse arguments ---
+    args = argument_parser.parse_args()
+
+    # Tracer and profiler, written when the script exits
+    tracer = script_tracer(args.trace)
+    script_profiler(args.profile, args.profile_memory)
+
+    # Argument: path => Remove ending slashes from path
+    path = project_folder_path(args.path)
+
+    # Analysis server
+    server = AnalysisServer(path,
+                            socket_path=args.socket_path,
+                            jobs=args.jobs,
+                            swift_backend=args.swift_backend,
+                            poll_interval=args.poll_interval,
+                            tracer=tracer)
+
+    try:
+        server.serve()
+    except XcodeProjectReadException as e:
+        print("An error occurred when serving Xcode project: {}".format(e.message))
+        return
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
@@ -22,3 +22,74 @@ def parse_ignored_folders(input_ignored_folders):
     ignored_dirpaths = set(map(lambda f: f if not f.startswith('/') else f[1:], ignored_dirpaths))
 
     return ignored_dirpaths, ignored_dirs
+
+
+# Arguments shared by the scripts
+
+def add_path_argument(argument_parser):
+    argument_parser.add_argument('path',
+                                 help='Path of the folder containing your `.xcodeproj` folder.')
+
+
+def add_jobs_argument(argument_parser, help='Number of processes parsing or searching files concurrently. Default is the number of CPUs.'):
+    argument_parser.add_argument('-j', '--jobs',
+                                 dest='jobs',
+                                 type=int,
+                                 metavar='<count>',
+                                 help=help)
+
+
+def add_swift_backend_argument(argument_parser):
+    argument_parser.add_argument('--swift-backend',
+                                 choices=['sourcekitten', 'sourcekitten-server', 'native'],
+                                 dest='swift_backend',
+                                 default='sourcekitten',
+                                 help='Parser of the Swift files: one `sourcekitten` process per file, one long-lived \
+                                 structure server process for all the files (command given by the \
+                                 XCANALYZER_STRUCTURE_SERVER environment variable) or the faster in-process `native` \
+                                 scanner which only reads type declarations. Default is `sourcekitten`.')
+
+
+def add_server_argument(argument_parser):
+    argument_parser.add_argument('--server',
+                                 dest='server',
+                                 action='store_true',
+                                 help='Ask the analysis server of the project, started with `xcanalyzer-server.py`, \
+                                 instead of loading the project.')
+
+
+def add_diagnostic_arguments(argument_parser):
+    """ Trace and profile arguments, given by every script. """
+    add_trace_argument(argument_parser)
+    add_profile_arguments(argument_parser)
+
+
+def add_trace_argument(argument_parser):
+    argument_parser.add_argument('--trace',
+                                 dest='trace',
+                                 metavar='<trace.json>',
+                                 help='Time the phases of the analysis and count the files, bytes, types and subprocesses: \
+                                 written in the Chrome trace format to the given JSON file, or printed as a summary table \
+                                 to the error output with `-`.')
+
+
+def add_profile_arguments(argument_parser):
+    argument_parser.add_argument('--profile',
+                                 dest='profile',
+                                 metavar='<prefix>',
+                                 help='Profile the script with cProfile and with stack sampling: writes `<prefix>.pstats` \
+                                 and the collapsed stacks of `<prefix>.collapsed`, for flame graph tools.')
+
+    argument_parser.add_argument('--profile-memory',
+                                 dest='profile_memory',
+                                 metavar='<prefix>',
+                                 help='Trace the memory allocations of the script with tracemalloc: writes the peak \
+                                 and the top allocations to `<prefix>.memory.txt`.')
+
+
+def project_folder_path(path):
+    """ Path of the project folder without its ending slashes. """
+    while path and path[-1] == os.path.sep:
+        path = path[:-1]
+
+    return path
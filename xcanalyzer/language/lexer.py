@@ -0,0 +1,216 @@
+""" Streaming lexer of Swift and Objective-C sources.
+
+Yields the identifiers and the punctuation of a source with their line number,
+brace depth and offset. Comments, string and character literals and numbers are
+skipped, apart from the code of Swift string interpolations and the header
+names of Objective-C `#import` and `#include` directives, whose identifiers
+are yielded.
+"""
+
+import functools
+import re
+
+
+# Languages
+SWIFT = 'swift'
+OBJC = 'objc'
+
+# Token kinds
+IDENTIFIER = 'identifier'
+PUNCTUATION = 'punctuation'
+
+# Swift keywords
+SWIFT_ACCESSIBILITY_KEYWORDS = {'private', 'fileprivate', 'internal', 'public', 'open'}
+
+# Keywords that can follow `class` when it is a modifier: `class func`, `class var`...
+SWIFT_CLASS_MEMBER_KEYWORDS = {'func', 'var', 'let', 'subscript', 'override', 'final', 'static', 'required',
+                               'convenience', 'dynamic', 'lazy', 'init', 'deinit', 'typealias'} | SWIFT_ACCESSIBILITY_KEYWORDS
+
+# Objective-C comments and literals, also skipped by the Objective-C declarations scanner
+OBJC_COMMENT_PATTERN = r'//[^\n]*|/\*.*?(?:\*/|\Z)'
+OBJC_LITERAL_PATTERN = r'"(?:[^"\\\n]|\\.)*"|\'(?:[^\'\\\n]|\\.)*\''
+
+IDENTIFIER_REGEX = re.compile(r'@?[A-Za-z_$][\w$]*')
+
+# Each token is told apart by the name of its last matched group, skipped
+# comments, literals and numbers having no group.
+OBJC_TOKEN_REGEX = re.compile(r'''
+    (?P<identifier>@?[A-Za-z_$][\w$]*)
+  | \d\w*
+  | (?P<header>\#[ \t]*(?:import|include)[ \t]*(?:"[^"\n]*"|<[^>\n]*>))
+  | {}
+  | {}
+  | (?P<punctuation>[^\s\w])
+'''.format(OBJC_COMMENT_PATTERN, OBJC_LITERAL_PATTERN), re.VERBOSE | re.DOTALL)
+
+# Swift code, in which strings and nested block comments are lexed apart. The
+# code of string interpolations also tells its parentheses apart.
+SWIFT_TOKEN_PATTERN = r'''
+    (?P<identifier>[A-Za-z_$][\w$]*)
+  | `(?P<escaped_identifier>[^`\n]+)`
+  | \d\w*
+  | //[^\n]*
+  | (?P<block_comment>/\*)
+  | (?P<string>\#*(?:"""|"))
+  {}
+  | (?P<punctuation>[^\s\w])
+'''
+SWIFT_TOKEN_REGEX = re.compile(SWIFT_TOKEN_PATTERN.format(''), re.VERBOSE)
+SWIFT_INTERPOLATION_TOKEN_REGEX = re.compile(SWIFT_TOKEN_PATTERN.format(r'| (?P<opening>\() | (?P<closing>\))'), re.VERBOSE)
+
+SWIFT_BLOCK_COMMENT_DELIMITER_REGEX = re.compile(r'/\*|\*/')
+
+
+@functools.lru_cache(maxsize=16)
+def _swift_string_regex(pounds_count, is_multiline):
+    """ Regex of the end, the interpolations and the escapes of a Swift string with the given delimiter. """
+    pounds = '#' * pounds_count
+    quotes = '"""' if is_multiline else '"'
+    unterminated = '' if is_multiline else r'|(?P<unterminated>\n)'
+
+    return re.compile(r'(?P<end>{quotes}{pounds})|(?P<interpolation>\\{pounds}\()|\\{pounds}.{unterminated}'.format(
+        quotes=quotes, pounds=pounds, unterminated=unterminated), re.DOTALL)
+
+
+def _end_of_swift_block_comment(source, position):
+    """ Position following the block comment whose opening ends at `position`. Block comments can be nested. """
+    depth = 1
+
+    while depth:
+        match = SWIFT_BLOCK_COMMENT_DELIMITER_REGEX.search(source, position)
+        if match is None:
+            return len(source)
+
+        position = match.end()
+        depth += 1 if match.group() == '/*' else -1
+
+    return position
+
+
+def _objc_tokens(source):
+    line_number = 1
+    line_position = 0
+    depth = 0
+
+    for match in OBJC_TOKEN_REGEX.finditer(source):
+        kind = match.lastgroup
+        if kind is None:  # Comment, literal or number
+            continue
+
+        start = match.start()
+        line_number += source.count('\n', line_position, start)
+        line_position = start
+
+        if kind == IDENTIFIER:
+            yield (IDENTIFIER, match.group(kind), line_number, depth, start)
+
+        elif kind == PUNCTUATION:
+            text = match.group(kind)
+            if text == '{':
+                yield (PUNCTUATION, text, line_number, depth, start)
+                depth += 1
+            elif text == '}':
+                depth -= 1
+                yield (PUNCTUATION, text, line_number, depth, start)
+            else:
+                yield (PUNCTUATION, text, line_number, depth, start)
+
+        else:  # Header name
+            for identifier_match in IDENTIFIER_REGEX.finditer(match.group(kind)):
+                yield (IDENTIFIER, identifier_match.group(), line_number, depth, start + identifier_match.start())
+
+
+def _swift_tokens(source):
+    line_number = 1
+    line_position = 0
+    depth = 0
+    position = 0
+
+    # Strings being lexed, by their regex, and interpolations, by their parentheses depth
+    nested = list()
+
+    while True:
+        # String content
+        if nested and type(nested[-1]) is not int:
+            match = nested[-1].search(source, position)
+            if match is None:
+                return
+
+            position = match.end()
+            if match.lastgroup == 'interpolation':
+                nested.append(1)
+            elif match.lastgroup is not None:  # End of the string
+                nested.pop()
+            continue
+
+        # Code
+        token_regex = SWIFT_INTERPOLATION_TOKEN_REGEX if nested else SWIFT_TOKEN_REGEX
+        match = token_regex.search(source, position)
+        if match is None:
+            return
+
+        position = match.end()
+        kind = match.lastgroup
+        if kind is None:  # Comment or number
+            continue
+
+        start = match.start()
+        line_number += source.count('\n', line_position, start)
+        line_position = start
+
+        if kind == IDENTIFIER or kind == 'escaped_identifier':
+            yield (IDENTIFIER, match.group(kind), line_number, depth, start)
+
+        elif kind == PUNCTUATION:
+            text = match.group(kind)
+            if text == '{':
+                yield (PUNCTUATION, text, line_number, depth, start)
+                depth += 1
+            elif text == '}':
+                depth -= 1
+                yield (PUNCTUATION, text, line_number, depth, start)
+            else:
+                yield (PUNCTUATION, text, line_number, depth, start)
+
+        elif kind == 'block_comment':
+            position = _end_of_swift_block_comment(source, position)
+
+        elif kind == 'string':
+            delimiter = match.group(kind)
+            nested.append(_swift_string_regex(delimiter.count('#'), delimiter.endswith('"""')))
+
+        elif kind == 'opening':
+            yield (PUNCTUATION, '(', line_number, depth, start)
+            nested[-1] += 1
+
+        elif kind == 'closing':
+            nested[-1] -= 1
+            if nested[-1]:
+                yield (PUNCTUATION, ')', line_number, depth, start)
+            else:  # End of the interpolation
+                nested.pop()
+
+
+def tokens(source, language):
+    """ Tokens of the Swift or Objective-C source, as (kind, text, line number, brace depth, offset) tuples.
+
+    The depth of an opening brace is the one before it and the depth of a closing
+    brace the one after it, so that both braces of a block have the same depth.
+    The offset is the one of the token in the source, the backtick of an escaped
+    Swift identifier included. Objective-C identifiers can start with `@`: `@interface`, `@end`...
+    """
+    if language == SWIFT:
+        return _swift_tokens(source)
+    return _objc_tokens(source)
+
+
+def file_language(filepath):
+    return SWIFT if filepath.endswith('.swift') else OBJC
+
+
+def file_tokens(filepath):
+    """ Tokens of the source file, as given by `tokens`, its language being told by its extension. """
+    with open(filepath) as opened_file:
+        source = opened_file.read()
+
+    return tokens(source, file_language(filepath))
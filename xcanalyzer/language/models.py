@@ -1,3 +1,6 @@
+import sys
+
+
 UI_VIEW_CONTROLLER_BASE_CLASSES = {
     'UIViewController',
     'UINavigationController',
@@ -5,6 +8,39 @@ UI_VIEW_CONTROLLER_BASE_CLASSES = {
     'UITabBarController',
 }
 
+# Shared empty containers of the Swift types without inherited, inner or used types
+NO_TYPE_NAMES = frozenset()
+NO_TYPES = ()
+
+
+def interned(value):
+    """ Value interned when it is a string, so that equal names and paths share one string. """
+    if type(value) is str:
+        return sys.intern(value)
+    return value
+
+
+class CompactModel():
+    """ Model with `__slots__` instead of a `__dict__` by instance.
+
+    Pickled as the tuple of its slot values, the strings of `INTERNED_SLOTS`
+    being interned again when unpickled, and the caches of `TRANSIENT_SLOTS`
+    being pickled as None.
+    """
+
+    __slots__ = ()
+
+    INTERNED_SLOTS = frozenset()
+    TRANSIENT_SLOTS = frozenset()
+
+    def __getstate__(self):
+        return tuple(None if name in self.TRANSIENT_SLOTS else getattr(self, name) for name in self.__slots__)
+
+    def __setstate__(self, state):
+        for name, value in zip(self.__slots__, state):
+            setattr(self, name, interned(value) if name in self.INTERNED_SLOTS else value)
+
+
 class SwiftAccessibility():
 
     PRIVATE = 'private'
@@ -54,47 +90,112 @@ class SwiftTypeType():
     }
 
 
-class SwiftType():
+class SwiftType(CompactModel):
 
-    def __init__(self, type_identifier, name, accessibility, raw_inherited_types=set(), discriminant=None):
+    # Caches first, so that they are reset before the other slots when unpickled
+    __slots__ = ('_key',
+                 '_inner_types_preorder',
+                 'type_identifier',
+                 'name',
+                 'accessibility',
+                 'raw_inherited_types',
+                 'discriminant',
+                 'parent_type',
+                 'inner_types',
+                 'used_types',
+                 'file')
+
+    INTERNED_SLOTS = frozenset(['type_identifier', 'name', 'accessibility'])
+    TRANSIENT_SLOTS = frozenset(['_key', '_inner_types_preorder'])
+
+    # Attributes of which `key` and `fullname` are derived, for the type and its inner types
+    KEY_SOURCES = frozenset(['type_identifier', 'name', 'accessibility', 'discriminant', 'parent_type'])
+
+    def __init__(self, type_identifier, name, accessibility, raw_inherited_types=NO_TYPE_NAMES, discriminant=None):
         assert type_identifier in SwiftTypeType.ALL
         assert accessibility in SwiftAccessibility.ALL
 
-        self.type_identifier = type_identifier
-        self.name = name
-        self.accessibility = accessibility
-        self.raw_inherited_types = raw_inherited_types
+        self._key = None
+        self._inner_types_preorder = None
+
+        self.type_identifier = interned(type_identifier)
+        self.name = interned(name)
+        self.accessibility = interned(accessibility)
+        self.raw_inherited_types = frozenset(interned(t) for t in raw_inherited_types) if raw_inherited_types else NO_TYPE_NAMES
         self.discriminant = discriminant
 
+        # Empty inner and used types are shared: they are replaced, not modified in place
         self.parent_type = None
-        self.inner_types = list()
+        self.inner_types = NO_TYPES
 
-        self.used_types = set()
+        self.used_types = NO_TYPE_NAMES
 
         self.file = None
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+
+        if name in self.KEY_SOURCES:
+            self.invalidate_key()
+        elif name == 'inner_types':
+            self.invalidate_inner_types_preorder()
+
+    def invalidate_key(self):
+        """ Invalidates the keys of the type and of its inner types.
+
+        A key is only computed once the key of the parent type is computed, so
+        the inner types of a type without key have no key either.
+        """
+        swift_types = [self]
+
+        while swift_types:
+            swift_type = swift_types.pop()
+
+            if swift_type._key is not None:
+                object.__setattr__(swift_type, '_key', None)
+                swift_types.extend(swift_type.inner_types)
+
+    def invalidate_inner_types_preorder(self):
+        """ Invalidates the flattened inner types of the type and of its parent types. """
+        swift_type = self
+
+        while swift_type is not None and swift_type._inner_types_preorder is not None:
+            object.__setattr__(swift_type, '_inner_types_preorder', None)
+            swift_type = swift_type.parent_type
     
     def __repr__(self):
         return '{:<11} {:<9} {}'.format(self.accessibility, self.type_identifier, self.name)
     
     def __eq__(self, other):
-        return self.type_identifier == other.type_identifier and \
-            self.fullname == other.fullname and \
-            self.accessibility == other.accessibility and \
-            (self.type_identifier != SwiftTypeType.EXTENSION or self.discriminant == other.discriminant)
+        if self is other:
+            return True
+
+        if not isinstance(other, SwiftType):
+            return NotImplemented
+
+        return self.key == other.key
     
     def __hash__(self):
-        return hash((self.type_identifier, self.name, self.accessibility))
+        return hash(self.key)
 
     @property
-    def fullname(self):
-        names = [self.name]
+    def key(self):
+        """ Tuple identifying the type: two types are equal when their keys are equal. """
+        if self._key is None:
+            if self.parent_type is None:
+                fullname = self.name
+            else:
+                fullname = '{}.{}'.format(self.parent_type.fullname, self.name)
 
-        parent = self.parent_type
-        while parent:
-            names.append(parent.name)
-            parent = parent.parent_type
-        
-        return '.'.join(reversed(names))
+            discriminant = self.discriminant if self.type_identifier == SwiftTypeType.EXTENSION else None
+
+            object.__setattr__(self, '_key', (self.type_identifier, fullname, self.accessibility, discriminant))
+
+        return self._key
+
+    @property
+    def fullname(self):
+        return self.key[1]
 
     @property
     def inherited_types(self):
@@ -116,14 +217,22 @@ class SwiftType():
     def inherits_from_one_of(self, class_names):
         return bool(class_names & self.inherited_types)
     
-    def inner_types_all_filtered(self, type_not_in=set()):
-        results = set()
+    @property
+    def inner_types_preorder(self):
+        """ Inner types of the type and of its inner types, each one followed by its own inner types. """
+        if self._inner_types_preorder is None:
+            results = list()
 
-        for inner_type in self.inner_types:
-            results.add(inner_type)
-            results |= inner_type.inner_types_all
-        
-        return {t for t in results if t.type_identifier not in type_not_in}
+            for inner_type in self.inner_types:
+                results.append(inner_type)
+                results += inner_type.inner_types_preorder
+
+            object.__setattr__(self, '_inner_types_preorder', tuple(results) or NO_TYPES)
+
+        return self._inner_types_preorder
+
+    def inner_types_all_filtered(self, type_not_in=set()):
+        return {t for t in self.inner_types_preorder if t.type_identifier not in type_not_in}
 
     @property
     def inner_types_all(self):
@@ -166,26 +275,34 @@ class ObjcEnumType():
     }
 
 
-class ObjcInterface():
-    
+class ObjcInterface(CompactModel):
+
+    __slots__ = ('class_name', 'super_class_name')
+
+    INTERNED_SLOTS = frozenset(__slots__)
+
     def __init__(self, class_name, super_class_name):
-        self.class_name = class_name
-        self.super_class_name = super_class_name
+        self.class_name = interned(class_name)
+        self.super_class_name = interned(super_class_name)
 
     def __repr__(self):
         # We consider that an objective-c interface defines an objective-c class
         return '{:<15} {}'.format(ObjcTypeType.CLASS, self.class_name)
 
 
-class ObjcType():
+class ObjcType(CompactModel):
+
+    __slots__ = ('type_identifier', 'name', 'super_class_name', 'category_name', 'file')
+
+    INTERNED_SLOTS = frozenset(['type_identifier', 'name', 'super_class_name', 'category_name'])
 
     def __init__(self, type_identifier, name, super_class_name=None, category_name=None):
         assert type_identifier in ObjcTypeType.ALL
 
-        self.type_identifier = type_identifier
-        self.name = name
-        self.super_class_name = super_class_name
-        self.category_name = category_name
+        self.type_identifier = interned(type_identifier)
+        self.name = interned(name)
+        self.super_class_name = interned(super_class_name)
+        self.category_name = interned(category_name)
 
         self.file = None
 
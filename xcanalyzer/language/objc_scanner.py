@@ -0,0 +1,79 @@
+""" Single pass scanner of Objective-C declarations.
+
+Reads a whole Objective-C source with one precompiled pattern whose first
+alternatives consume comments and string literals, as the lexer skips them,
+so that declarations written inside them are ignored.
+"""
+
+import re
+
+from .lexer import OBJC_COMMENT_PATTERN, OBJC_LITERAL_PATTERN
+from .models import ObjcEnumType, ObjcInterface, ObjcType, ObjcTypeType
+
+
+# Enum macros: NS_ENUM, NS_OPTIONS...
+ENUM_MACROS_PATTERN = '|'.join(sorted(ObjcEnumType.ALL))
+
+# Each declaration is told apart by the name of its last matched group. The
+# leading lookahead skips the characters which cannot start any alternative.
+OBJC_DECLARATION_REGEX = re.compile(r'''
+  (?=[/"'@\#*t])
+  (?:
+    (?P<comment>%(comment)s)
+  | (?P<string>%(literal)s)
+  | @interface\s+(?P<interface_name>\w+)\s*:\s*(?P<super_class_name>\w+)
+  | @implementation\s+(?P<implementation_name>\w+)
+        (?:\s*\(\s*(?P<category_name>\w*)\s*\)|(?=[ \t]*\{?[ \t]*(?:$|//|/\*)))
+  | typedef\s+(?:%(enum_macros)s)\s*\(\s*\w+\s*,\s*(?P<enum_name>\w+)\s*\)
+  | typedef\s+enum\b[^{;]*\{[^}]*\}\s*(?P<c_enum_name>\w+)\s*;
+  | \#[ \t]*define[ \t]+(?P<macro_constant_name>\w+)[ \t]+(?=\S)
+  | \*\s*const\s+(?P<constant_name>\w+)
+  | @protocol\s+(?P<protocol_name>\w+)\b(?!\s*;)
+  )
+''' % {'comment': OBJC_COMMENT_PATTERN, 'literal': OBJC_LITERAL_PATTERN, 'enum_macros': ENUM_MACROS_PATTERN}, re.VERBOSE | re.MULTILINE | re.DOTALL)
+
+
+def objc_declarations(source):
+    """ Objective-C types and interfaces declared in the source, in the source order. """
+    objc_types = list()
+    objc_interfaces = list()
+
+    for match in OBJC_DECLARATION_REGEX.finditer(source):
+        last_group = match.lastgroup
+
+        # Comments and strings
+        if last_group == 'comment' or last_group == 'string':
+            continue
+
+        # Objc interface
+        elif last_group == 'super_class_name':
+            objc_interfaces.append(ObjcInterface(class_name=match.group('interface_name'),
+                                                 super_class_name=match.group('super_class_name')))
+
+        # Objc class
+        elif last_group == 'implementation_name':
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.CLASS, name=match.group('implementation_name')))
+
+        # Objc category
+        elif last_group == 'category_name':
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.CATEGORY,
+                                       name=match.group('implementation_name'),
+                                       category_name=match.group('category_name')))
+
+        # Objc enum, with an enum macro or in C style
+        elif last_group == 'enum_name' or last_group == 'c_enum_name':
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.ENUM, name=match.group(last_group)))
+
+        # Objc constant macro
+        elif last_group == 'macro_constant_name':
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.MACRO_CONSTANT, name=match.group(last_group)))
+
+        # Objc constant
+        elif last_group == 'constant_name':
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.CONSTANT, name=match.group(last_group)))
+
+        # Objc protocol
+        elif last_group == 'protocol_name':
+            objc_types.append(ObjcType(type_identifier=ObjcTypeType.PROTOCOL, name=match.group(last_group)))
+
+    return objc_types, objc_interfaces
@@ -0,0 +1,258 @@
+""" In-process scanner of Swift type declarations.
+
+Gives the structure of a Swift source in the format of `sourcekitten structure`,
+restricted to type declarations: protocols, extensions, structs, enums and
+classes, with their name, accessibility, inherited types and inner types.
+"""
+
+from .lexer import IDENTIFIER, SWIFT, SWIFT_ACCESSIBILITY_KEYWORDS, SWIFT_CLASS_MEMBER_KEYWORDS, tokens
+
+
+TYPE_KEYWORDS = {'protocol', 'extension', 'struct', 'enum', 'class'}
+
+# Compiler directives, skipped up to the end of their line
+DIRECTIVE_KEYWORDS = {'if', 'elseif', 'else', 'endif', 'sourceLocation', 'warning', 'error'}
+
+# Fields of the lexer tokens
+KIND, TEXT, LINE_NUMBER, DEPTH, OFFSET = range(5)
+
+
+def _declaration_tokens(source):
+    """ Tokens of the Swift source given by the lexer, compiler directives excepted. """
+    results = []
+    directive_line_number = None
+
+    for token in tokens(source, SWIFT):
+        if token[LINE_NUMBER] == directive_line_number:
+            continue
+
+        if results and results[-1][TEXT] == '#' and token[TEXT] in DIRECTIVE_KEYWORDS and token[OFFSET] == results[-1][OFFSET] + 1:
+            results.pop()
+            directive_line_number = token[LINE_NUMBER]
+            continue
+
+        results.append(token)
+
+    return results
+
+
+def _end_offset(source, token):
+    """ Offset following the token in the source, the backticks of an escaped identifier included. """
+    if source[token[OFFSET]] == '`':
+        return token[OFFSET] + len(token[TEXT]) + 2
+    return token[OFFSET] + len(token[TEXT])
+
+
+class SwiftDeclarationScanner():
+    """ Scanner of the type declarations of a Swift source. """
+
+    def __init__(self, source):
+        self.source = source
+        self.tokens = _declaration_tokens(source)
+        self.index = 0
+
+    def structure(self):
+        """ Structure of the source in the format of `sourcekitten structure`. """
+        self.index = 0
+        return {'key.substructure': self._scan_declarations(parent=None)}
+
+    # Tokens
+
+    def _token(self, offset=0):
+        index = self.index + offset
+        if index < len(self.tokens):
+            return self.tokens[index]
+        return None
+
+    def _is(self, text, offset=0):
+        token = self._token(offset)
+        return token is not None and token[TEXT] == text
+
+    def _skip_balanced(self, opening, closing):
+        """ Skips tokens from the opening punctuation to its matching closing one. """
+        depth = 0
+        while self.index < len(self.tokens):
+            text = self.tokens[self.index][TEXT]
+            self.index += 1
+
+            if text == opening:
+                depth += 1
+            elif text == closing:
+                depth -= 1
+                if depth == 0:
+                    return
+
+    # Declarations
+
+    def _scan_declarations(self, parent):
+        """ Type declarations until the end of the current body. """
+        substructures = []
+        accessibility = None
+
+        while self.index < len(self.tokens):
+            kind, text = self.tokens[self.index][:2]
+
+            if text == '}':
+                self.index += 1
+                break
+
+            elif text == '{':  # Body of a function, a property, a closure...
+                self._skip_balanced('{', '}')
+                accessibility = None
+
+            elif text == '@':  # Attribute
+                self.index += 2
+                if self._is('('):
+                    self._skip_balanced('(', ')')
+
+            elif kind == IDENTIFIER and text in SWIFT_ACCESSIBILITY_KEYWORDS:
+                self.index += 1
+                if self._is('(') and self._is('set', 1):  # Setter accessibility
+                    self._skip_balanced('(', ')')
+                else:
+                    accessibility = text
+
+            elif kind == IDENTIFIER and text in TYPE_KEYWORDS and self._is_type_declaration():
+                substructures.append(self._scan_type_declaration(text, accessibility, parent))
+                accessibility = None
+
+            else:
+                if kind == IDENTIFIER and text not in {'final', 'indirect', 'static'}:
+                    accessibility = None
+                self.index += 1
+
+        return substructures
+
+    def _is_type_declaration(self):
+        next_token = self._token(1)
+        if next_token is None or next_token[KIND] != IDENTIFIER:
+            return False
+
+        if self._token()[TEXT] == 'class' and next_token[TEXT] in SWIFT_CLASS_MEMBER_KEYWORDS:
+            return False
+
+        # Keyword used as a member name: `.class`, `.enum`
+        previous_token = self._token(-1) if self.index > 0 else None
+        if previous_token is not None and previous_token[TEXT] == '.':
+            return False
+
+        return True
+
+    def _scan_type_declaration(self, keyword, accessibility, parent):
+        self.index += 1  # keyword
+
+        # Name, qualified for extensions of inner types
+        name = self._token()[TEXT]
+        self.index += 1
+        while self._is('.') and self._token(1) is not None and self._token(1)[KIND] == IDENTIFIER:
+            name = '{}.{}'.format(name, self._token(1)[TEXT])
+            self.index += 2
+
+        # Generic parameters
+        if self._is('<'):
+            self._skip_balanced('<', '>')
+
+        # Inherited types
+        inherited_types = []
+        if self._is(':'):
+            self.index += 1
+            inherited_types = self._scan_inherited_types()
+
+        # Generic requirements
+        while self.index < len(self.tokens) and not self._is('{') and not self._is('}'):
+            self.index += 1
+
+        substructure = {
+            'key.kind': 'source.lang.swift.decl.{}'.format(keyword),
+            'key.name': name,
+        }
+
+        effective_accessibility = self._effective_accessibility(keyword, accessibility, parent)
+        if effective_accessibility:
+            substructure['key.accessibility'] = 'source.lang.swift.accessibility.{}'.format(effective_accessibility)
+        substructure['_accessibility'] = effective_accessibility or accessibility
+
+        if inherited_types:
+            substructure['key.inheritedtypes'] = [{'key.name': t} for t in inherited_types]
+
+        # Body
+        if self._is('{'):
+            self.index += 1
+            substructure['key.substructure'] = self._scan_declarations(parent=substructure)
+
+        return substructure
+
+    def _scan_inherited_types(self):
+        """ Source texts of the inherited types, until the `where` clause or the body. """
+        results = []
+        start_token = None
+        end_token = None
+        depth = 0
+
+        while self.index < len(self.tokens):
+            token = self.tokens[self.index]
+            kind, text = token[:2]
+
+            if depth == 0 and (text in {'{', '}'} or (kind == IDENTIFIER and text == 'where')):
+                break
+
+            if text in {'<', '(', '['}:
+                depth += 1
+            elif text in {'>', ')', ']'}:
+                depth -= 1
+
+            if depth == 0 and text == ',':
+                if start_token is not None:
+                    results.append(self.source[start_token[OFFSET]:_end_offset(self.source, end_token)])
+                start_token = None
+            else:
+                if start_token is None:
+                    start_token = token
+                end_token = token
+
+            self.index += 1
+
+        if start_token is not None:
+            results.append(self.source[start_token[OFFSET]:_end_offset(self.source, end_token)])
+
+        return results
+
+    def _effective_accessibility(self, keyword, accessibility, parent):
+        """ Accessibility given by sourcekitten: the declared one or the default one. """
+        if accessibility is not None:
+            return accessibility
+
+        # Extensions have an accessibility only when declared
+        if keyword == 'extension':
+            return None
+
+        if parent is None:
+            return 'internal'
+
+        parent_accessibility = parent['_accessibility']
+
+        # Members of an extension default to the extension accessibility
+        if parent['key.kind'] == 'source.lang.swift.decl.extension':
+            if parent_accessibility == 'private':
+                return 'fileprivate'
+            return parent_accessibility or 'internal'
+
+        if parent_accessibility in {'private', 'fileprivate'}:
+            return 'fileprivate'
+
+        return 'internal'
+
+
+def _without_private_keys(substructures):
+    for substructure in substructures:
+        substructure.pop('_accessibility', None)
+        _without_private_keys(substructure.get('key.substructure', []))
+
+    return substructures
+
+
+def swift_file_structure(source):
+    """ Structure of the type declarations of the Swift source, as given by `sourcekitten structure`. """
+    structure = SwiftDeclarationScanner(source).structure()
+    _without_private_keys(structure['key.substructure'])
+    return structure
@@ -0,0 +1,82 @@
+from unittest import TestCase
+
+from ..lexer import IDENTIFIER, OBJC, SWIFT, tokens
+
+
+def identifiers(source, language):
+    return [(text, line_number) for (kind, text, line_number, _, _) in tokens(source, language) if kind == IDENTIFIER]
+
+
+class SwiftTokensTests(TestCase):
+
+    # comments
+
+    def test_tokens__skips_line_and_nested_block_comments(self):
+        source = '\n'.join([
+            'let a = 1 // MyType',
+            '/* MyType /* MyType */ MyType */ let b: MyType',
+        ])
+
+        self.assertEqual(identifiers(source, SWIFT), [('let', 1), ('a', 1), ('let', 2), ('b', 2), ('MyType', 2)])
+
+    # strings
+
+    def test_tokens__skips_strings__but_not_their_interpolations(self):
+        source = '\n'.join([
+            'let a = "MyType \\(MyOther.name("}")) \\"MyType\\""',
+            'let b = #"MyType \\(MyType) \\#(MyRaw)"#',
+            'let c = """',
+            '    "MyType" \\(MyMulti)',
+            '    """',
+        ])
+
+        self.assertEqual([t for (t, _) in identifiers(source, SWIFT) if t.startswith('My')], ['MyOther', 'MyRaw', 'MyMulti'])
+        self.assertEqual(identifiers(source, SWIFT)[-2:], [('c', 3), ('MyMulti', 4)])
+
+    def test_tokens__ends_unterminated_string_at_end_of_line(self):
+        source = 'let a = "MyType\nlet b: MyType'
+
+        self.assertEqual(identifiers(source, SWIFT)[-3:], [('let', 2), ('b', 2), ('MyType', 2)])
+
+    # identifiers
+
+    def test_tokens__gives_escaped_identifiers_without_backticks__and_skips_numbers(self):
+        source = 'let `class` = 0x1F + $0'
+
+        self.assertEqual(identifiers(source, SWIFT), [('let', 1), ('class', 1), ('$0', 1)])
+
+    # offset
+
+    def test_tokens__gives_offsets__including_backtick_of_escaped_identifiers(self):
+        source = 'let `class` = a.b'
+
+        offsets = [(text, offset) for (_, text, _, _, offset) in tokens(source, SWIFT)]
+
+        self.assertEqual(offsets, [('let', 0), ('class', 4), ('=', 12), ('a', 14), ('.', 15), ('b', 16)])
+
+    # depth
+
+    def test_tokens__gives_same_depth_to_both_braces_of_a_block(self):
+        source = 'class A { func f() { "}" } }'
+
+        braces = [(text, depth) for (_, text, _, depth, _) in tokens(source, SWIFT) if text in {'{', '}'}]
+
+        self.assertEqual(braces, [('{', 0), ('{', 1), ('}', 1), ('}', 0)])
+
+
+class ObjcTokensTests(TestCase):
+
+    def test_tokens__skips_comments_and_literals(self):
+        source = '\n'.join([
+            '/* MyType',
+            '   MyType */ NSString *a = @"MyType"; // MyType',
+            "char c = '}';",
+        ])
+
+        self.assertEqual(identifiers(source, OBJC), [('NSString', 2), ('a', 2), ('char', 3), ('c', 3)])
+
+    def test_tokens__gives_identifiers_of_header_names_and_directive_keywords(self):
+        source = '#import "MyClass.h"\n@implementation MyClass\n@end'
+
+        self.assertEqual(identifiers(source, OBJC), [('import', 1), ('MyClass', 1), ('h', 1),
+                                                     ('@implementation', 2), ('MyClass', 2), ('@end', 3)])
@@ -1,6 +1,8 @@
 from unittest import TestCase
 
-from ..models import SwiftType
+import pickle
+
+from ..models import ObjcType, ObjcTypeType, SwiftType
 
 class SwiftTypeTests(TestCase):
 
@@ -102,3 +104,91 @@ class SwiftTypeTests(TestCase):
                            discriminant='extension_2')
         
         self.assertEqual(type_1 == type_2, True)
+
+    # slots and shared empty containers
+
+    def test_swift_types__share_empty_containers__and_have_no_dict(self):
+        type_1 = SwiftType('class', 'MyType1', 'internal')
+        type_2 = SwiftType('struct', 'MyType2', 'internal', raw_inherited_types=set())
+
+        self.assertFalse(hasattr(type_1, '__dict__'))
+        self.assertIs(type_1.inner_types, type_2.inner_types)
+        self.assertIs(type_1.used_types, type_2.used_types)
+        self.assertIs(type_1.raw_inherited_types, type_2.raw_inherited_types)
+        self.assertEqual(list(type_1.inner_types), [])
+        self.assertEqual(type_1.used_types, set())
+
+    def test_swift_type__is_unpickled_with_interned_name(self):
+        swift_type = SwiftType('class', ''.join(['My', 'Type']), 'internal', raw_inherited_types={'MyProtocol'})
+        swift_type.used_types = {'MyUsedType'}
+
+        unpickled_type = pickle.loads(pickle.dumps(swift_type, pickle.HIGHEST_PROTOCOL))
+
+        self.assertEqual(unpickled_type, swift_type)
+        self.assertIs(unpickled_type.name, swift_type.name)
+        self.assertEqual(unpickled_type.raw_inherited_types, {'MyProtocol'})
+        self.assertEqual(unpickled_type.used_types, {'MyUsedType'})
+        self.assertIsNone(unpickled_type.file)
+
+
+    # key, fullname
+
+    def test__fullname__is_updated__when_parent_type_of_an_ancestor_is_set(self):
+        outer_type = SwiftType('class', 'Outer', 'internal')
+        inner_type = SwiftType('struct', 'Inner', 'internal')
+        inner_inner_type = SwiftType('enum', 'Kind', 'internal')
+        inner_type.inner_types = [inner_inner_type]
+        inner_inner_type.parent_type = inner_type
+
+        self.assertEqual(inner_inner_type.fullname, 'Inner.Kind')
+
+        inner_type.parent_type = outer_type
+
+        self.assertEqual(inner_inner_type.fullname, 'Outer.Inner.Kind')
+        self.assertEqual(inner_inner_type.key, ('enum', 'Outer.Inner.Kind', 'internal', None))
+
+    def test__hash__is_same__when_types_are_equal__and_different_for_extensions_with_different_discriminants(self):
+        type_1 = SwiftType('extension', 'String', 'internal', discriminant='extension_1')
+        type_2 = SwiftType('extension', 'String', 'internal', discriminant='extension_1')
+        type_3 = SwiftType('extension', 'String', 'internal', discriminant='extension_2')
+
+        self.assertEqual(hash(type_1), hash(type_2))
+        self.assertEqual(len({type_1, type_2, type_3}), 2)
+
+    def test__eq__returns_false__when_other_is_not_a_swift_type(self):
+        swift_type = SwiftType('class', 'MyType', 'internal')
+        objc_type = ObjcType(ObjcTypeType.CLASS, 'MyType')
+
+        self.assertEqual(swift_type == objc_type, False)
+
+    # inner_types_preorder
+
+    def test__inner_types_preorder__gives_inner_types_before_their_own_inner_types__and_is_updated(self):
+        outer_type = SwiftType('class', 'Outer', 'internal')
+        inner_type_1 = SwiftType('struct', 'Inner1', 'internal')
+        inner_type_2 = SwiftType('struct', 'Inner2', 'internal')
+        inner_inner_type = SwiftType('enum', 'Kind', 'internal')
+        outer_type.inner_types = [inner_type_1, inner_type_2]
+        inner_type_1.parent_type = outer_type
+        inner_type_2.parent_type = outer_type
+
+        self.assertEqual(outer_type.inner_types_preorder, (inner_type_1, inner_type_2))
+
+        inner_type_1.inner_types = [inner_inner_type]
+        inner_inner_type.parent_type = inner_type_1
+
+        self.assertEqual(outer_type.inner_types_preorder, (inner_type_1, inner_inner_type, inner_type_2))
+        self.assertEqual(outer_type.inner_types_all_filtered(type_not_in={'enum'}), {inner_type_1, inner_type_2})
+
+class ObjcTypeTests(TestCase):
+
+    # pickle
+
+    def test_objc_type__is_unpickled_without_dict(self):
+        objc_type = ObjcType(ObjcTypeType.CATEGORY, 'NSString', category_name='MyCategory')
+
+        unpickled_type = pickle.loads(pickle.dumps(objc_type, pickle.HIGHEST_PROTOCOL))
+
+        self.assertFalse(hasattr(unpickled_type, '__dict__'))
+        self.assertEqual((unpickled_type.type_identifier, unpickled_type.name, unpickled_type.category_name),
+                         (ObjcTypeType.CATEGORY, 'NSString', 'MyCategory'))
@@ -0,0 +1,132 @@
+from unittest import TestCase
+
+from ..models import ObjcTypeType
+from ..objc_scanner import objc_declarations
+
+
+def declared_types(source):
+    objc_types, _ = objc_declarations(source)
+    return [(t.type_identifier, t.name) for t in objc_types]
+
+
+class ObjcDeclarationsTests(TestCase):
+
+    # interfaces
+
+    def test_objc_declarations__gives_interfaces_with_super_class(self):
+        source = '''
+            @interface MyClass : NSObject
+            @end
+            @interface MyViewController
+                : UIViewController <UITableViewDelegate>
+            @end
+        '''
+
+        _, objc_interfaces = objc_declarations(source)
+
+        self.assertEqual([(i.class_name, i.super_class_name) for i in objc_interfaces], [('MyClass', 'NSObject'),
+                                                                                         ('MyViewController', 'UIViewController')])
+
+    # implementations
+
+    def test_objc_declarations__gives_classes_and_categories(self):
+        source = '''
+            @implementation MyClass
+            @end
+            @implementation MyOtherClass { // Instance variables
+                int _count;
+            }
+            @end
+            @implementation NSString (MyCategory)
+            @end
+            @implementation NSArray(MyOtherCategory)
+            @end
+        '''
+
+        objc_types, _ = objc_declarations(source)
+
+        self.assertEqual([(t.type_identifier, t.name, t.category_name) for t in objc_types],
+                         [(ObjcTypeType.CLASS, 'MyClass', None),
+                          (ObjcTypeType.CLASS, 'MyOtherClass', None),
+                          (ObjcTypeType.CATEGORY, 'NSString', 'MyCategory'),
+                          (ObjcTypeType.CATEGORY, 'NSArray', 'MyOtherCategory')])
+
+    # enums
+
+    def test_objc_declarations__gives_enums_of_every_enum_macro(self):
+        source = '''
+            typedef NS_ENUM(NSInteger, MyEnum) { MyEnumFirst };
+            typedef NS_OPTIONS(NSUInteger, MyOptions)
+            {
+                MyOptionsFirst = 1 << 0
+            };
+            typedef NS_CLOSED_ENUM( NSInteger , MyClosedEnum ) { MyClosedEnumFirst };
+        '''
+
+        self.assertEqual(declared_types(source), [(ObjcTypeType.ENUM, 'MyEnum'),
+                                                  (ObjcTypeType.ENUM, 'MyOptions'),
+                                                  (ObjcTypeType.ENUM, 'MyClosedEnum')])
+
+    def test_objc_declarations__gives_c_style_enums(self):
+        source = '''
+            typedef enum {
+                FIRST_VALUE, // First value
+                SECOND_VALUE
+            } MyCEnum;
+            typedef enum MyTaggedEnum { TAGGED_VALUE } MyTaggedEnumType;
+        '''
+
+        self.assertEqual(declared_types(source), [(ObjcTypeType.ENUM, 'MyCEnum'),
+                                                  (ObjcTypeType.ENUM, 'MyTaggedEnumType')])
+
+    # constants
+
+    def test_objc_declarations__gives_constants_and_macro_constants(self):
+        source = '''
+            #ifndef MyHeader_h
+            #define MyHeader_h
+            #define myMacroConstant @"value"
+            #define myMacroFunction(x) (x * 2)
+            extern NSString *const myExternConstant;
+            static NSString * const myStaticConstant = @"value";
+            #endif
+        '''
+
+        self.assertEqual(declared_types(source), [(ObjcTypeType.MACRO_CONSTANT, 'myMacroConstant'),
+                                                  (ObjcTypeType.CONSTANT, 'myExternConstant'),
+                                                  (ObjcTypeType.CONSTANT, 'myStaticConstant')])
+
+    # protocols
+
+    def test_objc_declarations__gives_protocols__but_not_forward_declarations(self):
+        source = '''
+            @protocol MyForwardProtocol;
+            @protocol MyProtocol <NSObject>
+            @end
+            @protocol MyEmptyProtocol
+            @end
+            Protocol *protocol = @protocol(MyProtocol);
+        '''
+
+        self.assertEqual(declared_types(source), [(ObjcTypeType.PROTOCOL, 'MyProtocol'),
+                                                  (ObjcTypeType.PROTOCOL, 'MyEmptyProtocol')])
+
+    # comments and strings
+
+    def test_objc_declarations__ignores_declarations_in_comments_and_strings(self):
+        source = '''
+            // @implementation MyCommentedClass
+            /*
+             typedef NS_ENUM(NSInteger, MyCommentedEnum) {};
+             @interface MyCommentedInterface : NSObject
+             */
+            NSString *text = @"@protocol MyStringProtocol <NSObject>";
+            char quote = '"';
+            @implementation MyClass
+            @end
+        '''
+
+        objc_types, objc_interfaces = objc_declarations(source)
+
+        self.assertEqual([(t.type_identifier, t.name) for t in objc_types], [(ObjcTypeType.CLASS, 'MyClass')])
+        self.assertEqual(objc_interfaces, [])
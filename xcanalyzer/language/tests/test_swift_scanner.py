@@ -0,0 +1,163 @@
+from unittest import TestCase
+
+from ..swift_scanner import swift_file_structure
+
+
+def declarations(source):
+    """ (kind, name, accessibility, inherited types, inner declarations) of the declarations of the source. """
+    def summary(substructures):
+        return [(s['key.kind'].split('.')[-1],
+                 s['key.name'],
+                 s.get('key.accessibility', '').split('.')[-1] or None,
+                 [t['key.name'] for t in s.get('key.inheritedtypes', [])],
+                 summary(s.get('key.substructure', []))) for s in substructures]
+
+    return summary(swift_file_structure(source)['key.substructure'])
+
+
+class SwiftFileStructureTests(TestCase):
+
+    # kinds and names
+
+    def test_swift_file_structure__gives_type_declarations(self):
+        source = '''
+            protocol MyProtocol {}
+            extension MyProtocol {}
+            struct MyStruct {}
+            enum MyEnum {}
+            class MyClass {}
+        '''
+
+        self.assertEqual([(d[0], d[1]) for d in declarations(source)], [('protocol', 'MyProtocol'),
+                                                                         ('extension', 'MyProtocol'),
+                                                                         ('struct', 'MyStruct'),
+                                                                         ('enum', 'MyEnum'),
+                                                                         ('class', 'MyClass')])
+
+    def test_swift_file_structure__gives_qualified_name__for_extension_of_inner_type(self):
+        self.assertEqual(declarations('extension Outer.Inner {}')[0][1], 'Outer.Inner')
+
+    def test_swift_file_structure__ignores_class_members(self):
+        source = '''
+            class MyClass {
+                class func make() -> MyClass { return MyClass() }
+                class var shared: MyClass { return MyClass() }
+                final class let count = 0
+            }
+        '''
+
+        self.assertEqual(declarations(source), [('class', 'MyClass', 'internal', [], [])])
+
+    def test_swift_file_structure__ignores_types_declared_in_function_bodies(self):
+        source = '''
+            func myFunction() {
+                struct LocalStruct {}
+            }
+            struct MyStruct {
+                var value: Int {
+                    enum LocalEnum {}
+                    return 0
+                }
+            }
+        '''
+
+        self.assertEqual(declarations(source), [('struct', 'MyStruct', 'internal', [], [])])
+
+    # accessibility
+
+    def test_swift_file_structure__gives_declared_accessibility(self):
+        source = '''
+            @objc public final class MyPublicClass {}
+            private struct MyPrivateStruct {}
+            open class MyOpenClass {}
+            fileprivate enum MyEnum {}
+        '''
+
+        self.assertEqual([d[2] for d in declarations(source)], ['public', 'private', 'open', 'fileprivate'])
+
+    def test_swift_file_structure__gives_internal_accessibility__when_undeclared(self):
+        source = '''
+            struct MyStruct {
+                public private(set) var value = 0
+                class MyInnerClass {}
+            }
+        '''
+
+        self.assertEqual(declarations(source), [('struct', 'MyStruct', 'internal', [], [('class', 'MyInnerClass', 'internal', [], [])])])
+
+    def test_swift_file_structure__gives_no_accessibility_to_extension__when_undeclared(self):
+        self.assertEqual(declarations('extension MyStruct {}')[0][2], None)
+        self.assertEqual(declarations('public extension MyStruct {}')[0][2], 'public')
+
+    def test_swift_file_structure__gives_extension_accessibility_to_inner_types__when_undeclared(self):
+        source = '''
+            public extension MyStruct {
+                struct MyInnerStruct {}
+            }
+        '''
+
+        self.assertEqual(declarations(source)[0][4][0][2], 'public')
+
+    def test_swift_file_structure__gives_fileprivate_accessibility_to_inner_types__of_private_type(self):
+        source = '''
+            private class MyClass {
+                class MyInnerClass {}
+            }
+        '''
+
+        self.assertEqual(declarations(source)[0][4][0][2], 'fileprivate')
+
+    # inherited types
+
+    def test_swift_file_structure__gives_inherited_types_as_written(self):
+        source = '''
+            class MyClass<T: Equatable>: GenericSuperClass<T, Int>, MyProtocol where T: Hashable {}
+            protocol MyProtocol: class, AnyObject {}
+            enum MyEnum: String, Codable { case first = "first" }
+        '''
+
+        self.assertEqual([d[3] for d in declarations(source)], [['GenericSuperClass<T, Int>', 'MyProtocol'],
+                                                                 ['class', 'AnyObject'],
+                                                                 ['String', 'Codable']])
+
+    def test_swift_file_structure__gives_inherited_types_as_written__with_escaped_identifiers(self):
+        source = 'struct MyStruct: `Protocol`, Module.`Type` {}'
+
+        self.assertEqual([d[3] for d in declarations(source)], [['`Protocol`', 'Module.`Type`']])
+
+    # comments, strings and directives
+
+    def test_swift_file_structure__ignores_declarations_in_comments_and_strings(self):
+        source = '''
+            // class CommentedClass {}
+            /* class /* nested */ BlockCommentedClass {} */
+            let text = "class StringClass { \\(value("class")) }"
+            let multiline = """
+                class MultilineStringClass {}
+                """
+            let raw = #"class "RawStringClass" \\(value) {}"#
+            #if os(iOS) // class DirectiveClass {}
+            class MyClass {}
+            #endif
+        '''
+
+        self.assertEqual(declarations(source), [('class', 'MyClass', 'internal', [], [])])
+
+    # inner types
+
+    def test_swift_file_structure__gives_inner_types__recursively(self):
+        source = '''
+            public struct Outer {
+                #if DEBUG
+                enum Inner {
+                    indirect enum InnerInner {}
+                }
+                #endif
+            }
+        '''
+
+        self.assertEqual(declarations(source), [('struct', 'Outer', 'public', [], [
+            ('enum', 'Inner', 'internal', [], [
+                ('enum', 'InnerInner', 'internal', [], []),
+            ]),
+        ])])
@@ -0,0 +1,45 @@
+""" Runner of a script with a profiler.
+
+Runs the script with the given arguments and profiles the whole run, imports
+included, whereas the `--profile` and `--profile-memory` arguments of the
+script start the profiler once its arguments are parsed.
+
+    python -m xcanalyzer.runner --profile build/list-types list-types.py SampleiOSApp --swift-backend native
+"""
+
+import argparse
+import os
+import runpy
+import sys
+
+from .argparse import add_profile_arguments
+from .xcodeproject.profilers import Profiler
+
+
+def run_script(script_path, arguments, profiler):
+    """ Runs the script as `__main__` with the arguments, its profile being written even when it exits. """
+    sys.argv = [script_path] + list(arguments)
+    sys.path.insert(0, os.path.dirname(os.path.abspath(script_path)))
+
+    profiler.start()
+    try:
+        runpy.run_path(script_path, run_name='__main__')
+    finally:
+        profiler.output()
+
+
+def main():
+    argument_parser = argparse.ArgumentParser(description="Run a script with a profiler.")
+    add_profile_arguments(argument_parser)
+    argument_parser.add_argument('script', help='Path of the script to run, ex: `list-types.py`.')
+    argument_parser.add_argument('arguments', nargs=argparse.REMAINDER, help='Arguments of the script.')
+    args = argument_parser.parse_args()
+
+    if not args.profile and not args.profile_memory:
+        argument_parser.error('one of the arguments --profile --profile-memory is required')
+
+    run_script(args.script, args.arguments, Profiler(args.profile, args.profile_memory))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,8 @@
 from unittest import TestCase
 
-from ..argparse import parse_ignored_folders
+import argparse
+
+from ..argparse import add_diagnostic_arguments, add_jobs_argument, add_path_argument, add_swift_backend_argument, parse_ignored_folders, project_folder_path
 
 
 class ParseIgnoredFoldersTests(TestCase):
@@ -21,4 +23,33 @@ class ParseIgnoredFoldersTests(TestCase):
         })
         self.assertEqual(ignored_dirs, {
             'folder1',
-        })
\ No newline at end of file
+        })
+
+
+class ScriptArgumentsTests(TestCase):
+
+    def _argument_parser(self):
+        argument_parser = argparse.ArgumentParser()
+        add_path_argument(argument_parser)
+        add_jobs_argument(argument_parser)
+        add_swift_backend_argument(argument_parser)
+        add_diagnostic_arguments(argument_parser)
+
+        return argument_parser
+
+    def test_shared_arguments__give_defaults(self):
+        args = self._argument_parser().parse_args(['Project'])
+
+        self.assertEqual((args.path, args.jobs, args.swift_backend), ('Project', None, 'sourcekitten'))
+        self.assertEqual((args.trace, args.profile, args.profile_memory), (None, None, None))
+
+    def test_shared_arguments__give_given_values(self):
+        args = self._argument_parser().parse_args(['Project', '-j', '2', '--swift-backend', 'native',
+                                                   '--trace', '-', '--profile', 'build/profile', '--profile-memory', 'build/memory'])
+
+        self.assertEqual((args.path, args.jobs, args.swift_backend), ('Project', 2, 'native'))
+        self.assertEqual((args.trace, args.profile, args.profile_memory), ('-', 'build/profile', 'build/memory'))
+
+    def test_project_folder_path__removes_ending_slashes(self):
+        self.assertEqual(project_folder_path('Folder/Project//'), 'Folder/Project')
+        self.assertEqual(project_folder_path('Project'), 'Project')
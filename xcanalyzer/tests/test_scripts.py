@@ -0,0 +1,24 @@
+from unittest import TestCase, mock
+
+import glob
+import os
+import runpy
+
+
+class ScriptsTests(TestCase):
+
+    def _script_paths(self):
+        root_path = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+        return [p for p in sorted(glob.glob(os.path.join(root_path, '*.py'))) if os.path.basename(p) != 'setup.py']
+
+    def test_scripts__do_not_run__when_imported_by_spawned_process(self):
+        script_paths = self._script_paths()
+        self.assertTrue(script_paths)
+
+        for script_path in script_paths:
+            # Worker processes of the `spawn` start method import the main module as `__mp_main__`
+            with mock.patch('sys.argv', [script_path]), mock.patch('builtins.print') as print_mock:
+                script_globals = runpy.run_path(script_path, run_name='__mp_main__')
+
+            self.assertTrue(callable(script_globals.get('main')), script_path)
+            self.assertFalse(print_mock.called, script_path)
@@ -0,0 +1,118 @@
+import hashlib
+import os
+import pickle
+
+
+def content_hash(filepath):
+    """ SHA-1 hex digest of the content of the file. """
+    digest = hashlib.sha1()
+
+    with open(filepath, 'rb') as opened_file:
+        for chunk in iter(lambda: opened_file.read(1 << 16), b''):
+            digest.update(chunk)
+
+    return digest.hexdigest()
+
+
+class FileStamp():
+    """ Size, modification time and content hash of a file at a given time. """
+
+    def __init__(self, size, mtime, content_hash):
+        self.size = size
+        self.mtime = mtime
+        self.content_hash = content_hash
+
+    @classmethod
+    def stamp_file(cls, filepath, **kwargs):
+        stat = os.stat(filepath)
+        return cls(size=stat.st_size, mtime=stat.st_mtime_ns, content_hash=content_hash(filepath), **kwargs)
+
+    def matches(self, filepath):
+        """ Whether the file still has the same content.
+
+        The content hash is only computed again when the size or the modification time
+        changed. In that case, the stamp takes the new stat if the content is the same.
+        """
+        try:
+            stat = os.stat(filepath)
+        except OSError:
+            return False
+
+        if (self.size, self.mtime) == (stat.st_size, stat.st_mtime_ns):
+            return True
+
+        if self.content_hash != content_hash(filepath):
+            return False
+
+        self.size = stat.st_size
+        self.mtime = stat.st_mtime_ns
+
+        return True
+
+
+class FileCacheEntry(FileStamp):
+
+    def __init__(self, size, mtime, content_hash, parser_version, data):
+        super().__init__(size, mtime, content_hash)
+        self.parser_version = parser_version
+        self.data = data  # pickled parsing result
+
+
+class FileCache():
+    """ Persistent cache of parsing results by file.
+
+    An entry is keyed on the parser name and the file path. It is only reused when
+    the file has the same size, modification time and content hash, and was parsed
+    by the same parser version. When only the size or the modification time differ,
+    the content hash is computed again so that a touched file is not parsed again.
+    """
+
+    def __init__(self, filepath):
+        self.filepath = filepath
+        self.entries = dict()
+        self.has_changes = False
+
+    def load(self):
+        if not os.path.exists(self.filepath):
+            return
+
+        with open(self.filepath, 'rb') as input_data:
+            self.entries = pickle.load(input_data)
+
+        self.has_changes = False
+
+    def save(self):
+        if not self.has_changes:
+            return
+
+        with open(self.filepath, 'wb') as output:
+            pickle.dump(self.entries, output, pickle.HIGHEST_PROTOCOL)
+
+        self.has_changes = False
+
+    def get(self, parser_name, parser_version, filepath):
+        """ Returns the cached parsing result of the file, or `None` if the file changed. """
+        entry = self.entries.get((parser_name, filepath))
+
+        if entry is None or entry.parser_version != parser_version:
+            return None
+
+        stat = (entry.size, entry.mtime)
+
+        if not entry.matches(filepath):
+            return None
+
+        # Same content with a new stat
+        if stat != (entry.size, entry.mtime):
+            self.has_changes = True
+
+        return pickle.loads(entry.data)
+
+    def set(self, parser_name, parser_version, filepath, result):
+        """ Stores the parsing result of the file. The result is pickled immediately. """
+        entry = FileCacheEntry.stamp_file(filepath,
+                                          parser_version=parser_version,
+                                          data=pickle.dumps(result, pickle.HIGHEST_PROTOCOL))
+
+        self.entries[(parser_name, filepath)] = entry
+        self.has_changes = True
@@ -6,66 +6,50 @@ from ..language.models import SwiftTypeType, ObjcTypeType, SwiftExtensionScope
 
 from .parsers import SwiftFileParser
 from .models import XcTarget
+from .walkers import FolderWalker
 
 
 class FolderReporter():
 
-    def __init__(self, folder_path, ignored_dirpaths, ignored_dirs):
+    def __init__(self, folder_path, ignored_dirpaths, ignored_dirs, jobs=None):
         self.folder_path = folder_path
         self.ignored_dirpaths = ignored_dirpaths
         self.ignored_dirs = ignored_dirs
+        self.jobs = jobs
     
-    def find_empty_dirs(self):
-        results = []
-
-        # Walk to find empty folders
-        for (dirpath, dirnames, filenames) in os.walk(self.folder_path):
-            relative_dirpath = dirpath[len(self.folder_path):]
-
-            if relative_dirpath:
-                assert relative_dirpath[0] == '/'  # safety check
+    def _empty_dir_display(self, relative_dirpath, dirnames, filenames):
+        # Filter root folder
+        if not relative_dirpath:
+            return None
+
+        # Filter folder containing at least one dir
+        if dirnames:
+            return None
+        
+        # Filter folder containing at least an unhidden filename
+        unhidden_filenames = set([f for f in filenames if not f.startswith('.')])
+        if unhidden_filenames:
+            return None
+        
+        # Hidden files
+        hidden_filenames = list(set(filenames) - unhidden_filenames)
+        hidden_filenames.sort()
 
-            # Filter root folder
-            if not relative_dirpath:
-                continue
+        display = relative_dirpath
 
-            # Filter folder to ignore by path
-            continue_to_next_dirpath = False
-            for ignored_dirpath in self.ignored_dirpaths:
-                if '{}/'.format(relative_dirpath).startswith('/{}/'.format(ignored_dirpath)):
-                    continue_to_next_dirpath = True
-                    break
-            if continue_to_next_dirpath:
-                continue
-                
-            # Filter folder to ignore by name
-            folder_parts = set(relative_dirpath.split(os.path.sep))
-            if self.ignored_dirs & folder_parts:
-                continue
-            
-            # Filter folder containing at least one dir
-            if dirnames:
-                continue
-            
-            # Filter folder containing at least an unhidden filename
-            unhidden_filenames = set([f for f in filenames if not f.startswith('.')])
-            if unhidden_filenames:
-                continue
-            
-            # Hidden files
-            hidden_filenames = list(set(filenames) - unhidden_filenames)
-            hidden_filenames.sort()
+        # Display hidden files for folder with only hidden files
+        if hidden_filenames:
+            hidden_filenames_display = ', '.join([f for f in hidden_filenames])
+            display += ' [{}]'.format(hidden_filenames_display)
+        
+        return display
 
-            display = relative_dirpath
+    def find_empty_dirs(self):
+        # Walk to find empty folders, ignored folders being not walked
+        walker = FolderWalker(self.folder_path, self.ignored_dirpaths, self.ignored_dirs, jobs=self.jobs)
+        results = walker.map(self._empty_dir_display)
 
-            # Display hidden files for folder with only hidden files
-            if hidden_filenames:
-                hidden_filenames_display = ', '.join([f for f in hidden_filenames])
-                display += ' [{}]'.format(hidden_filenames_display)
-            
-            results.append(display)
-        
-        return results
+        return [r for r in results if r is not None]
     
     def print_empty_dirs(self):
         empty_dirs = self.find_empty_dirs()
@@ -424,19 +408,22 @@ class XcProjReporter():
         cprint('{:>{width}} objc types in total'.format(total_types_count, width=width), attrs=['bold'])
 
     def print_shared_files(self):
-        # key is a file, value is a set of targets
-        file_targets = dict()
+        file_index = self.xcode_project.file_index
+        targets_files_bits = self.xcode_project.targets_files_bits
 
-        # Search targets for shared files
+        # Bitset of the files of at least two targets
+        found_bits = 0
+        shared_bits = 0
         for target in self.xcode_project.targets:
-            for target_file in target.files:
-                if target_file in file_targets:
-                    file_targets[target_file].add(target)
-                else:
-                    file_targets[target_file] = set([target])
+            target_bits = targets_files_bits[target]['files']
+            shared_bits |= found_bits & target_bits
+            found_bits |= target_bits
 
-        # Filter files
-        filepath_targets = {f.filepath: targets for (f, targets) in file_targets.items() if len(targets) >= 2}
+        # key is a filepath, value is the list of targets sharing the file
+        filepath_targets = dict()
+        for target in self.xcode_project.targets:
+            for shared_file in file_index.files_of(targets_files_bits[target]['files'] & shared_bits):
+                filepath_targets.setdefault(shared_file.filepath, []).append(target)
 
         # Sort by filepath
         filepaths = [p for p in filepath_targets.keys()]
@@ -450,42 +437,42 @@ class XcProjReporter():
 
     @property
     def files_counters(self):
-        source_files = set()
-        resource_files = set()
-        header_files = set()
-        linked_files = set()
-
-        for target in self.xcode_project.targets:
-            source_files |= target.source_files
-            resource_files |= target.resource_files
-            header_files |= target.header_files
-            linked_files |= target.linked_files
+        file_index = self.xcode_project.file_index
+
+        source_bits = 0
+        resource_bits = 0
+        header_bits = 0
+        linked_bits = 0
+
+        for target_bits in self.xcode_project.targets_files_bits.values():
+            source_bits |= target_bits['source_files']
+            resource_bits |= target_bits['resource_files']
+            header_bits |= target_bits['header_files']
+            linked_bits |= target_bits['linked_files']
         
         # Add target less h files
-        header_files |= self.xcode_project.target_less_h_files
+        header_bits |= file_index.bits(self.xcode_project.target_less_h_files)
 
         # Source files
-        swift_source_files = set()
-        objc_source_files = set()
-        other_source_files = set()
-        
-        for source_file in source_files:
-            if source_file.is_swift:
-                swift_source_files.add(source_file)
-            elif source_file.is_objc_m:
-                objc_source_files.add(source_file)
-            else:
-                other_source_files.add(source_file)
+        swift_bits = file_index.bits(f for f in file_index.files if f.is_swift)
+        objc_m_bits = file_index.bits(f for f in file_index.files if f.is_objc_m)
+
+        source_count = file_index.count(source_bits)
+        swift_count = file_index.count(source_bits & swift_bits)
+        objc_count = file_index.count(source_bits & objc_m_bits)
+        resource_count = file_index.count(resource_bits)
+        header_count = file_index.count(header_bits)
+        linked_count = file_index.count(linked_bits)
 
         return {
-            'source': len(source_files),
-            'swift': len(swift_source_files),
-            'm': len(objc_source_files),
-            'other_source': len(other_source_files),
-            'resource': len(resource_files),
-            'header': len(header_files),
-            'linked': len(linked_files),
-            'total': len(source_files) + len(resource_files) + len(header_files) + len(linked_files),
+            'source': source_count,
+            'swift': swift_count,
+            'm': objc_count,
+            'other_source': source_count - swift_count - objc_count,
+            'resource': resource_count,
+            'header': header_count,
+            'linked': linked_count,
+            'total': source_count + resource_count + header_count + linked_count,
         }        
 
     def print_files_summary(self):
@@ -550,63 +537,34 @@ class XcProjReporter():
         cprint('{:>2} Groups in total'.format(total_groups_count), attrs=['bold'])
     
     def _find_folder_filepaths(self, ignored_dirpaths, ignored_dirs, ignored_files={'.DS_Store'}):
-        folder_filepaths = set()
+        def folder_filepaths_of(relative_dirpath, dirnames, filenames):
+            dirname = relative_dirpath.rsplit('/', 1)[-1]
 
-        for (dirpath, dirnames, filenames) in os.walk(self.xcode_project.dirpath):
-            relative_dirpath = dirpath[len(self.xcode_project.dirpath):]
-            folder_parts = relative_dirpath.split(os.path.sep)
+            # Filter xcodeproj itself and xcworkspace
+            if '.xcodeproj' in dirname or '.xcworkspace' in dirname:
+                dirnames.clear()
+                return []
 
-            # Filter folder to ignore by path
-            continue_to_next_dirpath = False
-            for ignored_dirpath in ignored_dirpaths:
-                if '{}/'.format(relative_dirpath).startswith('/{}/'.format(ignored_dirpath)):
-                    continue_to_next_dirpath = True
-                    break
-            if continue_to_next_dirpath:
-                continue
+            # Add xcassets and xcstickers folders, and folders considered as files
+            # by Xcode, without their inner files
+            if dirname.endswith('.xcassets') or dirname.endswith('.xcstickers') or dirname.endswith('.bundle'):
+                dirnames.clear()
+                return [relative_dirpath]
 
-            # Filter folder to ignore by name
-            if ignored_dirs & set(folder_parts):
-                continue
-            
-            # Filter xcodeproj itself
-            if '.xcodeproj' in relative_dirpath:
-                continue
-            
-            # Filter xcworkspace
-            if '.xcworkspace' in relative_dirpath:
-                continue
-            
-            # Detect xcassets folders
-            if relative_dirpath.endswith('.xcassets'):
-                folder_filepaths.add(relative_dirpath)
-
-            elif '.xcassets' in relative_dirpath:
-                # Ignore Subfolder of a xcasset folder
-                pass
-
-            # Detect xcstickers folders
-            elif relative_dirpath.endswith('.xcstickers'):
-                folder_filepaths.add(relative_dirpath)
-
-            # Ignore Subfolder of a xcstickers folder
-            elif '.xcstickers' in relative_dirpath:
-                pass
-
-            # Add as file folder considered as file by Xcode,
-            # and do not add its inner files.
-            elif folder_parts[-1].endswith('.bundle'):
-                folder_filepaths.add(relative_dirpath)
-            
-            # Filter folder inside folder considered as files (by Xcode)
-            elif [p for p in folder_parts if p.endswith('.bundle')]:
-                continue
+            # Ignore Subfolder of a xcassets or xcstickers folder
+            if '.xcassets' in dirname or '.xcstickers' in dirname:
+                dirnames.clear()
+                return []
+
+            # Paths of the root folder files have no leading slash, as with `os.path.join`
+            prefix = '{}/'.format(relative_dirpath) if relative_dirpath else ''
+            return [prefix + f for f in filenames if f not in ignored_files]
+
+        walker = FolderWalker(self.xcode_project.dirpath, ignored_dirpaths, ignored_dirs)
 
-            else:
-                for filename in filenames:
-                    if filename not in ignored_files:
-                        filepath = os.path.join(relative_dirpath, filename)
-                        folder_filepaths.add(filepath)
+        folder_filepaths = set()
+        for filepaths in walker.map(folder_filepaths_of):
+            folder_filepaths.update(filepaths)
         
         return folder_filepaths
     
@@ -632,10 +590,9 @@ class XcProjReporter():
         return filepaths
 
     def find_orphan_target_missing_files(self, ignored_dirpaths, ignored_dirs):
-        target_less_files = self.xcode_project.files - self.xcode_project.target_files
         filepaths = []
 
-        for target_file in target_less_files:
+        for target_file in self.xcode_project.target_less_files:
             # In this mode we ignore .h files and Info.plist files
             if target_file.filepath.endswith('Info.plist'):
                 continue
@@ -663,7 +620,8 @@ class XcProjReporter():
         
         return filepaths
 
-    def print_orphan_files(self, ignored_dirpaths, ignored_dirs, mode):
+    def find_orphan_files(self, ignored_dirpaths, ignored_dirs, mode):
+        """ Sorted paths of the orphan files of the given mode. """
         # Folder's filepaths
         folder_filepaths = self._find_folder_filepaths(ignored_dirpaths, ignored_dirs)
 
@@ -696,7 +654,10 @@ class XcProjReporter():
         # Sort filepaths
         filepaths.sort()
 
-        for filepath in filepaths:
+        return filepaths
+
+    def print_orphan_files(self, ignored_dirpaths, ignored_dirs, mode):
+        for filepath in self.find_orphan_files(ignored_dirpaths, ignored_dirs, mode):
             print(filepath)
     
     def find_nonregular_files(self):
@@ -834,7 +795,7 @@ class XcProjReporter():
             raise ValueError("No app target found with name '{}'.".format(app))
 
         # App target dependencies sorted by name
-        app_target_dependencies = list(app_target.dependencies_all)
+        app_target_dependencies = list(self.xcode_project.targets_dependencies_all[app_target])
         app_target_dependencies.sort(key=lambda t: t.name.lower())
         targets = app_target_dependencies + [app_target]
 
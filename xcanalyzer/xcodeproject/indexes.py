@@ -0,0 +1,217 @@
+import os
+import pickle
+import re
+
+from ..language.lexer import IDENTIFIER, SWIFT, SWIFT_CLASS_MEMBER_KEYWORDS, file_language, file_tokens
+from .caches import FileStamp
+
+
+IDENTIFIER_REGEX = re.compile(r'\w+')
+
+# Keywords of the type declarations, used to know the type enclosing a line
+SWIFT_TYPE_KEYWORDS = {'class', 'struct', 'enum', 'protocol', 'extension'}
+OBJC_TYPE_KEYWORDS = {'@interface', '@implementation', '@protocol'}
+
+
+class IndexedFile(FileStamp):
+
+    def __init__(self, size, mtime, content_hash, lines_by_identifier, type_ranges):
+        super().__init__(size, mtime, content_hash)
+        self.lines_by_identifier = lines_by_identifier  # identifier => sorted line numbers
+        self.type_ranges = type_ranges  # list of (first line, last line, type name)
+
+    def enclosing_type_name(self, line_number):
+        """ Name of the innermost type declared around the line, or `None`. """
+        result = None
+        result_first_line = 0
+
+        for (first_line, last_line, type_name) in self.type_ranges:
+            if first_line <= line_number <= last_line and first_line >= result_first_line:
+                result = type_name
+                result_first_line = first_line
+
+        return result
+
+
+def index_file(filepath):
+    """ Reads the source file and returns its identifiers and type declarations as an `IndexedFile`. """
+    stamp = FileStamp.stamp_file(filepath)
+
+    lines_by_identifier = dict()
+    type_ranges = list()
+
+    is_swift = file_language(filepath) == SWIFT
+
+    # Types being declared: [type name, first line, depth of declaration]
+    declared_types = list()
+    # Type declaration whose name was just read: [type name, first line, depth of declaration]
+    declaration = None
+    previous_text = None
+    line_number = 0
+
+    for (kind, text, line_number, depth, _) in file_tokens(filepath):
+        if kind == IDENTIFIER:
+            line_numbers = lines_by_identifier.setdefault(text, [])
+            if not line_numbers or line_numbers[-1] != line_number:
+                line_numbers.append(line_number)
+
+        # Enclosing types
+        if is_swift:
+            if kind == IDENTIFIER and previous_text in SWIFT_TYPE_KEYWORDS and text not in SWIFT_CLASS_MEMBER_KEYWORDS:
+                declared_types.append([text, line_number, depth])
+
+            elif text == '}':
+                while declared_types and depth <= declared_types[-1][2]:
+                    type_name, first_line, _ = declared_types.pop()
+                    type_ranges.append((first_line, line_number, type_name))
+        else:
+            # Forward declarations of protocols end with `;` or `,`
+            if declaration is not None:
+                if text != ';' and text != ',':
+                    declared_types.append(declaration)
+                declaration = None
+
+            if text == '@end':
+                if declared_types:
+                    type_name, first_line, _ = declared_types.pop()
+                    type_ranges.append((first_line, line_number, type_name))
+            elif kind == IDENTIFIER and previous_text in OBJC_TYPE_KEYWORDS:
+                declaration = [text, line_number, depth]
+
+        previous_text = text
+
+    # Declarations not closed at the end of the file
+    if declaration is not None:
+        declared_types.append(declaration)
+    for (type_name, first_line, _) in declared_types:
+        type_ranges.append((first_line, line_number, type_name))
+
+    return IndexedFile(size=stamp.size,
+                       mtime=stamp.mtime,
+                       content_hash=stamp.content_hash,
+                       lines_by_identifier=lines_by_identifier,
+                       type_ranges=type_ranges)
+
+
+class TokenIndex():
+    """ Persistent inverted index from identifiers to the source lines where they occur.
+
+    Identifiers in comments and string literals are ignored. Each source file is
+    indexed again only when its content changed.
+    """
+
+    # To increment when the indexing result changes
+    VERSION = 2
+
+    def __init__(self, filepath=None):
+        self.filepath = filepath
+        self.files = dict()  # source filepath => IndexedFile
+        self.identifiers = dict()  # identifier => {source filepath: line numbers}
+        self.has_changes = False
+
+    def load(self):
+        if not self.filepath or not os.path.exists(self.filepath):
+            return
+
+        with open(self.filepath, 'rb') as input_data:
+            version, files, identifiers = pickle.load(input_data)
+
+        if version != self.VERSION:
+            return
+
+        self.files = files
+        self.identifiers = identifiers
+        self.has_changes = False
+
+    def save(self):
+        if not self.filepath or not self.has_changes:
+            return
+
+        with open(self.filepath, 'wb') as output:
+            pickle.dump((self.VERSION, self.files, self.identifiers), output, pickle.HIGHEST_PROTOCOL)
+
+        self.has_changes = False
+
+    def outdated_filepaths(self, filepaths):
+        """ Paths, among the given ones, of the files never indexed or changed since their indexing. """
+        results = list()
+
+        for filepath in filepaths:
+            indexed_file = self.files.get(filepath)
+
+            if indexed_file is None:
+                results.append(filepath)
+                continue
+
+            stat = (indexed_file.size, indexed_file.mtime)
+            if not indexed_file.matches(filepath):
+                results.append(filepath)
+            elif stat != (indexed_file.size, indexed_file.mtime):
+                self.has_changes = True
+
+        return results
+
+    def update(self, filepaths, map_function=None):
+        """ Indexes the given files which changed since their last indexing. Returns their paths.
+
+        The files removed from the folder are removed from the index instead.
+        `map_function(function, filepaths)` gives the results of the function for each
+        path, in the same order. It defaults to a map in the current process.
+        """
+        outdated_filepaths = list()
+        for filepath in sorted(self.outdated_filepaths(filepaths)):
+            if os.path.exists(filepath):
+                outdated_filepaths.append(filepath)
+            else:  # Removed file
+                self.remove(filepath)
+
+        if map_function is None:
+            indexed_files = [index_file(filepath) for filepath in outdated_filepaths]
+        else:
+            indexed_files = map_function(index_file, outdated_filepaths)
+
+        for (filepath, indexed_file) in zip(outdated_filepaths, indexed_files):
+            self.set_indexed_file(filepath, indexed_file)
+
+        return outdated_filepaths
+
+    def set_indexed_file(self, filepath, indexed_file):
+        self.remove(filepath)
+
+        self.files[filepath] = indexed_file
+
+        for (identifier, line_numbers) in indexed_file.lines_by_identifier.items():
+            self.identifiers.setdefault(identifier, dict())[filepath] = line_numbers
+
+        self.has_changes = True
+
+    def remove(self, filepath):
+        indexed_file = self.files.pop(filepath, None)
+
+        if indexed_file is None:
+            return
+
+        for identifier in indexed_file.lines_by_identifier.keys():
+            identifier_files = self.identifiers[identifier]
+            del identifier_files[filepath]
+
+            if not identifier_files:
+                del self.identifiers[identifier]
+
+        self.has_changes = True
+
+    def identifier_lines(self, identifier):
+        """ Line numbers where the identifier occurs, by source filepath. """
+        return self.identifiers.get(identifier, dict())
+
+    def occurrences(self, identifier):
+        """ List of (source filepath, line number, enclosing type name) where the identifier occurs. """
+        results = list()
+
+        for (filepath, line_numbers) in sorted(self.identifier_lines(identifier).items()):
+            indexed_file = self.files[filepath]
+
+            for line_number in line_numbers:
+                results.append((filepath, line_number, indexed_file.enclosing_type_name(line_number)))
+
+        return results
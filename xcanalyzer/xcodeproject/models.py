@@ -1,10 +1,76 @@
-from ..language.models import SwiftTypeType, ObjcTypeType, SwiftExtensionScope, UI_VIEW_CONTROLLER_BASE_CLASSES
+import functools
+import heapq
+import re
 
+from ..language.models import CompactModel, SwiftTypeType, ObjcTypeType, SwiftExtensionScope, UI_VIEW_CONTROLLER_BASE_CLASSES, interned
 
-class XcFile():
+
+def derived_data(method):
+    """ Read-only property computed once, then kept until `invalidate_derived_data` is called. """
+    name = method.__name__
+
+    @functools.wraps(method)
+    def getter(self):
+        try:
+            return self._derived_data[name]
+        except KeyError:
+            result = method(self)
+            self._derived_data[name] = result
+            return result
+
+    return property(getter)
+
+
+class DerivedDataHolder():
+    """ Holder of `derived_data` properties.
+
+    The derived data are invalidated when one of the attributes listed in
+    `DERIVED_DATA_SOURCES` is assigned. When one of these attributes is modified
+    in place (ex: a file added to a set), `invalidate_derived_data` must be called.
+    When files are parsed again, `invalidate_types_derived_data` must be called.
+    """
+
+    DERIVED_DATA_SOURCES = set()
+
+    # Derived data computed from the types of the files, not only from the files
+    TYPES_DERIVED_DATA = set()
+
+    def __setattr__(self, name, value):
+        super().__setattr__(name, value)
+
+        if name in self.DERIVED_DATA_SOURCES:
+            self.invalidate_derived_data()
+
+    def invalidate_derived_data(self):
+        self._clear_derived_data()
+
+    def _clear_derived_data(self):
+        """ Clears the derived data of this holder only. """
+        super().__setattr__('_derived_data', dict())
+
+    def invalidate_types_derived_data(self):
+        """ Invalidates the derived data of `TYPES_DERIVED_DATA`, to be called when files are parsed again. """
+        for name in self.TYPES_DERIVED_DATA:
+            self._derived_data.pop(name, None)
+
+    def __getstate__(self):
+        state = self.__dict__.copy()
+        state.pop('_derived_data', None)
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._clear_derived_data()
+
+
+class XcFile(CompactModel):
+
+    __slots__ = ('filepath', 'swift_types', 'objc_types', 'objc_interfaces')
+
+    INTERNED_SLOTS = frozenset(['filepath'])
 
     def __init__(self, filepath):
-        self.filepath = filepath
+        self.filepath = interned(filepath)
         self.swift_types = None
         self.objc_types = None
         self.objc_interfaces = None
@@ -60,7 +126,11 @@ class XcFile():
     def is_objc(self):
         return self.is_objc_h or self.is_objc_m
 
-class XcGroup():
+class XcGroup(CompactModel):
+
+    __slots__ = ('group_path', 'filepath', 'is_project_relative', 'groups', 'files', 'is_variant')
+
+    INTERNED_SLOTS = frozenset(['group_path', 'filepath'])
 
     def __init__(self,
                  group_path,
@@ -69,8 +139,8 @@ class XcGroup():
                  groups=None,
                  files=None,
                  is_variant=False):
-        self.group_path = group_path
-        self.filepath = filepath
+        self.group_path = interned(group_path)
+        self.filepath = interned(filepath)
         self.is_project_relative = is_project_relative
         self.groups = groups or list()
         self.files = files or set()
@@ -90,11 +160,63 @@ class XcGroup():
         return self.group_path == self.filepath
     
 
-class XcProject():
+class FileIndex():
+    """ Dense integer ids of files, sorted by path, and bitsets of files.
+
+    The bitset of a set of files is an integer whose bit `n` is set when the
+    file of id `n` is in the set, so that unions and differences of sets of
+    files become bitwise operations.
+    """
+
+    # Positions of the set bits of each byte
+    BYTE_BITS = [tuple(b for b in range(8) if byte >> b & 1) for byte in range(256)]
+
+    NON_ZERO_BYTES_REGEX = re.compile(rb'[^\x00]+')
+
+    def __init__(self, files):
+        self.files = sorted(files, key=lambda f: f.filepath)
+        self.ids = {f: file_id for (file_id, f) in enumerate(self.files)}
+        self.bytes_count = len(self.files) // 8 + 1
+
+    def bits(self, files):
+        """ Bitset of the given files, which must be indexed. """
+        data = bytearray(self.bytes_count)
+
+        for xc_file in files:
+            file_id = self.ids[xc_file]
+            data[file_id >> 3] |= 1 << (file_id & 7)
+
+        return int.from_bytes(data, 'little')
+
+    def files_of(self, bits):
+        """ Files of the bitset, sorted by path. """
+        results = list()
+
+        # Runs of non zero bytes, the zero bytes being skipped by the regex engine
+        for match in self.NON_ZERO_BYTES_REGEX.finditer(bits.to_bytes(self.bytes_count, 'little')):
+            for (byte_index, byte) in enumerate(match.group(), match.start()):
+                base_id = byte_index << 3
+                results += [self.files[base_id + b] for b in self.BYTE_BITS[byte]]
+
+        return results
+
+    @staticmethod
+    def count(bits):
+        """ Count of the files of the bitset. """
+        return bin(bits).count('1')
+
+
+class XcProject(DerivedDataHolder):
+
+    DERIVED_DATA_SOURCES = {'targets', 'groups', 'root_files', 'swift_files_parsed', 'objc_files_parsed'}
+
+    TYPES_DERIVED_DATA = {'types_by_name', 'types_by_fullname'}
 
     def __init__(self, dirpath, name, build_configurations, targets, groups, files):
         assert type(groups) == list
 
+        self._derived_data = dict()
+
         self.dirpath = dirpath
         self.name = name
         self.build_configurations = build_configurations
@@ -104,29 +226,50 @@ class XcProject():
 
         self.swift_files_parsed = False
         self.objc_files_parsed = False
+
+    def __setattr__(self, name, value):
+        # Targets invalidate the derived data of their project
+        if name == 'targets':
+            for target in self.__dict__.get('targets', list()):
+                target.project = None
+
+        super().__setattr__(name, value)
+
+        if name == 'targets':
+            for target in value:
+                target.project = self
+
+    def invalidate_derived_data(self):
+        """ Invalidates the derived data of the project and of its targets. """
+        self._clear_derived_data()
+
+        for target in self.__dict__.get('targets', list()):
+            target._clear_derived_data()
+
+    def invalidate_types_derived_data(self):
+        """ Invalidates the derived data computed from the types of the project and of its targets. """
+        super().invalidate_types_derived_data()
+
+        for target in self.targets:
+            target.invalidate_types_derived_data()
     
     def targets_of_type(self, target_type):
         results = {t for t in self.targets if t.type == target_type}
         return sorted(results, key=lambda t: t.name)
     
     def target_with_name(self, name):
-        candidates = [t for t in self.targets if t.name == name]
-
-        if not candidates:
-            return None
-        
-        return candidates[0]
+        return self.targets_by_name.get(name)
     
-    @property
+    @derived_data
     def target_files(self):
         results = set()
 
         for target in self.targets:
             results |= target.files
         
-        return results
+        return frozenset(results)
     
-    @property
+    @derived_data
     def source_files(self):
         results = set()
 
@@ -136,17 +279,42 @@ class XcProject():
         
         results |= self.target_less_h_files
 
-        return results
+        return frozenset(results)
     
-    @property
+    @derived_data
     def target_less_files(self):
         return self.files - self.target_files
     
-    @property
+    @derived_data
     def target_less_h_files(self):
-        return set([f for f in self.target_less_files if f.is_objc_h])
+        return frozenset([f for f in self.target_less_files if f.is_objc_h])
     
-    @property
+    # File ids and bitsets of files
+
+    @derived_data
+    def file_index(self):
+        """ Ids of the project files and of the target files. """
+        return FileIndex(self.files | self.target_files)
+
+    @derived_data
+    def targets_files_bits(self):
+        """ Bitsets of the files of each target, by target then by attribute of `XcTarget.FILES_ATTRIBUTES`. """
+        return {t: {name: self.file_index.bits(getattr(t, name)) for name in XcTarget.FILES_ATTRIBUTES} for t in self.targets}
+
+    @derived_data
+    def targets_files_bytes(self):
+        """ Bitsets of the files of each target as bytes, in which a single bit is read in constant time. """
+        return [(t, b['files'].to_bytes(self.file_index.bytes_count, 'little')) for (t, b) in self.targets_files_bits.items()]
+
+    def targets_of_file(self, xc_file):
+        """ Targets of the file, in the order of `targets_files_bits`. """
+        file_id = self.file_index.ids[xc_file]
+        byte_index = file_id >> 3
+        bit = 1 << (file_id & 7)
+
+        return [t for (t, files_bytes) in self.targets_files_bytes if files_bytes[byte_index] & bit]
+
+    @derived_data
     def group_files(self):
         results = set()
 
@@ -157,8 +325,116 @@ class XcProject():
             results |= group.files
             groups += group.groups
         
-        return results
+        return frozenset(results)
     
+    # Lookup indexes
+
+    @derived_data
+    def targets_by_name(self):
+        results = dict()
+
+        for target in self.targets:
+            results.setdefault(target.name, target)
+
+        return results
+
+    @derived_data
+    def files_by_path(self):
+        return {f.filepath: f for f in self.files}
+
+    @derived_data
+    def files_by_name(self):
+        """ Files sorted by path, by filename. """
+        results = dict()
+
+        for xc_file in sorted(self.files, key=lambda f: f.filepath):
+            results.setdefault(xc_file.filename, []).append(xc_file)
+
+        return results
+
+    @derived_data
+    def _types_files(self):
+        """ Targets' Swift and Objective-C files, then target less .h files.
+
+        Files are in the order of the targets, Swift files first, and sorted by path.
+        """
+        results = []
+        found_files = set()
+
+        def add_files(files):
+            for xc_file in sorted(files - found_files, key=lambda f: f.filepath):
+                results.append(xc_file)
+                found_files.add(xc_file)
+
+        for target in self.targets:
+            add_files(target.swift_files)
+            add_files(target.objc_files)
+
+        add_files(self.target_less_h_files)
+
+        return results
+
+    @derived_data
+    def types_by_name(self):
+        """ Swift and Objective-C types declared at the top level of parsed files, by name. """
+        results = dict()
+
+        for xc_file in self._types_files:
+            types = xc_file.swift_types if xc_file.is_swift else xc_file.objc_types
+
+            for swift_or_objc_type in types or []:
+                results.setdefault(swift_or_objc_type.name, []).append(swift_or_objc_type)
+
+        return results
+
+    @derived_data
+    def types_by_fullname(self):
+        """ Swift types, inner types included, and Objective-C types of parsed files, by fullname. """
+        results = dict()
+
+        for xc_file in self._types_files:
+            if xc_file.is_swift:
+                for swift_type in xc_file.swift_types or []:
+                    for inner_type in [swift_type] + sorted(swift_type.inner_types_all, key=lambda t: t.fullname):
+                        results.setdefault(inner_type.fullname, []).append(inner_type)
+            else:
+                for objc_type in xc_file.objc_types or []:
+                    results.setdefault(objc_type.name, []).append(objc_type)
+
+        return results
+
+    def types_with_name(self, name, type_in=None):
+        """ Types with the given name, of one of the given type identifiers if any. """
+        types = self.types_by_name.get(name, [])
+
+        if type_in is None:
+            return list(types)
+
+        return [t for t in types if t.type_identifier in type_in]
+
+    def types_with_fullname(self, fullname, type_in=None):
+        """ Types with the given fullname, of one of the given type identifiers if any. """
+        types = self.types_by_fullname.get(fullname, [])
+
+        if type_in is None:
+            return list(types)
+
+        return [t for t in types if t.type_identifier in type_in]
+
+    def type_with_name(self, name):
+        """ First type defined with the given name, ignoring Swift extensions and target less categories. """
+        for swift_or_objc_type in self.types_by_name.get(name, []):
+            if swift_or_objc_type.file.is_swift:
+                if swift_or_objc_type.type_identifier == SwiftTypeType.EXTENSION:
+                    continue
+            elif swift_or_objc_type.type_identifier == ObjcTypeType.CATEGORY \
+                and swift_or_objc_type.file in self.target_less_h_files:
+                continue
+
+            return swift_or_objc_type
+
+        return None
+
     @property
     def nonregular_files(self):
         results = list()
@@ -179,19 +455,23 @@ class XcProject():
         
         return results
 
-    @property
+    @derived_data
     def files(self):
-        return self.root_files | self.group_files
+        return frozenset(self.root_files | self.group_files)
     
     def relative_path_for_file(self, xc_file):
         return ''.join([self.dirpath, xc_file.filepath])
     
     def file_with_name(self, name):
-        for xc_file in self.files:
-            if xc_file.filename == name:
-                return xc_file
-        
-        return None
+        candidates = self.files_by_name.get(name)
+
+        if not candidates:
+            return None
+
+        return candidates[0]
+
+    def file_with_path(self, filepath):
+        return self.files_by_path.get(filepath)
     
     def groups_filtered(self, filter_mode=None):
         """ Returns the list of path sorted by name of all groups in the project. """
@@ -238,7 +518,7 @@ class XcProject():
         
         return results
     
-    @property
+    @derived_data
     def target_objc_files(self):
         """ Union of targets' objc files and target .h files. """
         results = set()
@@ -250,7 +530,7 @@ class XcProject():
         # .h target less files
         results |= self.target_less_h_files
         
-        return results
+        return frozenset(results)
     
     @property
     def target_objc_types(self):
@@ -274,7 +554,48 @@ class XcProject():
 
         return results
 
-    @property
+    @derived_data
+    def targets_topological_order(self):
+        """ Targets sorted so that each target comes after its dependencies, then by name.
+
+        Targets of a dependency cycle come last, sorted by name.
+        """
+        results = []
+
+        dependants = {t: [] for t in self.targets}
+        remaining_dependencies_counts = dict()
+        for target in self.targets:
+            dependencies = target.dependencies & dependants.keys()
+            remaining_dependencies_counts[target] = len(dependencies)
+            for dependency in dependencies:
+                dependants[dependency].append(target)
+
+        # Heap of (name, index, target) of the targets whose dependencies are all sorted
+        target_indexes = {t: index for (index, t) in enumerate(self.targets)}
+        ready_targets = [(t.name, target_indexes[t], t) for (t, c) in remaining_dependencies_counts.items() if c == 0]
+        heapq.heapify(ready_targets)
+
+        while ready_targets:
+            _, _, target = heapq.heappop(ready_targets)
+            results.append(target)
+
+            for dependant in dependants[target]:
+                remaining_dependencies_counts[dependant] -= 1
+                if remaining_dependencies_counts[dependant] == 0:
+                    heapq.heappush(ready_targets, (dependant.name, target_indexes[dependant], dependant))
+
+        # Dependency cycles
+        sorted_targets = set(results)
+        results += sorted([t for t in self.targets if t not in sorted_targets], key=lambda t: t.name)
+
+        return results
+
+    @derived_data
+    def targets_dependencies_all(self):
+        """ Transitive closure of the dependencies of each target, computed once in topological order. """
+        return {t: t.dependencies_all for t in self.targets_topological_order}
+
+    @derived_data
     def target_swift_files(self):
         """ All targets' swift files. """
         results = set()
@@ -282,7 +603,7 @@ class XcProject():
         for target in self.targets:
             results |= target.swift_files
 
-        return results
+        return frozenset(results)
 
     @property
     def target_swift_types(self):
@@ -328,17 +649,22 @@ class XcProject():
 
         # File scoped extensions
         for swift_file in self.target_swift_files:
-            for swift_extension in swift_file.swift_extensions:
-                non_extension_swift_types = swift_file.swift_types_filtered(type_not_in={SwiftTypeType.EXTENSION})
+            swift_extensions = swift_file.swift_extensions
+            if not swift_extensions:
+                continue
+
+            non_extension_swift_types = swift_file.swift_types_filtered(type_not_in={SwiftTypeType.EXTENSION})
+            non_extension_swift_type_names = {t.name for t in non_extension_swift_types}
 
-                if swift_extension.name in [t.name for t in non_extension_swift_types]:
+            for swift_extension in swift_extensions:
+                if swift_extension.name in non_extension_swift_type_names:
                     file_scoped_extensions.append(swift_extension)
                 else:
                     remaining_extensions.append(swift_extension)
         
         # Project-scoped extensions: Objc and swift
-        objc_type_names = [t.name for t in self.target_objc_types]
-        swift_type_names = [t.name for t in self.target_swift_types_filtered(type_not_in={SwiftTypeType.EXTENSION}, flat=True)]
+        objc_type_names = {t.name for t in self.target_objc_types}
+        swift_type_names = {t.name for t in self.target_swift_types_filtered(type_not_in={SwiftTypeType.EXTENSION}, flat=True)}
 
         objc_scoped_extensions = []
         swift_scoped_extensions = []
@@ -381,7 +707,14 @@ class XcBuildConfiguration():
         self.build_settings = build_settings
 
 
-class XcTarget():
+class XcTarget(DerivedDataHolder):
+
+    DERIVED_DATA_SOURCES = {'dependencies', 'source_files', 'resource_files', 'header_files', 'linked_files'}
+
+    TYPES_DERIVED_DATA = {'_view_controllers'}
+
+    # Sets of files of which the project keeps bitsets
+    FILES_ATTRIBUTES = ['files', 'source_files', 'resource_files', 'header_files', 'linked_files']
 
     class Type():
         TEST = 'test'
@@ -416,6 +749,10 @@ class XcTarget():
                  resource_files=None,
                  header_files=None,
                  linked_files=None):
+        self._derived_data = dict()
+
+        self.project = None  # Set when the target is assigned to a project
+
         self.name = name
         self.type = target_type
         self.product_name = product_name
@@ -440,41 +777,65 @@ class XcTarget():
 
     def __repr__(self):
         return "<XcTarget> {}".format(self.name)
+
+    def invalidate_derived_data(self):
+        """ Invalidates the derived data of the target, and those of its project and of the other targets of
+        its project, which can depend on it.
+        """
+        if self.project is None:
+            self._clear_derived_data()
+        else:
+            self.project.invalidate_derived_data()
     
-    @property
+    @derived_data
     def files(self):
-        return self.source_files | self.resource_files | self.header_files | self.linked_files
+        return frozenset(self.source_files | self.resource_files | self.header_files | self.linked_files)
     
-    @property
+    @derived_data
     def swift_files(self):
-        return set([f for f in self.source_files if f.is_swift])
+        return frozenset([f for f in self.source_files if f.is_swift])
     
-    @property
+    @derived_data
     def h_files(self):
-        return set([f for f in self.header_files if f.is_objc_h])
+        return frozenset([f for f in self.header_files if f.is_objc_h])
 
-    @property
+    @derived_data
     def m_files(self):
-        return set([f for f in self.source_files if f.is_objc_m])
+        return frozenset([f for f in self.source_files if f.is_objc_m])
 
-    @property
+    @derived_data
     def objc_files(self):
         return self.h_files | self.m_files
     
-    @property
+    @derived_data
     def dependencies_all(self):
+        """ Transitive closure of the target dependencies.
+
+        The closures already computed for dependencies are reused, so computing them
+        for targets in topological order visits each dependency edge once.
+        """
         result = set()
 
-        # Direct dependencies
-        result.update(self.dependencies)
+        remaining_dependencies = list(self.dependencies)
+        while remaining_dependencies:
+            dependency = remaining_dependencies.pop()
+            if dependency in result:
+                continue
+
+            result.add(dependency)
 
-        # Indirect dependencies
-        for dependency in self.dependencies:
-            result.update(dependency.dependencies)
+            dependency_dependencies_all = dependency._derived_data.get('dependencies_all')
+            if dependency_dependencies_all is not None:
+                result |= dependency_dependencies_all
+            else:
+                remaining_dependencies += dependency.dependencies
 
-        return result
+        # Dependency cycle
+        result.discard(self)
+
+        return frozenset(result)
     
-    @property
+    @derived_data
     def dependant_source_files(self):
         results = set()
 
@@ -485,7 +846,7 @@ class XcTarget():
             results |= target.swift_files
             results |= target.objc_files
         
-        return results
+        return frozenset(results)
 
     # Swift types
 
@@ -495,10 +856,11 @@ class XcTarget():
         results = set()
         
         for swift_file in self.swift_files:
-            results |= set(swift_file.swift_types_filtered(type_not_in=type_not_in))
-                
             for swift_type in swift_file.swift_types:
-                results |= swift_type.inner_types_all_filtered(type_not_in=type_not_in)
+                if swift_type.type_identifier not in type_not_in:
+                    results.add(swift_type)
+
+                results.update(t for t in swift_type.inner_types_preorder if t.type_identifier not in type_not_in)
         
         return results
 
@@ -592,6 +954,12 @@ class XcTarget():
 
     @property
     def view_controllers(self):
+        """ Swift and Objective-C classes of the target that inherit from a view controller, as a new list. """
+        return list(self._view_controllers)
+
+    @derived_data
+    def _view_controllers(self):
+        """ View controllers of the target, kept as a tuple until the types derived data are invalidated. """
         results = []
 
         swift_classes = self.swift_classes
@@ -620,7 +988,7 @@ class XcTarget():
         # defined in a direct dependency
         dependency_view_controllers = set()
         for dependency in self.dependencies:
-            dependency_view_controllers |= {vc.name for vc in dependency.view_controllers}
+            dependency_view_controllers |= {vc.name for vc in dependency._view_controllers}
 
         for swift_class in swift_classes:
             if swift_class.inherits_from_one_of(dependency_view_controllers):
@@ -666,6 +1034,6 @@ class XcTarget():
             next_swift_classes = []
             next_objc_classes = []
 
-        return results
+        return tuple(results)
 
 
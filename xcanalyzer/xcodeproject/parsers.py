@@ -1,32 +1,69 @@
+import abc
+import collections
+import concurrent.futures
 import errno
+import functools
 import json
+import multiprocessing
 import pickle
 import os
-import re
+import shlex
 import subprocess
+import threading
 
 import openstep_parser as osp
 from pbxproj import XcodeProject
 
-from ..language.models import SwiftType, SwiftTypeType, SwiftAccessibility, ObjcTypeType, ObjcType, ObjcEnumType, ObjcInterface
+from ..language.lexer import IDENTIFIER, file_tokens
+from ..language.objc_scanner import objc_declarations
+from ..language.swift_scanner import swift_file_structure
+from ..language.models import NO_TYPE_NAMES, NO_TYPES, SwiftType, SwiftTypeType, SwiftAccessibility, ObjcTypeType
 
+from .caches import FileCache, content_hash
 from .exceptions import XcodeProjectReadException
+from .indexes import IDENTIFIER_REGEX, TokenIndex
 from .models import XcTarget, XcProject, XcGroup, XcFile, XcBuildSetting, XcBuildConfiguration
+from .tracers import NullTracer
 
 
 class XcProjectParser():
 
+    # To increment when the pickled models change
+    CACHE_VERSION = 3
+
     def __init__(self,
                  project_folder_path,
                  verbose=True,
                  working_dir_relative=False,
-                 cache_active=True):
+                 cache_active=True,
+                 jobs=None,
+                 cache_folder_path='build',
+                 lean_load=True,
+                 swift_backend='sourcekitten',
+                 tracer=None,
+                 start_method=None):
+        if swift_backend not in SWIFT_STRUCTURE_READERS:
+            raise ValueError("Not supported Swift backend: '{}'.".format(swift_backend))
+
         self.project_folder_path = project_folder_path
         self.verbose = verbose
         self.working_dir_relative = working_dir_relative
         self.cache_active = cache_active
+        self.jobs = jobs or os.cpu_count() or 1
+        self.cache_folder_path = cache_folder_path
+        self.lean_load = lean_load
+        self.swift_backend = swift_backend
+        self.tracer = tracer or NullTracer()
+        self.start_method = start_method  # Of the process pool, the platform default when None
+
+        self._files_cache = None
+        self._token_index = None
 
     def load(self):
+        with self.tracer.span('load'):
+            self._load()
+
+    def _load(self):
         # Check given path
         self._check_folder_path()
 
@@ -45,11 +82,12 @@ class XcProjectParser():
                     raise
 
         # Load pbxproj
-        pbxproj_path = '{}/{}/project.pbxproj'.format(self.project_folder_path, self.xcode_proj_name)
+        pbxproj_path = self.pbxproj_path
 
         # Load from cache if existing
         if self.cache_active:
-            xc_project_from_cache = self.load_from_cache()
+            with self.tracer.span('load_from_cache'):
+                xc_project_from_cache = self.load_from_cache()
             if xc_project_from_cache is not None:
                 if self.verbose:
                     print("-> Load pbxproj from cache")
@@ -60,16 +98,45 @@ class XcProjectParser():
             print("-> Load pbxproj")
 
         # Open pbxproj
-        with open(pbxproj_path, 'r') as f:  # To avoid ResourceWarning: unclosed file
-            tree = osp.OpenStepDecoder.ParseFromFile(f)
-            self.xcode_project = XcodeProject(tree, pbxproj_path)
+        with self.tracer.span('decode_pbxproj'):
+            with open(pbxproj_path, 'r') as f:  # To avoid ResourceWarning: unclosed file
+                tree = osp.OpenStepDecoder.ParseFromFile(f)
+        self.tracer.count_bytes('pbxproj_bytes', [pbxproj_path])
+
+        self.build_project(tree)
+
+        if self.verbose:
+            print("=> Xcode project loading finished.")
 
+        self.save_project_to_cache()
+
+    def build_project(self, tree):
+        """ Builds `xc_project` from the decoded pbxproj tree.
+
+        With `lean_load`, the objects of the tree are read as they were decoded,
+        without being wrapped by `pbxproj.XcodeProject`.
+        """
+        with self.tracer.span('build_project'):
+            self._build_project(tree)
+
+        self.tracer.count('targets', len(self.xc_project.targets))
+        self.tracer.count('groups', len(self.xc_project.groups))
+        self.tracer.count('files', len(self.xc_project.files))
+
+    def _build_project(self, tree):
+        if self.lean_load:
+            self.pbxproj_objects = PbxprojObjects(tree)
+        else:
+            self.pbxproj_objects = XcodeProjectObjects(XcodeProject(tree, self.pbxproj_path))
+
+        # XcFile or XcGroup by pbxproj object key
         self.file_mapping = dict()
 
         # Files a project root
         if self.verbose:
             print("-> Find root files")
-        root_files = self._find_root_files()
+        with self.tracer.span('root_files'):
+            root_files = self._find_root_files()
 
         # Output object
         self.xc_project = XcProject(self.project_folder_path,
@@ -82,34 +149,89 @@ class XcProjectParser():
         # Project build settings (from build configurations)
         if self.verbose:
             print("-> Parse project build configurations")
-        self.xc_project.build_configurations = self._parse_project_build_configurations()
+        with self.tracer.span('build_configurations'):
+            self.xc_project.build_configurations = self._parse_project_build_configurations()
 
         # Groups
         if self.verbose:
             print("-> Parse groups")
-        self.xc_project.groups = self._parse_groups()
+        with self.tracer.span('groups'):
+            self.xc_project.groups = self._parse_groups()
 
         # Tests, extensions and app modules
         if self.verbose:
             print("-> Parse targets")
-        self.xc_project.targets = self._parse_targets()
-
-        if self.verbose:
-            print("=> Xcode project loading finished.")
-
-        self.save_project_to_cache()
+        with self.tracer.span('targets'):
+            self.xc_project.targets = self._parse_targets()
     
+    @property
+    def pbxproj_path(self):
+        return '{}/{}/project.pbxproj'.format(self.project_folder_path, self.xcode_proj_name)
+
     @property
     def cache_filepath(self):
-        command = ['git', '-C', self.project_folder_path, 'rev-parse', 'HEAD']
-        result = subprocess.run(command, capture_output=True)
-        git_ref = result.stdout.decode()[:8]
-        
-        return 'build/{}_{}.pkl'.format(self.xcode_proj_name, git_ref)
+        # The project model only depends on the pbxproj content
+        pbxproj_hash = content_hash(self.pbxproj_path)[:8]
+
+        filename = '{}_{}_v{}.pkl'.format(self.xcode_proj_name, pbxproj_hash, self.CACHE_VERSION)
+        return os.path.join(self.cache_folder_path, filename)
+
+    @property
+    def files_cache(self):
+        """ Cache of Swift and Objective-C files parsing results. """
+        if self._files_cache is None:
+            filename = '{}_files_v{}.pkl'.format(self.xcode_proj_name, self.CACHE_VERSION)
+            self._files_cache = FileCache(os.path.join(self.cache_folder_path, filename))
+
+            if self.cache_active:
+                self._files_cache.load()
+
+        return self._files_cache
 
     def save_project_to_cache(self):
-        with open(self.cache_filepath, 'wb') as output:
-            pickle.dump(self.xc_project, output, pickle.HIGHEST_PROTOCOL)
+        if not self.cache_active:
+            return
+
+        with self.tracer.span('save_project_to_cache'):
+            with open(self.cache_filepath, 'wb') as output:
+                pickle.dump(self.xc_project, output, pickle.HIGHEST_PROTOCOL)
+
+    @property
+    def token_index(self):
+        """ Index of the identifiers of the source files. """
+        if self._token_index is None:
+            filename = '{}_tokens_v{}.pkl'.format(self.xcode_proj_name, self.CACHE_VERSION)
+            self._token_index = TokenIndex(os.path.join(self.cache_folder_path, filename))
+
+            if self.cache_active:
+                self._token_index.load()
+
+        return self._token_index
+
+    def update_token_index(self, source_files):
+        """ Indexes again the given source files which changed since their last indexing. """
+        filepaths = [self.xc_project.relative_path_for_file(f) for f in source_files]
+
+        with self.tracer.span('index_tokens', files=len(filepaths)):
+            indexed_filepaths = self.token_index.update(filepaths, map_function=self._map_files)
+
+        self.tracer.count('files_indexed', len(indexed_filepaths))
+        self.tracer.count_bytes('bytes_indexed', indexed_filepaths)
+
+        if self.verbose and indexed_filepaths:
+            print('-> Indexed {}/{} source files'.format(len(indexed_filepaths), len(filepaths)))
+
+        if self.cache_active:
+            self.token_index.save()
+
+        return self.token_index
+
+    def save_files_to_cache(self):
+        if not self.cache_active:
+            return
+
+        with self.tracer.span('save_files_to_cache'):
+            self.files_cache.save()
 
     def load_from_cache(self):
         if not os.path.exists(self.cache_filepath):
@@ -125,18 +247,68 @@ class XcProjectParser():
         if self.verbose:
             print("-> Parse Swift files.")
 
+        # Swift files not parsed yet, sorted by path to get a deterministic order
+        swift_files = set()
         for target in self.xc_project.targets:
-            for swift_file in target.swift_files:
-                parser = SwiftFileParser(project_folder_path=self.xc_project.dirpath,
-                                         xc_file=swift_file)
-                parser.parse()
-        
+            swift_files |= target.swift_files
+        swift_files = sorted([f for f in swift_files if f.swift_types is None], key=lambda f: f.filepath)
+
+        with self.tracer.span('parse_swift_files'):
+            self._parse_swift_files(swift_files)
+
         if self.verbose:
             print("=> Swift files parsing finished.")
         
         self.xc_project.swift_files_parsed = True
 
-        self.save_project_to_cache()
+        self.save_files_to_cache()
+
+    def _swift_structure_reader(self):
+        """ New reader of the structures of the Swift files, for the backend of the parser. """
+        return SWIFT_STRUCTURE_READERS[self.swift_backend]()
+
+    def _parse_swift_files(self, swift_files):
+        if not swift_files:
+            return
+
+        structure_reader = self._swift_structure_reader()
+
+        parsers = list()
+        for swift_file in swift_files:
+            parser = SwiftFileParser(project_folder_path=self.xc_project.dirpath,
+                                     xc_file=swift_file,
+                                     structure_reader=structure_reader)
+
+            # Swift types from cache if the file did not change
+            swift_types = self._cached_result(SwiftFileParser, swift_file, variant=self.swift_backend)
+            if swift_types is not None:
+                parser.set_swift_types(swift_types)
+            else:
+                parsers.append(parser)
+
+        # Each parsing waits for its own `sourcekitten` process: a thread pool is enough
+        # to run them concurrently. Results are merged back in the files order.
+        with self.tracer.span('read_swift_structures', backend=self.swift_backend, files=len(parsers)):
+            try:
+                if structure_reader.USES_SUBPROCESS and self.jobs > 1 and len(parsers) > 1:
+                    with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                        swift_types_list = list(executor.map(SwiftFileParser.parse_swift_types, parsers))
+                else:
+                    structures = structure_reader.structures([parser.filepath for parser in parsers])
+                    swift_types_list = [parser.swift_types_from_structure(file_structure)
+                                        for parser, file_structure in zip(parsers, structures)]
+            finally:
+                structure_reader.close()
+
+        for parser, swift_types in zip(parsers, swift_types_list):
+            self._cache_result(SwiftFileParser, parser.xc_file, swift_types, variant=self.swift_backend)
+            parser.set_swift_types(swift_types)
+
+        self.tracer.count('swift_files_from_cache', len(swift_files) - len(parsers))
+        self.tracer.count('swift_files_parsed', len(parsers))
+        self.tracer.count_bytes('swift_bytes_parsed', [parser.filepath for parser in parsers])
+        self.tracer.count('swift_types_parsed', sum(len(swift_types) for swift_types in swift_types_list))
+        self.tracer.count('subprocess_calls', structure_reader.subprocess_calls)
     
     def parse_objc_files(self):
         if self.xc_project.objc_files_parsed:
@@ -145,24 +317,32 @@ class XcProjectParser():
         if self.verbose:
             print("-> Parse Objective-C files.")
 
-        objc_super_class_names = dict()
+        objc_files = self._objc_files()
 
-        # Targets' objective-C files
-        for target in self.xc_project.targets:
-            for objc_file in target.objc_files:
-                parser = ObjcFileParser(xc_project=self.xc_project,
-                                        xc_file=objc_file)
-                parser.parse()
+        with self.tracer.span('parse_objc_files'):
+            self._parse_objc_files(objc_files)
+            self._set_objc_super_class_names(objc_files)
 
-                for objc_interface in objc_file.objc_interfaces:
-                    objc_super_class_names[objc_interface.class_name] = objc_interface.super_class_name
+        if self.verbose:
+            print("=> Objective-C files parsing finished.")
         
-        # Target less objective-C files
-        for objc_file in self.xc_project.target_less_h_files:
-            parser = ObjcFileParser(xc_project=self.xc_project,
-                                    xc_file=objc_file)
-            parser.parse()
+        self.xc_project.objc_files_parsed = True
+
+        self.save_files_to_cache()
+
+    def _objc_files(self):
+        """ Targets' objective-C files then target less objective-C files, sorted by path to get a deterministic order. """
+        objc_files = list()
+        for target in self.xc_project.targets:
+            objc_files.extend(sorted(target.objc_files, key=lambda f: f.filepath))
+        objc_files.extend(sorted(self.xc_project.target_less_h_files, key=lambda f: f.filepath))
+
+        return objc_files
 
+    def _set_objc_super_class_names(self, objc_files):
+        # Superclass names: in the files order, the last interface of a class wins
+        objc_super_class_names = dict()
+        for objc_file in objc_files:
             for objc_interface in objc_file.objc_interfaces:
                 objc_super_class_names[objc_interface.class_name] = objc_interface.super_class_name
         
@@ -172,12 +352,112 @@ class XcProjectParser():
                 for objc_class in objc_file.objc_classes:
                     objc_class.super_class_name = objc_super_class_names.get(objc_class.name)
 
-        if self.verbose:
-            print("=> Objective-C files parsing finished.")
-        
-        self.xc_project.objc_files_parsed = True
+    def update_source_files(self, xc_files):
+        """ Parses again the given Swift and Objective-C files whose content changed.
 
-        self.save_project_to_cache()
+        The files removed from the folder are left without types. Only the derived
+        data computed from the types are invalidated.
+        """
+        with self.tracer.span('update_source_files', files=len(xc_files)):
+            self._update_source_files(xc_files)
+
+        self.save_files_to_cache()
+
+    def _update_source_files(self, xc_files):
+        swift_files = sorted([f for f in xc_files if f.is_swift], key=lambda f: f.filepath)
+        objc_files = [f for f in xc_files if f.is_objc]
+
+        for xc_file in swift_files:
+            xc_file.swift_types = None
+        for xc_file in objc_files:
+            xc_file.objc_types = None
+            xc_file.objc_interfaces = None
+
+        # Removed files
+        for xc_file in swift_files + objc_files:
+            if not os.path.exists(self.xc_project.relative_path_for_file(xc_file)):
+                if xc_file.is_swift:
+                    SwiftFileParser(self.xc_project.dirpath, xc_file).set_swift_types(list())
+                else:
+                    ObjcFileParser(self.xc_project, xc_file).set_objc_types(list(), list())
+
+        # Files of a language not parsed yet are parsed with the others later on
+        if self.xc_project.swift_files_parsed:
+            self._parse_swift_files([f for f in swift_files if f.swift_types is None])
+
+        if self.xc_project.objc_files_parsed and objc_files:
+            all_objc_files = self._objc_files()
+            self._parse_objc_files(objc_files)
+            self._set_objc_super_class_names(all_objc_files)
+
+        self.xc_project.invalidate_types_derived_data()
+
+    def _parse_objc_files(self, objc_files):
+        parsers = list()
+        for objc_file in sorted(set(objc_files), key=lambda f: f.filepath):
+            if objc_file.objc_types is not None:
+                continue
+
+            parser = ObjcFileParser(xc_project=self.xc_project,
+                                    xc_file=objc_file)
+
+            # Objective-C types from cache if the file did not change
+            result = self._cached_result(ObjcFileParser, objc_file)
+            if result is not None:
+                parser.set_objc_types(*result)
+                self.tracer.count('objc_files_from_cache')
+            else:
+                parsers.append(parser)
+
+        filepaths = [self.xc_project.relative_path_for_file(parser.xc_file) for parser in parsers]
+        with self.tracer.span('scan_objc_files', files=len(filepaths)):
+            results = self._map_files(objc_file_declarations, filepaths)
+
+        for parser, result in zip(parsers, results):
+            self._cache_result(ObjcFileParser, parser.xc_file, result)
+            parser.set_objc_types(*result)
+
+        self.tracer.count('objc_files_parsed', len(parsers))
+        self.tracer.count_bytes('objc_bytes_parsed', filepaths)
+        self.tracer.count('objc_types_parsed', sum(len(result[0]) for result in results))
+
+    def _map_files(self, function, filepaths):
+        """ Results of the function applied to each filepath, in the same order.
+
+        The work on files is CPU bound: with several jobs, the files are split into
+        shards run on a process pool. The function must be a module level one and,
+        with the `spawn` start method (macOS default), the main module must be
+        importable without running the script.
+        """
+        if self.jobs > 1 and len(filepaths) > 1:
+            chunksize = max(1, len(filepaths) // (self.jobs * 4))
+            mp_context = multiprocessing.get_context(self.start_method)
+            with concurrent.futures.ProcessPoolExecutor(max_workers=self.jobs, mp_context=mp_context) as executor:
+                return list(executor.map(function, filepaths, chunksize=chunksize))
+
+        return [function(filepath) for filepath in filepaths]
+
+    def _cache_parser_name(self, file_parser_class, variant):
+        if variant is None:
+            return file_parser_class.__name__
+        return '{}.{}'.format(file_parser_class.__name__, variant)
+
+    def _cached_result(self, file_parser_class, xc_file, variant=None):
+        if not self.cache_active:
+            return None
+
+        filepath = self.xc_project.relative_path_for_file(xc_file)
+        parser_name = self._cache_parser_name(file_parser_class, variant)
+        return self.files_cache.get(parser_name, file_parser_class.VERSION, filepath)
+
+    def _cache_result(self, file_parser_class, xc_file, result, variant=None):
+        """ Stores the result of a file parsing. To be called before the types are linked to their file. """
+        if not self.cache_active:
+            return
+
+        filepath = self.xc_project.relative_path_for_file(xc_file)
+        parser_name = self._cache_parser_name(file_parser_class, variant)
+        self.files_cache.set(parser_name, file_parser_class.VERSION, filepath, result)
 
     def _check_folder_path(self):
         if not os.path.isdir(self.project_folder_path):
@@ -193,7 +473,7 @@ class XcProjectParser():
         raise XcodeProjectReadException("No '.xcodeproj' folder found in folder: {}".format(self.project_folder_path))
 
     def _map_target_type(self, target):
-        if target.productType.startswith('com.apple.product-type.app-extension'):
+        if target['productType'].startswith('com.apple.product-type.app-extension'):
             return XcTarget.Type.APP_EXTENSION
         
         return {
@@ -203,29 +483,30 @@ class XcProjectParser():
             'com.apple.product-type.watchkit2-extension': XcTarget.Type.WATCH_EXTENSION,
             'com.apple.product-type.application': XcTarget.Type.APPLICATION,
             'com.apple.product-type.application.watchapp2': XcTarget.Type.WATCH_APPLICATION,
-        }.get(target.productType, XcTarget.Type.OTHER)
+        }.get(target['productType'], XcTarget.Type.OTHER)
     
     def _map_target_build_configurations(self, buildConfigurationList):
-        build_configuration_list = self.xcode_project.get_object(buildConfigurationList)
+        build_configuration_list = self.pbxproj_objects.get_object(buildConfigurationList)
 
         result_build_configurations = list()
         
-        for build_configuration_id in build_configuration_list.buildConfigurations:
-            build_configuration = self.xcode_project.get_object(build_configuration_id)
+        for build_configuration_id in build_configuration_list['buildConfigurations']:
+            build_configuration = self.pbxproj_objects.get_object(build_configuration_id)
+            build_settings = build_configuration['buildSettings']
 
             result_build_settings = list()
             
-            build_config_keys = build_configuration.buildSettings.get_keys()
+            build_config_keys = self.pbxproj_objects.get_keys(build_settings)
             for setting_key in build_config_keys:
-                setting_value = getattr(build_configuration.buildSettings, setting_key)
+                setting_value = build_settings[setting_key]
                 if type(setting_value) == str:
                     result_build_setting = XcBuildSetting(setting_key, [setting_value])
                 else:  # expected to be a list of str
-                    result_build_setting = XcBuildSetting(setting_key, setting_value)
+                    result_build_setting = XcBuildSetting(setting_key, list(setting_value))
                 
                 result_build_settings.append(result_build_setting)
             
-            result_build_configuration = XcBuildConfiguration(build_configuration.name,
+            result_build_configuration = XcBuildConfiguration(build_configuration['name'],
                                                               result_build_settings)
             result_build_configurations.append(result_build_configuration)
         
@@ -233,36 +514,36 @@ class XcProjectParser():
 
     @property
     def _main_group(self):
-        project_object = self.xcode_project.get_object(self.xcode_project.rootObject)
-        assert project_object.isa == 'PBXProject'
+        project_object = self.pbxproj_objects.root_object
+        assert project_object['isa'] == 'PBXProject'
         
-        main_group = self.xcode_project.get_object(project_object.mainGroup)
-        assert main_group.isa == 'PBXGroup'
+        main_group = self.pbxproj_objects.get_object(project_object['mainGroup'])
+        assert main_group['isa'] == 'PBXGroup'
 
         return main_group
 
     def _file_name_for_file_ref(self, file_ref, of_variant=False):
-        assert file_ref.isa == 'PBXFileReference'
+        assert file_ref['isa'] == 'PBXFileReference'
 
         if of_variant:
-            return file_ref.path.split('/')[-1]
+            return file_ref['path'].split('/')[-1]
         else:
-            if hasattr(file_ref, 'name'):
-                return file_ref.name
+            if 'name' in file_ref:
+                return file_ref['name']
             else:
-                return file_ref.path
+                return file_ref['path']
 
     def _find_root_files(self):
         results = set()
 
-        for child_key in self._main_group.children:
-            child = self.xcode_project.get_object(child_key)
-            if child.isa == 'PBXFileReference':
+        for child_key in self._main_group['children']:
+            child = self.pbxproj_objects.get_object(child_key)
+            if child['isa'] == 'PBXFileReference':
                 filename = self._file_name_for_file_ref(child)
                 filepath = self._reduce_double_dot_filepath_part('/{}'.format(filename))
                 xc_file = XcFile(filepath=filepath)
                 results.add(xc_file)
-                self.file_mapping[child] = xc_file
+                self.file_mapping[child_key] = xc_file
 
         return results
 
@@ -292,50 +573,49 @@ class XcProjectParser():
         return '/'.join(new_parts)
     
     def _parse_project_build_configurations(self):
-        root = self.xcode_project.get_object(self.xcode_project.rootObject)
-        return self._map_target_build_configurations(root.buildConfigurationList)
+        root = self.pbxproj_objects.root_object
+        return self._map_target_build_configurations(root['buildConfigurationList'])
 
     def _parse_groups(self):
-        # key is a child key reference
-        # value is a tuple:
+        # Queue of children to treat, in breadth first order. Each item is a tuple:
+        #   the child key reference
         #   the XcGroup destination of the parent
         #   the path of parent
-        children_to_treat = dict()
+        children_to_treat = collections.deque()
 
         root_group = XcGroup('', '')
-        for child_key in self._main_group.children:
-            child = self.xcode_project.get_object(child_key)
-            if child.isa != 'PBXGroup':
+        for child_key in self._main_group['children']:
+            child = self.pbxproj_objects.get_object(child_key)
+            if child['isa'] != 'PBXGroup':
                 continue
-            children_to_treat[child_key] = (root_group, '')
+            children_to_treat.append((child_key, root_group, ''))
 
         while children_to_treat:
-            current_child_key = list(children_to_treat.keys())[0]
-            parent_group, parent_filepath = children_to_treat.pop(current_child_key)
-            current_child = self.xcode_project.get_object(current_child_key)
+            current_child_key, parent_group, parent_filepath = children_to_treat.popleft()
+            current_child = self.pbxproj_objects.get_object(current_child_key)
 
-            if current_child.isa in {'PBXGroup', 'PBXVariantGroup'}:  # Child is a group
+            if current_child['isa'] in {'PBXGroup', 'PBXVariantGroup'}:  # Child is a group
                 # Compute current child filepath
-                if current_child.sourceTree == '<group>':  # Relative to group
-                    if hasattr(current_child, 'path'):
-                        current_filepath = '/'.join([parent_filepath, current_child.path])
+                if current_child['sourceTree'] == '<group>':  # Relative to group
+                    if 'path' in current_child:
+                        current_filepath = '/'.join([parent_filepath, current_child['path']])
                     else:
                         current_filepath = parent_filepath  # current group without folder
                     is_project_relative = False
                 
-                elif current_child.sourceTree == 'SOURCE_ROOT':  # Relative to project
-                    current_filepath = '/{}'.format(current_child.path)
+                elif current_child['sourceTree'] == 'SOURCE_ROOT':  # Relative to project
+                    current_filepath = '/{}'.format(current_child['path'])
                     is_project_relative = True
 
                 # Current child group path
-                if hasattr(current_child, 'name'):
-                    name = current_child.name
+                if 'name' in current_child:
+                    name = current_child['name']
                 else:
-                    name = current_child.path
+                    name = current_child['path']
                 current_group_path = '/'.join([parent_group.group_path, name])
 
                 # Link the parent with its child
-                is_variant = current_child.isa == 'PBXVariantGroup'
+                is_variant = current_child['isa'] == 'PBXVariantGroup'
                 current_group = XcGroup(current_group_path,
                                         current_filepath,
                                         is_project_relative=is_project_relative,
@@ -344,18 +624,18 @@ class XcProjectParser():
                 parent_group.groups.append(current_group)
 
                 # Add this child's children for treatment
-                for child_key in current_child.children:
-                    children_to_treat[child_key] = (current_group, current_filepath)
+                for child_key in current_child['children']:
+                    children_to_treat.append((child_key, current_group, current_filepath))
 
                 # File mapping to be used foreward in targets parsing
-                self.file_mapping[current_child] = current_group
+                self.file_mapping[current_child_key] = current_group
 
-            elif current_child.isa == 'PBXFileReference':  # Child is a file reference
-                if current_child.sourceTree == '<group>':  # Relative to group
-                    current_filepath = '/'.join([parent_filepath, current_child.path])
+            elif current_child['isa'] == 'PBXFileReference':  # Child is a file reference
+                if current_child['sourceTree'] == '<group>':  # Relative to group
+                    current_filepath = '/'.join([parent_filepath, current_child['path']])
             
-                elif current_child.sourceTree == 'SOURCE_ROOT':  # Relative to project
-                    current_filepath = '/{}'.format(current_child.path)
+                elif current_child['sourceTree'] == 'SOURCE_ROOT':  # Relative to project
+                    current_filepath = '/{}'.format(current_child['path'])
                 
                 else:
                     # Ignore other files (ex: *.app from build product dir)
@@ -367,12 +647,12 @@ class XcProjectParser():
                 parent_group.files.add(xc_file)
 
                 # File mapping to be used foreward in targets parsing
-                self.file_mapping[current_child] = xc_file
+                self.file_mapping[current_child_key] = xc_file
         
         return root_group.groups
 
     def _parse_targets(self):
-        targets = self.xcode_project.objects.get_targets()
+        targets = self.pbxproj_objects.get_targets()
 
         xcode_targets = set()
 
@@ -388,13 +668,13 @@ class XcProjectParser():
 
             # Product name
             # We don't use target.productName because its seems to not be used by Xcode
-            product_name = self.xcode_project.get_object(target.productReference).path
+            product_name = self.pbxproj_objects.get_object(target['productReference'])['path']
 
             # Build configuration list
-            build_configurations = self._map_target_build_configurations(target.buildConfigurationList)
+            build_configurations = self._map_target_build_configurations(target['buildConfigurationList'])
 
             # Transform into XcTarget
-            xcode_target = XcTarget(target.name,
+            xcode_target = XcTarget(target['name'],
                                     xcode_target_type,
                                     product_name=product_name,
                                     build_configurations=build_configurations,
@@ -403,77 +683,72 @@ class XcProjectParser():
             xcode_targets.add(xcode_target)
 
             # Product reference
-            product_references[target.productReference] = xcode_target
+            product_references[target['productReference']] = xcode_target
 
             # Find target's dependencies
-            dependencies_names = set()
-            pbxproj_dependencies = [self.xcode_project.get_object(dep_key) for dep_key in target.dependencies]
-            dependencies_names = [self.xcode_project.get_object(dep.target).name for dep in pbxproj_dependencies]
-            target_dependencies_names[target.name] = dependencies_names
+            pbxproj_dependencies = [self.pbxproj_objects.get_object(dep_key) for dep_key in target['dependencies']]
+            dependencies_names = [self.pbxproj_objects.get_object(dep['target'])['name'] for dep in pbxproj_dependencies]
+            target_dependencies_names[target['name']] = dependencies_names
 
             # Find file for each target
-            for build_phase_key in target.buildPhases:
-                build_phase = self.xcode_project.get_object(build_phase_key)
+            for build_phase_key in target['buildPhases']:
+                build_phase = self.pbxproj_objects.get_object(build_phase_key)
 
                 # Sources files
-                if build_phase.isa == 'PBXSourcesBuildPhase':
-                    for build_file_key in build_phase.files:
-                        build_file = self.xcode_project.get_object(build_file_key)
-                        file_ref = self.xcode_project.get_object(build_file.fileRef)
-
-                        if file_ref.isa == 'PBXVariantGroup':  # Localized source files (ex: intentdefinition)
-                            for child in file_ref.children:
-                                variant_file_ref = self.xcode_project.get_object(child)
-                                xcode_target.source_files.add(self.file_mapping[variant_file_ref])
+                if build_phase['isa'] == 'PBXSourcesBuildPhase':
+                    for build_file_key in build_phase['files']:
+                        build_file = self.pbxproj_objects.get_object(build_file_key)
+                        file_ref = self.pbxproj_objects.get_object(build_file['fileRef'])
+
+                        if file_ref['isa'] == 'PBXVariantGroup':  # Localized source files (ex: intentdefinition)
+                            for child in file_ref['children']:
+                                xcode_target.source_files.add(self.file_mapping[child])
                         else:
-                            xcode_target.source_files.add(self.file_mapping[file_ref])
+                            xcode_target.source_files.add(self.file_mapping[build_file['fileRef']])
 
                 # Resources files
-                elif build_phase.isa == 'PBXResourcesBuildPhase':
-                    for build_file_key in build_phase.files:
-                        build_file = self.xcode_project.get_object(build_file_key)
-                        file_ref = self.xcode_project.get_object(build_file.fileRef)
-
-                        if file_ref.isa == 'PBXVariantGroup':  # Localized resource files
-                            for child in file_ref.children:
-                                variant_file_ref = self.xcode_project.get_object(child)
-                                xcode_target.resource_files.add(self.file_mapping[variant_file_ref])
+                elif build_phase['isa'] == 'PBXResourcesBuildPhase':
+                    for build_file_key in build_phase['files']:
+                        build_file = self.pbxproj_objects.get_object(build_file_key)
+                        file_ref = self.pbxproj_objects.get_object(build_file['fileRef'])
+
+                        if file_ref['isa'] == 'PBXVariantGroup':  # Localized resource files
+                            for child in file_ref['children']:
+                                xcode_target.resource_files.add(self.file_mapping[child])
                         else:
-                            xcode_target.resource_files.add(self.file_mapping[file_ref])
+                            xcode_target.resource_files.add(self.file_mapping[build_file['fileRef']])
                 
                 # Header files
-                elif build_phase.isa == 'PBXHeadersBuildPhase':
-                    for build_file_key in build_phase.files:
-                        build_file = self.xcode_project.get_object(build_file_key)
-                        file_ref = self.xcode_project.get_object(build_file.fileRef)
-                        xcode_target.header_files.add(self.file_mapping[file_ref])
+                elif build_phase['isa'] == 'PBXHeadersBuildPhase':
+                    for build_file_key in build_phase['files']:
+                        build_file = self.pbxproj_objects.get_object(build_file_key)
+                        xcode_target.header_files.add(self.file_mapping[build_file['fileRef']])
 
                 # Find target's linked frameworks
-                elif build_phase.isa == 'PBXFrameworksBuildPhase':
+                elif build_phase['isa'] == 'PBXFrameworksBuildPhase':
                     target_linked_framework_refs[xcode_target] = []
                     
-                    for build_file_key in build_phase.files:
-                        build_file = self.xcode_project.get_object(build_file_key)
+                    for build_file_key in build_phase['files']:
+                        build_file = self.pbxproj_objects.get_object(build_file_key)
                         
                         # Store for linked framework target dependencies
-                        target_linked_framework_refs[xcode_target].append(build_file.fileRef)
+                        target_linked_framework_refs[xcode_target].append(build_file['fileRef'])
                         
-                        file_ref = self.xcode_project.get_object(build_file.fileRef)
+                        file_ref = self.pbxproj_objects.get_object(build_file['fileRef'])
                         
                         # Store as a library linked with binary of the target
-                        if file_ref.sourceTree in {'<group>', 'SOURCE_ROOT'}:
-                            xcode_target.linked_files.add(self.file_mapping[file_ref])
+                        if file_ref['sourceTree'] in {'<group>', 'SOURCE_ROOT'}:
+                            xcode_target.linked_files.add(self.file_mapping[build_file['fileRef']])
                 
                 # Find target's embed frameworks
-                elif build_phase.isa == 'PBXCopyFilesBuildPhase':
-                    target_embed_framework_refs[xcode_target] = [self.xcode_project.get_object(build_file).fileRef for build_file in build_phase.files]
+                elif build_phase['isa'] == 'PBXCopyFilesBuildPhase':
+                    target_embed_framework_refs[xcode_target] = [self.pbxproj_objects.get_object(build_file)['fileRef'] for build_file in build_phase['files']]
 
-        # Set dependencies for each target        
+        # Set dependencies for each target
+        xcode_targets_by_name = {t.name: t for t in xcode_targets}
         for target_name, dependencies_names in target_dependencies_names.items():
-            target = [t for t in xcode_targets if t.name == target_name][0]
-            dependencies_targets = {t for t in xcode_targets if t.name in dependencies_names}
-
-            target.dependencies = dependencies_targets
+            target = xcode_targets_by_name[target_name]
+            target.dependencies = {xcode_targets_by_name[n] for n in dependencies_names if n in xcode_targets_by_name}
         
         # Set linked frameworks for each target
         for xcode_target, linked_framework_refs in target_linked_framework_refs.items():
@@ -497,29 +772,16 @@ class XcProjectParser():
         return sorted(list(xcode_targets), key=lambda t: t.name)
     
     def _find_type(self, swift_objc_type_name):
-        for target in self.xc_project.targets:
-            for swift_file in target.swift_files:
-                for swift_type in swift_file.swift_types:
-                    if swift_type.type_identifier != SwiftTypeType.EXTENSION and swift_type.name == swift_objc_type_name:
-                        return swift_type
-
-            for objc_file in target.objc_files:
-                for objc_type in objc_file.objc_types:
-                    if objc_type.name == swift_objc_type_name:
-                        return objc_type
-
-        for objc_file in self.xc_project.target_less_h_files:
-            for objc_type in objc_file.objc_types:
-                if objc_type.type_identifier != ObjcTypeType.CATEGORY and objc_type.name == swift_objc_type_name:
-                    return objc_type
-        
-        return None
+        return self.xc_project.type_with_name(swift_objc_type_name)
     
     def _find_files_that_contains(self, swift_objc_types, source_files):
         assert type(swift_objc_types) == set
-        assert type(source_files) == set
+        assert type(source_files) in {set, frozenset}
 
-        swift_objc_types = list(swift_objc_types)
+        with self.tracer.span('find_files_that_contains', types=len(swift_objc_types), files=len(source_files)):
+            return self._files_that_contains(list(swift_objc_types), source_files)
+
+    def _files_that_contains(self, swift_objc_types, source_files):
 
         # Prepare occurrences
         occurrences = list()
@@ -529,108 +791,70 @@ class XcProjectParser():
                                                  occurrences_count_in_definition_file=0)  # filled in the following lines
             occurrences.append(occurrence)
         
-        # Regex
-        regex = list()
-        for swift_objc_type in swift_objc_types:
-            # TODO: manage case of inner types: full name
-            pattern = re.compile(r'^(?!//).*\W{}\W'.format(swift_objc_type.name))
-            regex.append(pattern)
-        
-        source_files_count = len(source_files)
-        for file_index, source_file in enumerate(source_files):
-            xc_filepath = self.xc_project.relative_path_for_file(source_file)
+        # Source files by the path used to read them
+        source_files_by_path = {self.xc_project.relative_path_for_file(f): f for f in source_files}
 
-            if self.verbose:
-                print('{}/{} Searching: {}'.format(file_index + 1, source_files_count, xc_filepath))
-            
-            with open(xc_filepath) as opened_file:
-                for line in opened_file:
-                    if line.startswith('//'):  # optimization
-                        continue
+        # Names which are identifiers are found from the token index.
+        # Other names (ex: extension of an inner type) are searched in the tokens of the files.
+        # TODO: manage case of inner types: full name
+        token_index = self.update_token_index(source_files)
 
-                    for (index, swift_objc_type) in enumerate(swift_objc_types):
-                        if swift_objc_type.name not in line:  # optimization
-                            continue
-                        
-                        if not regex[index].search(line):
-                            continue
+        names = {o.swift_or_objc_type.name for o in occurrences}
+        other_names = {n for n in names if not IDENTIFIER_REGEX.fullmatch(n)}
+        other_names_lines = self._find_lines_matching_names(other_names, source_files_by_path.keys())
 
-                        if swift_objc_type.file == source_file:
-                            occurrences[index].occurrences_count_in_definition_file += 1
-                        else:
-                            occurrences[index].source_files_that_use.add(source_file)
+        for occurrence in occurrences:
+            swift_objc_type = occurrence.swift_or_objc_type
 
-        return occurrences
-
-    def _find_occurrences_from_swift_file(self,
-                                          opened_file,
-                                          source_file,
-                                          swift_objc_types,
-                                          declarations_regex,
-                                          occurrences_regex,
-                                          occurrences):
-        # Processing data: current type we're in
-        current_types = list()
-        bracket_counters = list()
-
-        for line in opened_file:
-            if line.startswith('//'):  # we ignore the line if it is a commented one
-                continue
+            if swift_objc_type.name in other_names:
+                lines_by_filepath = other_names_lines[swift_objc_type.name]
+            else:
+                lines_by_filepath = token_index.identifier_lines(swift_objc_type.name)
 
-            found_declaration_type_in_line = None
-            found_types_in_line = []
+            for (filepath, line_numbers) in lines_by_filepath.items():
+                source_file = source_files_by_path.get(filepath)
 
-            for (index, swift_objc_type) in enumerate(swift_objc_types):
-                if swift_objc_type.name not in line:  # optimization
+                if source_file is None:
                     continue
 
-                # Declaration occurrence
-                declaration_search = declarations_regex[index].search(line)
-                if declaration_search:
-                    if found_declaration_type_in_line:
-                        raise Exception("Already found declaration of a type in this line!")
-                    found_declaration_type_in_line = swift_objc_type
+                if swift_objc_type.file == source_file:
+                    occurrence.occurrences_count_in_definition_file += len(line_numbers)
+                else:
+                    occurrence.source_files_that_use.add(source_file)
 
-                # Other occurrences
-                elif occurrences_regex[index].search(line):
-                    found_types_in_line.append((index, swift_objc_type))
+        return occurrences
 
-                    # TODO: Manage case of multi match in the same line
-                
-            # Manage current type
-            if found_declaration_type_in_line:
-                current_types.append(found_declaration_type_in_line)
-                bracket_counters.append(0)
-            
-            # Found types
-            for (index, found_type) in found_types_in_line:
-                if current_types:
-                    if found_type == current_types[-1]:
-                        occurrences[index].occurrences_count_in_type_body += 1
-                    else:
-                        occurrences[index].swift_objc_types_that_use.add(current_types[-1])
-                else:
-                    occurrences[index].files_that_use.add(source_file)
-
-            # Manage end of declaration type through the lines
-            if current_types:
-                for character in line:
-                    if character == '{':
-                        bracket_counters[-1] += 1
-                    elif character == '}':
-                        bracket_counters[-1] -= 1
-                
-                if bracket_counters[-1] == 0:
-                    current_types.pop()
-                    bracket_counters.pop()
+    def _find_lines_matching_names(self, names, filepaths):
+        """ Line numbers, by name then by filepath, of the lines where the names occur. """
+        results = {name: dict() for name in names}
+
+        if not names:
+            return results
 
+        # Partial results of each file reduced by name
+        filepaths = sorted(filepaths)
+        file_function = functools.partial(file_lines_matching_names, names_by_first_part(names))
+        with self.tracer.span('scan_lines', names=len(names), files=len(filepaths)):
+            file_results = self._map_files(file_function, filepaths)
+
+        self.tracer.count('files_scanned', len(filepaths))
+        self.tracer.count_bytes('bytes_scanned', filepaths)
+
+        for (filepath, lines_by_name) in zip(filepaths, file_results):
+            for (name, line_numbers) in lines_by_name.items():
+                results[name][filepath] = line_numbers
+
+        return results
 
     def _find_types_that_contains(self, swift_objc_types, source_files):
         assert type(swift_objc_types) == set
-        assert type(source_files) == set
+        assert type(source_files) in {set, frozenset}
 
         # Remove duplicate types
-        swift_objc_types = list(swift_objc_types)
+        with self.tracer.span('find_types_that_contains', types=len(swift_objc_types), files=len(source_files)):
+            return self._types_that_contains(list(swift_objc_types), source_files)
+
+    def _types_that_contains(self, swift_objc_types, source_files):
 
         # Prepare occurrences
         occurrences = list()
@@ -641,35 +865,50 @@ class XcProjectParser():
                                                  files_that_use=set())  # filled in the following lines
             occurrences.append(occurrence)
         
-        # Regex
-        declarations_regex = list()
-        occurrences_regex = list()
-        for swift_objc_type in swift_objc_types:
-            # Type declaration regex
-            declaration_pattern = re.compile(r'(^|\W){} +{}\W'.format(swift_objc_type.type_identifier, swift_objc_type.name))
-            declarations_regex.append(declaration_pattern)
-
-            # Occurrence regex
-            occurrence_pattern = re.compile(r'\W{}\W'.format(swift_objc_type.fullname))
-            occurrences_regex.append(occurrence_pattern)
+        # Searched types, identified by their index
+        searched_types = tuple((t.type_identifier, t.name, t.fullname) for t in swift_objc_types)
 
         # TODO: manage type aliases
         # TODO: manage extensions and categories
 
-        source_files_count = len(source_files)
-        for file_index, source_file in enumerate(source_files):
-            xc_filepath = self.xc_project.relative_path_for_file(source_file)
-            print('{}/{} Searching: {}'.format(file_index + 1, source_files_count, xc_filepath))
-
-            with open(xc_filepath) as opened_file:
-                if source_file.is_swift:
-                    self._find_occurrences_from_swift_file(opened_file,
-                                                           source_file,
-                                                           swift_objc_types,
-                                                           declarations_regex,
-                                                           occurrences_regex,
-                                                           occurrences)
-                        
+        # Only files containing one of the names can contain declarations or occurrences of the types
+        names = set()
+        for swift_objc_type in swift_objc_types:
+            names.add(swift_objc_type.name)
+            names.add(swift_objc_type.fullname.split('.')[0])
+
+        if all(IDENTIFIER_REGEX.fullmatch(name) for name in names):
+            token_index = self.update_token_index(source_files)
+
+            filepaths = set()
+            for name in names:
+                filepaths |= token_index.identifier_lines(name).keys()
+
+            source_files = {f for f in source_files if self.xc_project.relative_path_for_file(f) in filepaths}
+
+        # Swift source files, by the path used to read them
+        source_files_by_path = {self.xc_project.relative_path_for_file(f): f for f in source_files if f.is_swift}
+        filepaths = sorted(source_files_by_path.keys())
+
+        # Partial occurrences of each file reduced by type
+        file_function = functools.partial(swift_file_type_occurrences, searched_types_indexes(searched_types))
+        with self.tracer.span('scan_swift_files', types=len(searched_types), files=len(filepaths)):
+            file_results = self._map_files(file_function, filepaths)
+
+        self.tracer.count('files_scanned', len(filepaths))
+        self.tracer.count_bytes('bytes_scanned', filepaths)
+
+        for file_index, (filepath, file_occurrences) in enumerate(zip(filepaths, file_results)):
+            if self.verbose:
+                print('{}/{} Searched: {}'.format(file_index + 1, len(filepaths), filepath))
+
+            for (index, (count_in_type_body, user_type_indexes, used_outside_types)) in file_occurrences.items():
+                occurrence = occurrences[index]
+                occurrence.occurrences_count_in_type_body += count_in_type_body
+                occurrence.swift_objc_types_that_use |= {swift_objc_types[i] for i in user_type_indexes}
+                if used_outside_types:
+                    occurrence.files_that_use.add(source_files_by_path[filepath])
+
         return occurrences
 
     def find_type_and_occurrences_from_files(self, swift_objc_type_name):
@@ -788,8 +1027,203 @@ class XcProjectParser():
         return swift_duplicate_lists, objc_duplicate_lists, swift_objc_common_classes
 
 
+class PbxprojObjects():
+    """ Objects of a decoded pbxproj tree, which are plain dictionaries, by key. """
+
+    def __init__(self, tree):
+        self.objects = tree['objects']
+        self.root_object = self.objects[tree['rootObject']]
+
+    def get_object(self, key):
+        return self.objects[key]
+
+    def get_targets(self):
+        return [o for o in self.objects.values() if o['isa'].endswith('Target')]
+
+    def get_keys(self, pbxproj_object):
+        return sorted(pbxproj_object.keys())
+
+
+class XcodeProjectObjects():
+    """ Objects of a `pbxproj.XcodeProject`, with the interface of `PbxprojObjects`. """
+
+    def __init__(self, xcode_project):
+        self.xcode_project = xcode_project
+        self.root_object = xcode_project.get_object(xcode_project.rootObject)
+
+    def get_object(self, key):
+        return self.xcode_project.get_object(key)
+
+    def get_targets(self):
+        return self.xcode_project.objects.get_targets()
+
+    def get_keys(self, pbxproj_object):
+        return pbxproj_object.get_keys()
+
+
+class SwiftStructureReader(abc.ABC):
+    """ Reader of the `sourcekitten structure` of Swift files. """
+
+    NAME = None
+
+    # Whether each structure waits for its own process, so that threads can read several at once
+    USES_SUBPROCESS = False
+
+    # Count of the processes started by the reader
+    subprocess_calls = 0
+
+    @abc.abstractmethod
+    def structure(self, filepath):
+        """ Structure of the Swift file, in the format of `sourcekitten structure`. """
+
+    def structures(self, filepaths):
+        """ Structures of the files, in the same order. """
+        for filepath in filepaths:
+            yield self.structure(filepath)
+
+    def close(self):
+        pass
+
+
+class SourceKittenStructureReader(SwiftStructureReader):
+    """ Structure of a Swift file given by a `sourcekitten` process. """
+
+    NAME = 'sourcekitten'
+
+    USES_SUBPROCESS = True
+
+    def __init__(self):
+        self._lock = threading.Lock()
+
+    def structure(self, filepath):
+        with self._lock:
+            self.subprocess_calls += 1
+
+        command = ['sourcekitten', 'structure', '--file', filepath]
+        result = subprocess.run(command, capture_output=True)
+        return json.loads(result.stdout)
+
+
+class SourceKittenServerStructureReader(SwiftStructureReader):
+    """ Structures of Swift files given by a single long-lived structure server process.
+
+    The server reads one absolute file path per line and writes back, in the same
+    order, the `sourcekitten structure` output of each file on a single line. It
+    stops when its input is closed. No server is shipped: its command is given by
+    the `XCANALYZER_STRUCTURE_SERVER` environment variable.
+    """
+
+    NAME = 'sourcekitten-server'
+
+    USES_SUBPROCESS = False
+
+    COMMAND_ENVIRONMENT_VARIABLE = 'XCANALYZER_STRUCTURE_SERVER'
+
+    def __init__(self):
+        self.process = None
+
+    @property
+    def command(self):
+        command = os.environ.get(self.COMMAND_ENVIRONMENT_VARIABLE)
+        if not command:
+            raise XcodeProjectReadException("No Swift structure server command: set the {} environment variable.".format(
+                self.COMMAND_ENVIRONMENT_VARIABLE))
+        return shlex.split(command)
+
+    def _started_process(self):
+        if self.process is None:
+            command = self.command
+            self.subprocess_calls += 1
+            try:
+                self.process = subprocess.Popen(command,
+                                                stdin=subprocess.PIPE,
+                                                stdout=subprocess.PIPE,
+                                                universal_newlines=True,
+                                                bufsize=1)
+            except OSError as e:
+                raise XcodeProjectReadException("Swift structure server not started: {} ({})".format(' '.join(command), e))
+        return self.process
+
+    def _read_structure(self, process):
+        line = process.stdout.readline()
+        if not line:
+            raise XcodeProjectReadException("Swift structure server stopped: {}".format(' '.join(self.command)))
+        return json.loads(line)
+
+    def structure(self, filepath):
+        process = self._started_process()
+        process.stdin.write('{}\n'.format(filepath))
+        process.stdin.flush()
+        return self._read_structure(process)
+
+    def structures(self, filepaths):
+        """ Structures of the files, streamed back while the following paths are being sent. """
+        process = self._started_process()
+
+        def send_filepaths():
+            try:
+                for filepath in filepaths:
+                    process.stdin.write('{}\n'.format(filepath))
+                process.stdin.flush()
+            except BrokenPipeError:  # Server stopped, reported by the reading
+                pass
+
+        sender = threading.Thread(target=send_filepaths, daemon=True)
+        sender.start()
+        read_all = False
+        try:
+            for _ in range(len(filepaths)):
+                yield self._read_structure(process)
+            read_all = True
+        finally:
+            # The sender can be blocked writing to a server which no longer reads
+            if not read_all:
+                process.kill()
+            sender.join()
+            if not read_all:
+                self.close()
+
+    def close(self):
+        if self.process is None:
+            return
+
+        try:
+            self.process.stdin.close()
+        except BrokenPipeError:
+            pass
+        try:
+            self.process.wait(timeout=10)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+            self.process.wait()
+        self.process.stdout.close()
+        self.process = None
+
+
+class NativeStructureReader(SwiftStructureReader):
+    """ Structure of the type declarations of a Swift file given by the in-process scanner. """
+
+    NAME = 'native'
+
+    USES_SUBPROCESS = False
+
+    def structure(self, filepath):
+        with open(filepath) as opened_file:
+            return swift_file_structure(opened_file.read())
+
+
+SWIFT_STRUCTURE_READERS = {
+    SourceKittenStructureReader.NAME: SourceKittenStructureReader,
+    SourceKittenServerStructureReader.NAME: SourceKittenServerStructureReader,
+    NativeStructureReader.NAME: NativeStructureReader,
+}
+
+
 class SwiftFileParser():
 
+    # To increment when the parsing result changes
+    VERSION = 2
+
     SWIFT_TYPE_TYPE_MAPPING = {
         'source.lang.swift.decl.protocol': SwiftTypeType.PROTOCOL,
         'source.lang.swift.decl.extension': SwiftTypeType.EXTENSION,
@@ -798,25 +1232,34 @@ class SwiftFileParser():
         'source.lang.swift.decl.class': SwiftTypeType.CLASS,
     }
 
-    def __init__(self, project_folder_path, xc_file):
+    def __init__(self, project_folder_path, xc_file, structure_reader=None):
         assert xc_file.is_swift
 
         self.project_folder_path = project_folder_path
         self.xc_file = xc_file
+        self.structure_reader = structure_reader or SourceKittenStructureReader()
     
     def parse(self):
         if self.xc_file.swift_types is not None:
             return
 
-        filepath = '{}{}'.format(self.project_folder_path, self.xc_file.filepath)
-        command = ['sourcekitten', 'structure', '--file', filepath]
-        result = subprocess.run(command, capture_output=True)
-        swift_file_structure = json.loads(result.stdout)
+        self.set_swift_types(self.parse_swift_types())
+
+    @property
+    def filepath(self):
+        return '{}{}'.format(self.project_folder_path, self.xc_file.filepath)
+
+    def parse_swift_types(self):
+        """ Returns the Swift types of the file without setting them into the file. """
+        file_structure = self.structure_reader.structure(self.filepath)
+        return self.swift_types_from_structure(file_structure)
 
+    def swift_types_from_structure(self, file_structure):
+        """ Returns the Swift types of the given structure of the file. """
         debug = False
-        # debug = bool('MyTypes' in filepath)
+        # debug = bool('MyTypes' in self.filepath)
 
-        root_substructures = swift_file_structure.get('key.substructure', []).copy()
+        root_substructures = file_structure.get('key.substructure', []).copy()
         swift_parser = SwiftCodeParser(substructures=root_substructures,
                                        base_discriminant=self.xc_file.filepath,
                                        type_counter=0,
@@ -824,9 +1267,12 @@ class SwiftFileParser():
         swift_parser.parse()
 
         if debug:
-            import pprint; pprint.pprint(swift_file_structure)
+            import pprint; pprint.pprint(file_structure)
 
-        self.xc_file.swift_types = swift_parser.swift_types
+        return swift_parser.swift_types
+
+    def set_swift_types(self, swift_types):
+        self.xc_file.swift_types = swift_types
 
         # Set file into the type
         for swift_type in self.xc_file.swift_types:
@@ -876,9 +1322,7 @@ class SwiftCodeParser():
                 # Inner types
                 substructures = substructure.get('key.substructure', [])
                 inner_types, used_types = self.parse_substructures(substructures)
-                swift_type.inner_types += inner_types
-                for inner_type in swift_type.inner_types: inner_type.parent_type = swift_type
-                swift_type.used_types |= used_types
+                self.set_inner_and_used_types(swift_type, inner_types, used_types)
 
                 # Then we get the following substructure and check that it is this type body.
                 if substructs:
@@ -892,9 +1336,7 @@ class SwiftCodeParser():
                             body_substructures = closure_substructures[0].get('key.substructure', [])
                             if body_substructures:
                                 inner_types, used_types = self.parse_substructures(body_substructures)
-                                swift_type.inner_types = inner_types
-                                for inner_type in swift_type.inner_types: inner_type.parent_type = swift_type
-                                swift_type.used_types = used_types
+                                self.set_inner_and_used_types(swift_type, inner_types, used_types)
 
                                 is_closure = True
                     
@@ -921,6 +1363,12 @@ class SwiftCodeParser():
             
         return swift_types, used_types
     
+    def set_inner_and_used_types(self, swift_type, inner_types, used_types):
+        """ Sets the types into the Swift type, which keeps its shared empty containers when they are empty. """
+        swift_type.inner_types = inner_types or NO_TYPES
+        for inner_type in swift_type.inner_types: inner_type.parent_type = swift_type
+        swift_type.used_types = used_types or NO_TYPE_NAMES
+
     def parse_swift_type(self, substructure, type_identifier):
         # Accessibility
         if 'key.accessibility' in substructure:
@@ -995,8 +1443,129 @@ class SwiftCodeParser():
             return typename
 
 
+def names_by_first_part(names):
+    """ Dotted names, as `Outer.Inner`, with their parts, by their first part. Built once for every file searched. """
+    results = dict()
+    for name in names:
+        parts = name.split('.')
+        results.setdefault(parts[0], []).append((name, parts))
+
+    return results
+
+
+def file_lines_matching_names(searched_names, filepath):
+    """ Line numbers, by name, of the lines of the file where the dotted names of `names_by_first_part` occur. """
+    file_texts = list()
+    file_line_numbers = list()
+    for (_, text, line_number, _, _) in file_tokens(filepath):
+        file_texts.append(text)
+        file_line_numbers.append(line_number)
+
+    results = dict()
+
+    for (index, text) in enumerate(file_texts):
+        for (name, parts) in searched_names.get(text, []):
+            # Parts separated by dots
+            if file_texts[index:index + 2 * len(parts) - 1:2] != parts:
+                continue
+            if any(t != '.' for t in file_texts[index + 1:index + 2 * len(parts) - 1:2]):
+                continue
+
+            line_numbers = results.setdefault(name, [])
+            if not line_numbers or line_numbers[-1] != file_line_numbers[index]:
+                line_numbers.append(file_line_numbers[index])
+
+    return results
+
+
+def searched_types_indexes(searched_types):
+    """ Indexes of the searched (type identifier, name, fullname) types by the keyword and the name of their declaration,
+    and by the last part of their fullname. Built once for every file searched.
+
+    The indexes by last part come with the texts preceding it in the fullname, as
+    `('Outer', '.')` for `Outer.Inner`. Also returns the count of texts to keep
+    before a token to match the keywords and the preceding texts.
+    """
+    declared_indexes = dict()
+    occurrence_indexes = dict()
+    previous_texts_count = 1
+
+    for (index, (type_identifier, name, fullname)) in enumerate(searched_types):
+        declared_indexes.setdefault((type_identifier, name), index)
+
+        parts = fullname.split('.')
+        preceding_texts = tuple(t for p in parts[:-1] for t in (p, '.'))
+        occurrence_indexes.setdefault(parts[-1], []).append((index, preceding_texts))
+        previous_texts_count = max(previous_texts_count, len(preceding_texts))
+
+    return declared_indexes, occurrence_indexes, previous_texts_count
+
+
+def swift_file_type_occurrences(searched_indexes, filepath):
+    """ Occurrences in the Swift file of the searched types, given by their `searched_types_indexes`.
+
+    Returns, by index of searched type, the count of the lines where it occurs in its
+    own body, the indexes of the searched types in the body of which it occurs, and
+    whether it occurs outside of any searched type.
+    """
+    declared_indexes, occurrence_indexes, previous_texts_count = searched_indexes
+    results = dict()
+    last_line_numbers = dict()
+
+    # Processing data: searched types we're in, as (index, depth of declaration)
+    current_types = list()
+    # Last texts, to match the keyword of declarations and the first parts of fullnames
+    previous_texts = collections.deque(maxlen=previous_texts_count)
+
+    for (kind, text, line_number, depth, _) in file_tokens(filepath):
+        # End of declaration types
+        if text == '}':
+            while current_types and depth <= current_types[-1][1]:
+                current_types.pop()
+
+        elif kind == IDENTIFIER:
+            declared_index = declared_indexes.get((previous_texts[-1], text)) if previous_texts else None
+
+            # Declaration occurrence
+            if declared_index is not None:
+                current_types.append((declared_index, depth))
+
+            # Other occurrences
+            else:
+                for (index, preceding_texts) in occurrence_indexes.get(text, []):
+                    if preceding_texts and tuple(previous_texts)[-len(preceding_texts):] != preceding_texts:
+                        continue
+
+                    # One occurrence by line
+                    if last_line_numbers.get(index) == line_number:
+                        continue
+                    last_line_numbers[index] = line_number
+
+                    result = results.setdefault(index, [0, set(), False])
+                    if current_types:
+                        if index == current_types[-1][0]:
+                            result[0] += 1
+                        else:
+                            result[1].add(current_types[-1][0])
+                    else:
+                        result[2] = True
+
+        previous_texts.append(text)
+
+    return results
+
+
+def objc_file_declarations(filepath):
+    """ Objective-C types and interfaces declared in the file at the given path. """
+    with open(filepath) as opened_file:
+        return objc_declarations(opened_file.read())
+
+
 class ObjcFileParser():
 
+    # To increment when the parsing result changes
+    VERSION = 3
+
     def __init__(self, xc_project, xc_file):
         assert xc_file.is_objc
 
@@ -1006,91 +1575,17 @@ class ObjcFileParser():
     def parse(self):
         if self.xc_file.objc_types is not None or self.xc_file.objc_types is not None:
             return
-        
-        self.xc_file.objc_types = list()
-        self.xc_file.objc_interfaces = list()
-        
-        xc_filepath = self.xc_project.relative_path_for_file(self.xc_file)
-
-        with open(xc_filepath) as opened_file:
-            enum_has_started = False
-
-            for line in opened_file:
-                # Objc interface
-                for match in re.finditer(r'@interface\s+(\w+)\s*:\s*(\w+)', line):
-                    class_name = match.group(1)
-                    super_class_name = match.group(2)
 
-                    # Add class in objective-C types of the file
-                    objc_interface = ObjcInterface(class_name=class_name, super_class_name=super_class_name)
-                    self.xc_file.objc_interfaces.append(objc_interface)
+        objc_types, objc_interfaces = self.parse_objc_types()
+        self.set_objc_types(objc_types, objc_interfaces)
 
-                # Objc class
-                for match in re.finditer(r'@implementation\s+(\w+)\s*(\{)?\s*$', line):
-                    class_name = match.group(1)
-
-                    # Add class in objective-C types of the file
-                    objc_type = ObjcType(type_identifier=ObjcTypeType.CLASS, name=class_name)
-                    self.xc_file.objc_types.append(objc_type)
-
-                # Objc category
-                for match in re.finditer(r'@implementation\s+(\w+)\s+\((\w*)\)', line):
-                    class_name = match.group(1)
-                    category_name = match.group(2)
-
-                    # Add category in objective-C types of the file
-                    objc_type = ObjcType(type_identifier=ObjcTypeType.CATEGORY, name=class_name, category_name=category_name)
-                    self.xc_file.objc_types.append(objc_type)
-                
-                # Objc enum
-                for enum_type in ObjcEnumType.ALL:
-                    regex = r'typedef ' + enum_type + r'\(\w+, (\w+)\)( \{)?'
-                    for match in re.finditer(regex, line):
-                        enum_name = match.group(1)
-
-                        # Add enum in objective-C types of the file
-                        objc_type = ObjcType(type_identifier=ObjcTypeType.ENUM, name=enum_name)
-                        self.xc_file.objc_types.append(objc_type)
-                
-                # Objc 'enum'
-                if xc_filepath.endswith('MyObjcClass.h'):
-                    if enum_has_started:
-                        for match in re.finditer(r'} (\w+);', line):
-                            enum_name = match.group(1)
-
-                            # Add enum in objective-C types of the file
-                            objc_type = ObjcType(type_identifier=ObjcTypeType.ENUM, name=enum_name)
-                            self.xc_file.objc_types.append(objc_type)
-
-                            enum_has_started = False
-                            break
-                    elif re.findall(r'typedef enum .* \{', line):
-                        enum_has_started = True
-                        continue
-                
-                # Objc constant macro
-                for match in re.finditer(r'#define (\w+) +', line):
-                    constant_name = match.group(1)
-
-                    # Add enum in objective-C types of the file
-                    objc_type = ObjcType(type_identifier=ObjcTypeType.MACRO_CONSTANT, name=constant_name)
-                    self.xc_file.objc_types.append(objc_type)
-                
-                # Objc constant
-                for match in re.finditer(r'\* ?const +(\w+)', line):
-                    constant_name = match.group(1)
-
-                    # Add enum in objective-C types of the file
-                    objc_type = ObjcType(type_identifier=ObjcTypeType.CONSTANT, name=constant_name)
-                    self.xc_file.objc_types.append(objc_type)
-                
-                # Objc protocol
-                for match in re.finditer(r'@protocol (\w+) *[^\w; ].*', line):
-                    protocol_name = match.group(1)
+    def parse_objc_types(self):
+        """ Returns the Objective-C types and interfaces of the file without setting them into the file. """
+        return objc_file_declarations(self.xc_project.relative_path_for_file(self.xc_file))
 
-                    # Add enum in objective-C types of the file
-                    objc_type = ObjcType(type_identifier=ObjcTypeType.PROTOCOL, name=protocol_name)
-                    self.xc_file.objc_types.append(objc_type)
+    def set_objc_types(self, objc_types, objc_interfaces):
+        self.xc_file.objc_types = objc_types
+        self.xc_file.objc_interfaces = objc_interfaces
 
         # Set definition type of the type
         for objc_type in self.xc_file.objc_types:
@@ -0,0 +1,180 @@
+import atexit
+import collections
+import cProfile
+import io
+import os
+import pstats
+import signal
+import sys
+import threading
+import tracemalloc
+
+
+class StackSampler():
+    """ Sampler of the stack of the main thread at a wall-clock interval, counted as collapsed stacks.
+
+    A collapsed stack is the `;` separated list of its frames from the outermost
+    one, as read by flame graph tools (`flamegraph.pl`, speedscope, inferno).
+    Sampling uses the `SIGALRM` signal: it is only available on Unix, from the
+    main thread.
+    """
+
+    def __init__(self, interval=0.005):
+        self.interval = interval
+        self.stack_counts = collections.Counter()
+        self._previous_handler = None
+
+    @classmethod
+    def is_available(cls):
+        return hasattr(signal, 'setitimer') and threading.current_thread() is threading.main_thread()
+
+    def _frame_name(self, frame):
+        code = frame.f_code
+        return '{} ({}:{})'.format(code.co_name, os.path.basename(code.co_filename), code.co_firstlineno)
+
+    def _sample(self, signal_number, frame):
+        frame_names = list()
+        while frame is not None:
+            frame_names.append(self._frame_name(frame))
+            frame = frame.f_back
+
+        self.stack_counts[';'.join(reversed(frame_names))] += 1
+
+    def start(self):
+        self._previous_handler = signal.signal(signal.SIGALRM, self._sample)
+        signal.setitimer(signal.ITIMER_REAL, self.interval, self.interval)
+
+    def stop(self):
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, self._previous_handler)
+
+    def collapsed_lines(self):
+        return ['{} {}'.format(stack, count) for (stack, count) in sorted(self.stack_counts.items())]
+
+
+class Profiler():
+    """ Profiler of the running code, writing files which can be attached to a performance issue.
+
+    With a `profile_prefix`, the code is profiled with cProfile, written to
+    `<prefix>.pstats`, and its stack is sampled, written to `<prefix>.collapsed`.
+    With a `memory_prefix`, its allocations are traced with tracemalloc: the peak
+    and the top allocations are written to `<prefix>.memory.txt`. A summary of
+    both is printed to the error output.
+    """
+
+    def __init__(self, profile_prefix=None, memory_prefix=None, sampling_interval=0.005, top_count=20):
+        self.profile_prefix = profile_prefix
+        self.memory_prefix = memory_prefix
+        self.top_count = top_count
+
+        self.profile = None
+        self.stack_sampler = StackSampler(sampling_interval) if profile_prefix and StackSampler.is_available() else None
+        self.memory_snapshot = None
+        self.memory_peak = None
+        self.started = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exception_type, exception, traceback):
+        self.stop()
+
+    def start(self):
+        if self.memory_prefix:
+            tracemalloc.start()
+
+        if self.profile_prefix:
+            self.profile = cProfile.Profile()
+            self.profile.enable()
+
+            if self.stack_sampler:
+                self.stack_sampler.start()
+
+        self.started = True
+
+    def stop(self):
+        if not self.started:
+            return
+        self.started = False
+
+        if self.profile:
+            if self.stack_sampler:
+                self.stack_sampler.stop()
+            self.profile.disable()
+
+        if self.memory_prefix:
+            self.memory_snapshot = tracemalloc.take_snapshot()
+            self.memory_peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+    # Output
+
+    def profile_lines(self):
+        """ Functions with the highest cumulative time. """
+        stream = io.StringIO()
+        pstats.Stats(self.profile, stream=stream).sort_stats('cumulative').print_stats(self.top_count)
+
+        return [l for l in stream.getvalue().splitlines() if l.strip()]
+
+    def memory_lines(self):
+        """ Peak of the traced memory and lines with the largest allocations still alive at the end. """
+        lines = ['Peak traced memory: {:.1f} MiB'.format(self.memory_peak / 2 ** 20)]
+
+        for statistic in self.memory_snapshot.statistics('lineno')[:self.top_count]:
+            frame = statistic.traceback[0]
+            lines.append('{:>10.1f} KiB {:>8} blocks  {}:{}'.format(statistic.size / 2 ** 10, statistic.count, frame.filename, frame.lineno))
+
+        return lines
+
+    def write(self):
+        """ Writes the profile files, and returns their paths. """
+        filepaths = list()
+
+        if self.profile:
+            filepaths.append('{}.pstats'.format(self.profile_prefix))
+            self.profile.dump_stats(filepaths[-1])
+
+            if self.stack_sampler:
+                filepaths.append('{}.collapsed'.format(self.profile_prefix))
+                with open(filepaths[-1], 'w') as collapsed_file:
+                    for line in self.stack_sampler.collapsed_lines():
+                        collapsed_file.write('{}\n'.format(line))
+
+        if self.memory_snapshot:
+            filepaths.append('{}.memory.txt'.format(self.memory_prefix))
+            with open(filepaths[-1], 'w') as memory_file:
+                for line in self.memory_lines():
+                    memory_file.write('{}\n'.format(line))
+
+        return filepaths
+
+    def output(self):
+        """ Stops the profiler, writes its files and prints its summary to the error output. """
+        self.stop()
+
+        filepaths = self.write()
+
+        summary_lines = list()
+        if self.profile:
+            summary_lines.extend(self.profile_lines())
+            if not self.stack_sampler:
+                summary_lines.append('Stack sampling is not available on this platform: no collapsed stacks.')
+        if self.memory_snapshot:
+            summary_lines.extend(self.memory_lines()[:11])
+        summary_lines.extend('Profile written: {}'.format(f) for f in filepaths)
+
+        for line in summary_lines:
+            print(line, file=sys.stderr)
+
+
+def script_profiler(profile_prefix, memory_prefix):
+    """ Started profiler whose output is written when the script exits, or None without prefix. """
+    if not profile_prefix and not memory_prefix:
+        return None
+
+    profiler = Profiler(profile_prefix, memory_prefix)
+    profiler.start()
+    atexit.register(profiler.output)
+
+    return profiler
@@ -0,0 +1,326 @@
+import contextlib
+import hashlib
+import io
+import json
+import os
+import socket
+import socketserver
+import stat
+import tempfile
+import time
+
+from ..argparse import parse_ignored_folders
+from .exceptions import XcodeProjectReadException
+from ..language.models import ObjcTypeType
+from .generators import OccurrencesReporter, XcProjReporter
+from .parsers import XcProjectParser
+from .tracers import NullTracer
+from .updaters import ProjectUpdater
+
+
+def user_socket_folder_path():
+    """ Folder of the Unix sockets of the analysis servers of the current user, only readable by this user. """
+    return os.path.join(tempfile.gettempdir(), 'xcanalyzer-{}'.format(os.getuid()))
+
+
+def default_socket_path(project_folder_path):
+    """ Path of the Unix socket of the analysis server of the project, shared by the server and its clients. """
+    digest = hashlib.sha1(os.path.abspath(project_folder_path).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(user_socket_folder_path(), '{}.sock'.format(digest))
+
+
+def make_private_folder(folder_path):
+    """ Creates the folder, only accessible by the current user, or checks that the existing one is. """
+    os.makedirs(folder_path, mode=0o700, exist_ok=True)
+
+    folder_stat = os.lstat(folder_path)
+    if not stat.S_ISDIR(folder_stat.st_mode) or folder_stat.st_uid != os.getuid() or folder_stat.st_mode & 0o077:
+        raise XcodeProjectReadException("Socket folder '{}' is not a folder only accessible by the current user.".format(folder_path))
+
+
+def type_summary(swift_or_objc_type):
+    """ JSON compatible description of a Swift or Objective-C type. """
+    return {
+        'name': swift_or_objc_type.name,
+        'fullname': swift_or_objc_type.fullname,
+        'kind': swift_or_objc_type.type_identifier,
+        'language': 'swift' if swift_or_objc_type.file.is_swift else 'objc',
+        'filepath': swift_or_objc_type.file.filepath,
+    }
+
+
+class AnalysisRequestHandler(socketserver.StreamRequestHandler):
+    """ Answers the requests of a connection: one JSON object by line, each answered by one JSON object by line. """
+
+    def handle(self):
+        for line in self.rfile:
+            try:
+                request = json.loads(line.decode('utf-8'))
+            except ValueError:
+                response = {'error': 'Request is not valid JSON.'}
+            else:
+                response = self.server.analysis_server.answer(request)
+
+            self.wfile.write(json.dumps(response).encode('utf-8') + b'\n')
+            self.wfile.flush()
+
+            if self.server.analysis_server.stopped:
+                return
+
+
+class AnalysisServer():
+    """ Server keeping the parsed project in memory to answer queries from a Unix socket.
+
+    A request is a JSON object with the name of the `query` and its `arguments`.
+    The response is a JSON object with the `result` of the query, or an `error`.
+    Queries are answered one at a time. The changed files are polled when the
+    server is idle, and before a query when the previous poll is older than
+    `poll_interval` seconds: only the changed files are parsed again.
+    """
+
+    QUERIES = ['ping', 'types', 'occurrences', 'orphans', 'duplicates', 'report', 'stop']
+
+    def __init__(self,
+                 project_folder_path,
+                 socket_path=None,
+                 jobs=None,
+                 swift_backend='sourcekitten',
+                 cache_active=True,
+                 verbose=True,
+                 poll_interval=0.5,
+                 tracer=None):
+        self.project_folder_path = project_folder_path
+        self.socket_path = socket_path or default_socket_path(project_folder_path)
+        self.jobs = jobs
+        self.swift_backend = swift_backend
+        self.cache_active = cache_active
+        self.verbose = verbose
+        self.poll_interval = poll_interval
+        self.tracer = tracer or NullTracer()
+
+        self.xcode_project_reader = None
+        self.project_updater = None
+        self.polled_at = None
+        self.stopped = False
+
+    # Project
+
+    def load(self):
+        """ Loads the project and parses its Swift and Objective-C files. """
+        if self.verbose:
+            print('-> Load project {}'.format(self.project_folder_path))
+
+        xcode_project_reader = XcProjectParser(self.project_folder_path,
+                                               verbose=False,
+                                               cache_active=self.cache_active,
+                                               jobs=self.jobs,
+                                               swift_backend=self.swift_backend,
+                                               tracer=self.tracer)
+        xcode_project_reader.load()
+        xcode_project_reader.parse_swift_files()
+        xcode_project_reader.parse_objc_files()
+
+        self.xcode_project_reader = xcode_project_reader
+        self.project_updater = ProjectUpdater(xcode_project_reader)
+        self.polled_at = time.monotonic()
+
+        if self.verbose:
+            print('=> Project {} loaded'.format(xcode_project_reader.xcode_proj_name))
+
+    def refresh(self):
+        """ Loads the project, or updates it from the changed files if the previous poll is older than `poll_interval`. """
+        if self.xcode_project_reader is None:
+            self.load()
+        elif time.monotonic() - self.polled_at >= self.poll_interval:
+            updated_files = self.project_updater.poll()
+            self.polled_at = time.monotonic()
+
+            if self.verbose and updated_files:
+                print('=> {} source file(s) updated'.format(len(updated_files)))
+
+    @property
+    def xc_project(self):
+        return self.xcode_project_reader.xc_project
+
+    def _target_with_name(self, target_name):
+        target = self.xc_project.target_with_name(target_name)
+        if not target:
+            raise ValueError("No target found with name '{}'.".format(target_name))
+        return target
+
+    # Requests
+
+    def answer(self, request):
+        """ Response to the given request. """
+        if not isinstance(request, dict) or request.get('query') not in self.QUERIES:
+            return {'error': "Not supported query, expected one of: {}.".format(', '.join(self.QUERIES))}
+
+        arguments = request.get('arguments') or dict()
+
+        try:
+            with self.tracer.span(request['query']):
+                if request['query'] != 'stop':
+                    self.refresh()
+                return {'result': getattr(self, 'query_{}'.format(request['query']))(**arguments)}
+        except (XcodeProjectReadException, ValueError, TypeError, OSError) as e:
+            return {'error': getattr(e, 'message', None) or str(e)}
+
+    def serve(self):
+        """ Answers the requests of the socket until the `stop` query. Only the current user can connect to the socket. """
+        if self.socket_path == default_socket_path(self.project_folder_path):
+            make_private_folder(user_socket_folder_path())
+
+        # A socket file left by a stopped server is removed, not the one of a running server
+        if os.path.exists(self.socket_path):
+            try:
+                AnalysisClient(socket_path=self.socket_path).query('ping', timeout=1)
+            except XcodeProjectReadException:
+                os.remove(self.socket_path)
+            else:
+                raise XcodeProjectReadException("An analysis server is already listening on '{}'.".format(self.socket_path))
+
+        self.refresh()
+
+        with socketserver.UnixStreamServer(self.socket_path, AnalysisRequestHandler, bind_and_activate=False) as unix_server:
+            unix_server.analysis_server = self
+            unix_server.timeout = self.poll_interval
+
+            unix_server.server_bind()
+            try:
+                # Socket restricted to the current user before accepting connections
+                os.chmod(self.socket_path, 0o600)
+                unix_server.server_activate()
+
+                if self.verbose:
+                    print('=> Listening on {}'.format(self.socket_path))
+
+                while not self.stopped:
+                    unix_server.handle_request()
+
+                    if not self.stopped:
+                        self.refresh()
+            finally:
+                os.remove(self.socket_path)
+
+    # Queries
+
+    def query_ping(self):
+        return {
+            'project': self.xc_project.name,
+            'targets': len(self.xc_project.targets),
+            'files': len(self.xc_project.files),
+        }
+
+    def query_types(self, target=None, languages=('swift', 'objc')):
+        """ Types of the target or of every target, inner types included, sorted by file path and fullname. """
+        targets = [self._target_with_name(target)] if target else self.xc_project.targets
+
+        types = set()
+        for xc_target in targets:
+            if 'swift' in languages:
+                types |= xc_target.swift_types
+            if 'objc' in languages:
+                types |= xc_target.objc_types
+
+        summaries = [type_summary(t) for t in types]
+        return sorted(summaries, key=lambda t: (t['filepath'], t['fullname'], t['kind']))
+
+    def query_occurrences(self, type):
+        """ Files in which the type occurs, apart from its declaration file. """
+        type_occurrences = self.xcode_project_reader.find_type_and_occurrences_from_files(type)
+
+        return {
+            'type': type_summary(type_occurrences.swift_or_objc_type),
+            'occurrences_count_in_definition_file': type_occurrences.occurrences_count_in_definition_file,
+            'filepaths': sorted(f.filepath for f in type_occurrences.source_files_that_use),
+        }
+
+    def query_orphans(self, mode='all', ignored_folders=()):
+        """ Sorted paths of the orphan files, as given by `find-orphan-files.py`. """
+        ignored_dirpaths, ignored_dirs = parse_ignored_folders(set(ignored_folders) | {'DerivedData/', '.git/'})
+
+        return XcProjReporter(self.xc_project).find_orphan_files(ignored_dirpaths, ignored_dirs, mode=mode)
+
+    def query_duplicates(self, target):
+        """ Types of the target and of its dependencies which have the same name. """
+        duplicate_lists = self.xcode_project_reader.find_duplicate_type_names(from_target=self._target_with_name(target))
+
+        return {key: [[type_summary(t) for t in types] for types in lists]
+                for (key, lists) in zip(['swift', 'objc', 'swift_objc'], duplicate_lists)}
+
+    def query_report(self, script, **arguments):
+        """ Output of the given script for the loaded project, for the clients that print it. """
+        report_function = getattr(self, 'report_{}'.format(script.replace('-', '_')), None)
+        if report_function is None:
+            raise ValueError("Not supported report: '{}'.".format(script))
+
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            report_function(**arguments)
+
+        return output.getvalue()
+
+    def query_stop(self):
+        self.stopped = True
+        return True
+
+    # Reports
+
+    def report_list_types(self, languages=('swift', 'objc'), display_files=False):
+        reporter = XcProjReporter(self.xc_project)
+        reporter.print_types_by_file(languages=set(languages), display_files=display_files)
+        reporter.print_types_summary(languages=set(languages))
+
+    def report_find_orphan_files(self, mode='all', ignored_folders=()):
+        for filepath in self.query_orphans(mode=mode, ignored_folders=ignored_folders):
+            print(filepath)
+
+    def report_find_type_occurrences(self, type):
+        type_occurrences = self.xcode_project_reader.find_type_and_occurrences_from_files(type)
+
+        print()
+        OccurrencesReporter().print_occurrences_of_one_type_in_files(type_occurrences)
+
+    def report_find_dead_types(self, app, display_files=False):
+        app_target = self._target_with_name(app)
+
+        objc_types = app_target.objc_types_dependencies_filtered(type_not_in={ObjcTypeType.CATEGORY, ObjcTypeType.CONSTANT})  # temporary exclude constants from objc types
+        type_occurrences_set = self.xcode_project_reader.find_type_occurrences_from_files(objc_types, from_target=app_target)
+
+        OccurrencesReporter().print_occurrences_of_multiple_types_in_files(type_occurrences_set, display_files)
+
+    def report_find_duplicate_type_names(self, app):
+        duplicate_lists = self.xcode_project_reader.find_duplicate_type_names(from_target=self._target_with_name(app))
+
+        OccurrencesReporter().print_duplicate_names(*duplicate_lists)
+
+
+class AnalysisClient():
+    """ Client of the analysis server of a project. """
+
+    def __init__(self, project_folder_path=None, socket_path=None):
+        assert project_folder_path or socket_path
+
+        self.socket_path = socket_path or default_socket_path(project_folder_path)
+
+    def query(self, query, timeout=None, **arguments):
+        """ Result of the query, or `XcodeProjectReadException` with the error of the server. """
+        try:
+            with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client_socket:
+                client_socket.settimeout(timeout)
+                client_socket.connect(self.socket_path)
+                client_socket.sendall(json.dumps({'query': query, 'arguments': arguments}).encode('utf-8') + b'\n')
+
+                with client_socket.makefile('rb') as response_file:
+                    response_line = response_file.readline()
+        except OSError as e:
+            raise XcodeProjectReadException("No analysis server answering on '{}' ({}). Start it with `xcanalyzer-server.py`.".format(self.socket_path, e))
+
+        if not response_line:
+            raise XcodeProjectReadException("The analysis server closed the connection without answering.")
+
+        response = json.loads(response_line.decode('utf-8'))
+        if 'error' in response:
+            raise XcodeProjectReadException(response['error'])
+
+        return response['result']
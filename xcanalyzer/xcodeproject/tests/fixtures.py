@@ -2,8 +2,10 @@ import json
 import os
 import subprocess
 
+from unittest import mock
+
 from ..models import XcTarget, XcProject, XcGroup, XcFile
-from ..parsers import XcProjectParser, SwiftCodeParser
+from ..parsers import XcProjectParser, SwiftCodeParser, SourceKittenServerStructureReader
 
 
 # Absolute path of this project root folder.
@@ -56,6 +58,19 @@ class XcProjectParserFixture():
         return project_parser
 
 
+class SourceKittenStubFixture():
+
+    @property
+    def stub_folder_path(self):
+        """ Folder containing `sourcekitten` and `sourcekitten-server` executables which print canned structures of the sample project files. """
+        return os.path.join(os.path.dirname(__file__), 'sourcekitten')
+
+    def stub_on_path(self):
+        """ Context manager placing the `sourcekitten` stub first in the `PATH`, and giving the `sourcekitten-server` stub as structure server. """
+        path = os.pathsep.join([self.stub_folder_path, os.environ.get('PATH', '')])
+        return mock.patch.dict(os.environ, {'PATH': path, SourceKittenServerStructureReader.COMMAND_ENVIRONMENT_VARIABLE: 'sourcekitten-server'})
+
+
 class SwiftCodeParserFixture():
 
     def any_swift_code_parser(self, swift_code, base_discriminant='', type_counter=0):
@@ -0,0 +1,212 @@
+""" Reference implementations and generated projects used by the tests and the benchmarks. """
+
+import os
+import re
+
+import openstep_parser as osp
+from pbxproj import XcodeProject
+
+from ..parsers import TypeOccurrencesFromFile
+from .fixtures import SampleXcodeProjectFixture
+
+
+# Projects
+
+def _replace_keys(value, new_keys):
+    """ Copy of the pbxproj value where the object keys are replaced by the new ones. """
+    if isinstance(value, dict):
+        return {k: _replace_keys(v, new_keys) for (k, v) in value.items()}
+    elif isinstance(value, list):
+        return [_replace_keys(v, new_keys) for v in value]
+    else:
+        return new_keys.get(value, value)
+
+
+def generate_tree(copies_count, project_folder_path=None):
+    """ Decoded pbxproj tree containing the objects of the given project `copies_count` times.
+
+    Each copy has its own keys, its own root group `Copy<index>` containing the
+    copied main group's children and its own targets suffixed by its index. The
+    project defaults to the sample project.
+    """
+    project_folder_path = project_folder_path or SampleXcodeProjectFixture().project_folder_path
+    pbxproj_path = os.path.join(project_folder_path, 'SampleiOSApp.xcodeproj', 'project.pbxproj')
+    with open(pbxproj_path, 'r') as opened_file:
+        tree = osp.OpenStepDecoder.ParseFromFile(opened_file)
+
+    objects = tree['objects']
+    sample_objects = dict(objects)
+    root_object = objects[tree['rootObject']]
+    main_group = objects[root_object['mainGroup']]
+    main_group_children = list(main_group['children'])
+
+    # The project and its build configurations are not copied
+    project_keys = {tree['rootObject'], root_object['buildConfigurationList']}
+    project_keys |= set(objects[root_object['buildConfigurationList']]['buildConfigurations'])
+
+    for index in range(1, copies_count):
+        new_keys = {key: '{}{:08X}'.format(key, index) for key in sample_objects.keys()}
+
+        for (key, sample_object) in sample_objects.items():
+            if key in project_keys:
+                continue
+
+            copied_object = _replace_keys(sample_object, new_keys)
+
+            if key == root_object['mainGroup']:  # Main group of the copy becomes a group of the project
+                copied_object = {
+                    'isa': 'PBXGroup',
+                    'children': [new_keys[k] for k in main_group_children],
+                    'path': 'Copy{}'.format(index),
+                    'sourceTree': '<group>',
+                }
+                main_group['children'].append(new_keys[key])
+
+            elif copied_object['isa'].endswith('Target'):
+                copied_object['name'] = '{}{}'.format(copied_object['name'], index)
+                root_object['targets'].append(new_keys[key])
+
+            objects[new_keys[key]] = copied_object
+
+    return tree
+
+
+def write_project(folder_path, tree):
+    """ Writes the tree as the pbxproj of `Bench.xcodeproj` in the folder. """
+    xcodeproj_path = os.path.join(folder_path, 'Bench.xcodeproj')
+    os.makedirs(xcodeproj_path)
+
+    pbxproj_path = os.path.join(xcodeproj_path, 'project.pbxproj')
+    XcodeProject(tree, pbxproj_path).save()
+
+
+def project_summary(xc_project):
+    """ Comparable content of the project: groups, files, build settings and targets. """
+    def build_configurations_summary(build_configurations):
+        return [(c.name, [(s.key, list(s.value)) for s in c.build_settings]) for c in build_configurations]
+
+    groups = xc_project.groups_filtered()
+
+    return {
+        'files': sorted(f.filepath for f in xc_project.files),
+        'groups': sorted((g.group_path, g.filepath, g.is_project_relative, g.is_variant) for g in groups),
+        'build_configurations': build_configurations_summary(xc_project.build_configurations),
+        'targets': [(t.name,
+                     t.type,
+                     t.product_name,
+                     build_configurations_summary(t.build_configurations),
+                     sorted(d.name for d in t.dependencies),
+                     sorted(f.filepath for f in t.source_files),
+                     sorted(f.filepath for f in t.resource_files),
+                     sorted(f.filepath for f in t.header_files),
+                     sorted(f.filepath for f in t.linked_files),
+                     sorted(f.name for f in t.linked_frameworks),
+                     sorted(f.name for f in t.embed_frameworks)) for t in xc_project.targets],
+    }
+
+
+class TreeGenerator():
+    """ Generator of a decoded pbxproj tree with sequential object keys. """
+
+    def __init__(self):
+        self.objects = dict()
+
+    def add(self, pbxproj_object):
+        key = '{:024X}'.format(len(self.objects))
+        self.objects[key] = pbxproj_object
+        return key
+
+    def add_configuration_list(self):
+        configuration_key = self.add({'isa': 'XCBuildConfiguration', 'name': 'Debug', 'buildSettings': {'SWIFT_VERSION': '5.0'}})
+        return self.add({'isa': 'XCConfigurationList', 'buildConfigurations': [configuration_key]})
+
+
+def generate_flat_tree(files_count, files_per_target=100):
+    """ Decoded pbxproj tree with `files_count` file references in a single group. """
+    generator = TreeGenerator()
+
+    # Files in a flat group
+    file_keys = [generator.add({'isa': 'PBXFileReference', 'path': 'File{}.swift'.format(index), 'sourceTree': '<group>'})
+                 for index in range(files_count)]
+    group_key = generator.add({'isa': 'PBXGroup', 'children': file_keys, 'path': 'Generated', 'sourceTree': '<group>'})
+    main_group_key = generator.add({'isa': 'PBXGroup', 'children': [group_key], 'sourceTree': '<group>'})
+
+    # Targets building slices of the files, each one depending on the previous one
+    target_keys = list()
+    for target_index in range((files_count + files_per_target - 1) // files_per_target):
+        target_file_keys = file_keys[target_index * files_per_target:(target_index + 1) * files_per_target]
+        build_file_keys = [generator.add({'isa': 'PBXBuildFile', 'fileRef': k}) for k in target_file_keys]
+        sources_key = generator.add({'isa': 'PBXSourcesBuildPhase', 'files': build_file_keys})
+
+        dependency_keys = list()
+        if target_keys:
+            dependency_keys.append(generator.add({'isa': 'PBXTargetDependency', 'target': target_keys[-1]}))
+
+        product_key = generator.add({'isa': 'PBXFileReference',
+                                     'path': 'Target{}.framework'.format(target_index),
+                                     'sourceTree': 'BUILT_PRODUCTS_DIR'})
+        target_keys.append(generator.add({
+            'isa': 'PBXNativeTarget',
+            'name': 'Target{}'.format(target_index),
+            'productType': 'com.apple.product-type.framework',
+            'productReference': product_key,
+            'buildConfigurationList': generator.add_configuration_list(),
+            'buildPhases': [sources_key],
+            'dependencies': dependency_keys,
+        }))
+
+    root_key = generator.add({
+        'isa': 'PBXProject',
+        'mainGroup': main_group_key,
+        'targets': target_keys,
+        'buildConfigurationList': generator.add_configuration_list(),
+    })
+
+    return {'objects': generator.objects, 'rootObject': root_key}
+
+
+# Occurrences
+
+def legacy_find_files_that_contains(project_parser, swift_objc_types, source_files):
+    """ Implementation of `_find_files_that_contains` with one regex per type. """
+    swift_objc_types = list(swift_objc_types)
+
+    occurrences = list()
+    for swift_objc_type in swift_objc_types:
+        occurrence = TypeOccurrencesFromFile(swift_or_objc_type=swift_objc_type,
+                                             source_files_that_use=set(),
+                                             occurrences_count_in_definition_file=0)
+        occurrences.append(occurrence)
+
+    regex = list()
+    for swift_objc_type in swift_objc_types:
+        pattern = re.compile(r'^(?!//).*\W{}\W'.format(swift_objc_type.name))
+        regex.append(pattern)
+
+    for source_file in source_files:
+        xc_filepath = project_parser.xc_project.relative_path_for_file(source_file)
+
+        with open(xc_filepath) as opened_file:
+            for line in opened_file:
+                if line.startswith('//'):
+                    continue
+
+                for (index, swift_objc_type) in enumerate(swift_objc_types):
+                    if swift_objc_type.name not in line:
+                        continue
+
+                    if not regex[index].search(line):
+                        continue
+
+                    if swift_objc_type.file == source_file:
+                        occurrences[index].occurrences_count_in_definition_file += 1
+                    else:
+                        occurrences[index].source_files_that_use.add(source_file)
+
+    return occurrences
+
+
+def occurrences_summary(occurrences):
+    return sorted((o.swift_or_objc_type.name,
+                   o.occurrences_count_in_definition_file,
+                   sorted(f.filepath for f in o.source_files_that_use)) for o in occurrences)
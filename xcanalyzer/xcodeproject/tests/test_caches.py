@@ -0,0 +1,83 @@
+from unittest import TestCase
+
+import os
+import tempfile
+
+from ..caches import FileCache
+
+
+class FileCacheTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.folder_path = self.temporary_directory.name
+
+        self.source_filepath = os.path.join(self.folder_path, 'MyFile.m')
+        self._write_source('@implementation MyClass\n')
+
+        self.cache = FileCache(os.path.join(self.folder_path, 'files.pkl'))
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _write_source(self, content, mtime=None):
+        with open(self.source_filepath, 'w') as opened_file:
+            opened_file.write(content)
+
+        if mtime is not None:
+            os.utime(self.source_filepath, ns=(mtime, mtime))
+
+    # get
+
+    def test_get__returns_none__when_file_never_cached(self):
+        self.assertIsNone(self.cache.get('MyParser', 1, self.source_filepath))
+
+    def test_get__returns_result__when_file_unchanged(self):
+        self.cache.set('MyParser', 1, self.source_filepath, ['MyClass'])
+
+        self.assertEqual(self.cache.get('MyParser', 1, self.source_filepath), ['MyClass'])
+
+    def test_get__returns_none__when_file_content_changed(self):
+        self.cache.set('MyParser', 1, self.source_filepath, ['MyClass'])
+
+        self._write_source('@implementation MyOtherClass\n', mtime=10 ** 18)
+
+        self.assertIsNone(self.cache.get('MyParser', 1, self.source_filepath))
+
+    def test_get__returns_result__when_file_touched_with_same_content(self):
+        self.cache.set('MyParser', 1, self.source_filepath, ['MyClass'])
+
+        self._write_source('@implementation MyClass\n', mtime=10 ** 18)
+
+        self.assertEqual(self.cache.get('MyParser', 1, self.source_filepath), ['MyClass'])
+
+    def test_get__returns_none__when_parser_version_changed(self):
+        self.cache.set('MyParser', 1, self.source_filepath, ['MyClass'])
+
+        self.assertIsNone(self.cache.get('MyParser', 2, self.source_filepath))
+
+    def test_get__returns_none__for_another_parser(self):
+        self.cache.set('MyParser', 1, self.source_filepath, ['MyClass'])
+
+        self.assertIsNone(self.cache.get('MyOtherParser', 1, self.source_filepath))
+
+    # set
+
+    def test_set__stores_result_as_it_was_when_set(self):
+        result = ['MyClass']
+        self.cache.set('MyParser', 1, self.source_filepath, result)
+
+        result.append('MyOtherClass')
+
+        self.assertEqual(self.cache.get('MyParser', 1, self.source_filepath), ['MyClass'])
+
+    # save / load
+
+    def test_load__gives_saved_results(self):
+        self.cache.set('MyParser', 1, self.source_filepath, ['MyClass'])
+        self.cache.save()
+
+        cache = FileCache(self.cache.filepath)
+        cache.load()
+
+        self.assertEqual(cache.get('MyParser', 1, self.source_filepath), ['MyClass'])
@@ -0,0 +1,162 @@
+from unittest import TestCase
+
+import os
+import tempfile
+
+from ..indexes import TokenIndex, index_file
+
+
+class IndexFileTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _source_filepath(self, filename, content):
+        filepath = os.path.join(self.temporary_directory.name, filename)
+
+        with open(filepath, 'w') as opened_file:
+            opened_file.write(content)
+
+        return filepath
+
+    def test_index_file__gives_line_numbers_of_identifiers(self):
+        filepath = self._source_filepath('MyFile.m', '\n'.join([
+            '#import "MyClass.h"',
+            '// MyClass in a comment',
+            '    MyClass *object = [MyClass new];',
+            '',
+        ]))
+
+        indexed_file = index_file(filepath)
+
+        self.assertEqual(indexed_file.lines_by_identifier['MyClass'], [1, 3])
+        self.assertEqual(indexed_file.lines_by_identifier['h'], [1])
+        self.assertEqual(indexed_file.lines_by_identifier['object'], [3])
+
+    def test_index_file__ignores_identifiers_in_comments_and_strings(self):
+        filepath = self._source_filepath('MyFile.swift', '\n'.join([
+            'let a = "MyClass" // MyClass',
+            '/* MyClass',
+            '   MyClass */ let b = MyClass()',
+            '',
+        ]))
+
+        indexed_file = index_file(filepath)
+
+        self.assertEqual(indexed_file.lines_by_identifier['MyClass'], [3])
+
+    def test_index_file__gives_enclosing_types__for_swift(self):
+        filepath = self._source_filepath('MyFile.swift', '\n'.join([
+            'class MyClass {',
+            '    struct InnerStruct {',
+            '        let value: MyType',
+            '    }',
+            '    let other: MyType',
+            '}',
+            'let global: MyType',
+            '',
+        ]))
+
+        indexed_file = index_file(filepath)
+
+        self.assertEqual(indexed_file.enclosing_type_name(3), 'InnerStruct')
+        self.assertEqual(indexed_file.enclosing_type_name(5), 'MyClass')
+        self.assertEqual(indexed_file.enclosing_type_name(7), None)
+
+    def test_index_file__gives_enclosing_types__for_swift__with_braces_in_strings(self):
+        filepath = self._source_filepath('MyFile.swift', '\n'.join([
+            'class MyClass {',
+            '    let opening = "{"',
+            '}',
+            'let global: MyType',
+            '',
+        ]))
+
+        indexed_file = index_file(filepath)
+
+        self.assertEqual(indexed_file.enclosing_type_name(2), 'MyClass')
+        self.assertEqual(indexed_file.enclosing_type_name(4), None)
+
+    def test_index_file__gives_enclosing_types__for_objc(self):
+        filepath = self._source_filepath('MyFile.m', '\n'.join([
+            '@protocol MyProtocol;',
+            '@implementation MyClass',
+            '- (MyType *)value { return nil; }',
+            '@end',
+            'MyType *global;',
+            '',
+        ]))
+
+        indexed_file = index_file(filepath)
+
+        self.assertEqual(indexed_file.enclosing_type_name(3), 'MyClass')
+        self.assertEqual(indexed_file.enclosing_type_name(5), None)
+
+
+class TokenIndexTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+
+        self.source_filepath = os.path.join(self.temporary_directory.name, 'MyFile.m')
+        self._write_source(' MyClass *object;\n')
+
+        self.index = TokenIndex(os.path.join(self.temporary_directory.name, 'tokens.pkl'))
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _write_source(self, content, mtime=None):
+        with open(self.source_filepath, 'w') as opened_file:
+            opened_file.write(content)
+
+        if mtime is not None:
+            os.utime(self.source_filepath, ns=(mtime, mtime))
+
+    # update
+
+    def test_update__indexes_new_files(self):
+        indexed_filepaths = self.index.update([self.source_filepath])
+
+        self.assertEqual(indexed_filepaths, [self.source_filepath])
+        self.assertEqual(self.index.identifier_lines('MyClass'), {self.source_filepath: [1]})
+
+    def test_update__does_not_index_again__unchanged_files(self):
+        self.index.update([self.source_filepath])
+
+        indexed_filepaths = self.index.update([self.source_filepath])
+
+        self.assertEqual(indexed_filepaths, [])
+
+    def test_update__indexes_again__changed_files(self):
+        self.index.update([self.source_filepath])
+
+        self._write_source(' MyOtherClass *object;\n', mtime=10 ** 18)
+        indexed_filepaths = self.index.update([self.source_filepath])
+
+        self.assertEqual(indexed_filepaths, [self.source_filepath])
+        self.assertEqual(self.index.identifier_lines('MyClass'), {})
+        self.assertEqual(self.index.identifier_lines('MyOtherClass'), {self.source_filepath: [1]})
+
+    # occurrences
+
+    def test_occurrences__gives_file_line_and_enclosing_type(self):
+        self._write_source('@implementation MyClass\n    MyType *object;\n@end\n')
+        self.index.update([self.source_filepath])
+
+        self.assertEqual(self.index.occurrences('MyType'), [(self.source_filepath, 2, 'MyClass')])
+
+    # save / load
+
+    def test_load__gives_saved_index(self):
+        self.index.update([self.source_filepath])
+        self.index.save()
+
+        index = TokenIndex(self.index.filepath)
+        index.load()
+
+        self.assertEqual(index.identifier_lines('MyClass'), {self.source_filepath: [1]})
+        self.assertEqual(index.update([self.source_filepath]), [])
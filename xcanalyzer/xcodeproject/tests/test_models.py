@@ -1,6 +1,10 @@
 from unittest import TestCase
 
-from ..models import XcTarget, XcProject, XcGroup, XcFile
+import pickle
+
+from ...language.models import SwiftType, SwiftTypeType, SwiftAccessibility, ObjcType, ObjcTypeType
+
+from ..models import FileIndex, XcTarget, XcProject, XcGroup, XcFile
 
 from .fixtures import XcModelsFixture
 
@@ -48,8 +52,44 @@ class XcFileTests(TestCase):
         representation = str(xc_file)
 
         self.assertEqual(representation, "<XcFile> /MyFile")
+
+    # pickle
+
+    def test_xc_file__is_unpickled_with_its_types__and_interned_filepath(self):
+        xc_file = XcFile(filepath=''.join(['/My', 'File.swift']))
+        swift_type = SwiftType(SwiftTypeType.CLASS, 'MyClass', SwiftAccessibility.PUBLIC, raw_inherited_types={'NSObject'})
+        inner_type = SwiftType(SwiftTypeType.STRUCT, 'MyStruct', SwiftAccessibility.INTERNAL)
+        swift_type.inner_types = [inner_type]
+        inner_type.parent_type = swift_type
+        xc_file.swift_types = [swift_type]
+        swift_type.file = xc_file
+
+        unpickled_file = pickle.loads(pickle.dumps(xc_file, pickle.HIGHEST_PROTOCOL))
+
+        self.assertFalse(hasattr(unpickled_file, '__dict__'))
+        self.assertIs(unpickled_file.filepath, xc_file.filepath)
+        self.assertEqual(unpickled_file.swift_types, [swift_type])
+        self.assertIs(unpickled_file.swift_types[0].file, unpickled_file)
+        self.assertEqual(unpickled_file.swift_types[0].raw_inherited_types, {'NSObject'})
+        self.assertEqual(unpickled_file.swift_types[0].inner_types[0].fullname, 'MyClass.MyStruct')
     
 
+class FileIndexTests(TestCase):
+
+    # bits, files_of, count
+
+    def test_files_of__gives_files_of_the_bits__sorted_by_path(self):
+        files = [XcFile('/MyFile{}.swift'.format(index)) for index in range(20)]
+        file_index = FileIndex(reversed(files))
+
+        bits = file_index.bits([files[15], files[1], files[8]])
+
+        self.assertEqual(file_index.files_of(bits), [files[1], files[15], files[8]])
+        self.assertEqual(file_index.files_of(bits & ~file_index.bits([files[8]])), [files[1], files[15]])
+        self.assertEqual(file_index.count(bits), 3)
+        self.assertEqual(file_index.files_of(0), [])
+
+
 class XcGroupTests(TestCase):
 
     fixture = XcModelsFixture()
@@ -189,6 +229,119 @@ class XcProjectTests(TestCase):
 
         self.assertEqual(resulting_target, target)
 
+    # targets_topological_order, targets_dependencies_all
+
+    def test_targets_topological_order__gives_dependencies_before_dependants__then_by_name(self):
+        target_d = self.fixture.any_target(name='D')
+        target_c = self.fixture.any_target(name='C')
+        target_b = self.fixture.any_target(name='B')
+        target_a = self.fixture.any_target(name='A')
+        target_a.dependencies = {target_c}
+        target_c.dependencies = {target_d}
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target_a, target_b, target_c, target_d], groups=[], files=set())
+
+        self.assertEqual([t.name for t in project.targets_topological_order], ['B', 'D', 'C', 'A'])
+
+    def test_targets_topological_order__gives_targets_of_cycles_last(self):
+        target_c = self.fixture.any_target(name='C')
+        target_b = self.fixture.any_target(name='B')
+        target_a = self.fixture.any_target(name='A')
+        target_a.dependencies = {target_b}
+        target_b.dependencies = {target_a}
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target_a, target_b, target_c], groups=[], files=set())
+
+        self.assertEqual([t.name for t in project.targets_topological_order], ['C', 'A', 'B'])
+
+    def test_targets_dependencies_all__gives_transitive_dependencies_of_each_target(self):
+        targets = [self.fixture.any_target(name='Target{}'.format(index)) for index in range(5)]
+        for (target, dependency) in zip(targets, targets[1:]):
+            target.dependencies = {dependency}
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=targets, groups=[], files=set())
+
+        dependencies_all = project.targets_dependencies_all
+
+        self.assertEqual(dependencies_all[targets[0]], set(targets[1:]))
+        self.assertEqual(dependencies_all[targets[3]], {targets[4]})
+        self.assertEqual(dependencies_all[targets[4]], set())
+
+    # file_with_name, file_with_path
+
+    def test_file_with_name__returns_first_file_by_path__when_several_files_match(self):
+        file_1 = XcFile('/MyGroup2/MyFile.swift')
+        file_2 = XcFile('/MyGroup1/MyFile.swift')
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=set(), groups=[], files={file_1, file_2})
+
+        self.assertIs(project.file_with_name('MyFile.swift'), file_2)
+        self.assertIsNone(project.file_with_name('MyOtherFile.swift'))
+
+    def test_file_with_path__returns_file__when_a_filepath_matches(self):
+        xc_file = XcFile('/MyGroup/MyFile.swift')
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=set(), groups=[], files={xc_file})
+
+        self.assertIs(project.file_with_path('/MyGroup/MyFile.swift'), xc_file)
+        self.assertIsNone(project.file_with_path('/MyFile.swift'))
+
+    # types_with_name, types_with_fullname, type_with_name
+
+    def _project_with_types(self):
+        swift_file = XcFile('/MyFile.swift')
+        swift_file.swift_types = [SwiftType(SwiftTypeType.EXTENSION, 'MyType', SwiftAccessibility.INTERNAL),
+                                  SwiftType(SwiftTypeType.STRUCT, 'MyType', SwiftAccessibility.INTERNAL)]
+        inner_type = SwiftType(SwiftTypeType.ENUM, 'MyInnerType', SwiftAccessibility.INTERNAL)
+        inner_type.parent_type = swift_file.swift_types[1]
+        swift_file.swift_types[1].inner_types = [inner_type]
+
+        objc_file = XcFile('/MyFile.h')
+        objc_file.objc_types = [ObjcType(ObjcTypeType.CLASS, 'MyObjcType')]
+
+        target_less_file = XcFile('/MyTargetLessFile.h')
+        target_less_file.objc_types = [ObjcType(ObjcTypeType.CATEGORY, 'MyCategoryType', category_name='Extra')]
+
+        for xc_file in [swift_file, objc_file, target_less_file]:
+            for swift_or_objc_type in (xc_file.swift_types or []) + (xc_file.objc_types or []):
+                swift_or_objc_type.file = xc_file
+        inner_type.file = swift_file
+
+        target = XcTarget(name='MyTarget',
+                          target_type=XcTarget.Type.FRAMEWORK,
+                          product_name='MyTarget',
+                          build_configurations=list(),
+                          source_files={swift_file},
+                          header_files={objc_file})
+
+        return XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target], groups=[], files={swift_file, objc_file, target_less_file})
+
+    def test_types_with_name__gives_types_of_the_name__filtered_by_type_identifier(self):
+        project = self._project_with_types()
+
+        self.assertEqual([t.type_identifier for t in project.types_with_name('MyType')], [SwiftTypeType.EXTENSION, SwiftTypeType.STRUCT])
+        self.assertEqual([t.type_identifier for t in project.types_with_name('MyType', type_in={SwiftTypeType.STRUCT})], [SwiftTypeType.STRUCT])
+        self.assertEqual(project.types_with_name('MyInnerType'), [])
+
+    def test_types_with_fullname__gives_inner_types(self):
+        project = self._project_with_types()
+
+        self.assertEqual([t.name for t in project.types_with_fullname('MyType.MyInnerType')], ['MyInnerType'])
+
+    def test_type_with_name__ignores_swift_extensions_and_target_less_categories(self):
+        project = self._project_with_types()
+
+        self.assertEqual(project.type_with_name('MyType').type_identifier, SwiftTypeType.STRUCT)
+        self.assertEqual(project.type_with_name('MyObjcType').type_identifier, ObjcTypeType.CLASS)
+        self.assertIsNone(project.type_with_name('MyCategoryType'))
+
+    def test_types_with_name__are_updated__when_files_parsed(self):
+        swift_file = XcFile('/MyFile.swift')
+        target = self.fixture.any_target()
+        target.source_files = {swift_file}
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target], groups=[], files={swift_file})
+        self.assertEqual(project.types_with_name('MyType'), [])
+
+        swift_file.swift_types = [SwiftType(SwiftTypeType.CLASS, 'MyType', SwiftAccessibility.INTERNAL)]
+        project.swift_files_parsed = True
+
+        self.assertEqual(project.types_with_name('MyType'), swift_file.swift_types)
+
     # groups_filtered - all
 
     def test_groups_filtered__gives_all_paths__sorted(self):
@@ -323,6 +476,22 @@ class XcProjectTests(TestCase):
         self.assertTrue(file_1 in target_files)
         self.assertTrue(file_2 in target_files)
     
+    # file_index, targets_files_bits, targets_of_file
+
+    def test_targets_of_file__gives_targets_sharing_the_file(self):
+        shared_file = XcFile('/MyShared.swift')
+        file_1 = XcFile('/MyFile1.swift')
+        target_1 = XcTarget('MyTarget1', XcTarget.Type.FRAMEWORK, 'MyProduct1', build_configurations=list(), source_files={shared_file, file_1})
+        target_2 = XcTarget('MyTarget2', XcTarget.Type.FRAMEWORK, 'MyProduct2', build_configurations=list(), resource_files={shared_file})
+        target_less_file = XcFile('/MyTargetLess.h')
+        group = self.fixture.any_group(files={shared_file, file_1, target_less_file})
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target_1, target_2], groups=[group], files=set())
+
+        self.assertEqual(project.targets_of_file(shared_file), [target_1, target_2])
+        self.assertEqual(project.targets_of_file(file_1), [target_1])
+        self.assertEqual(project.targets_of_file(target_less_file), [])
+        self.assertEqual(project.file_index.files_of(project.targets_files_bits[target_1]['source_files']), [file_1, shared_file])
+    
     # group_files
 
     def test_group_files(self):
@@ -369,6 +538,47 @@ class XcProjectTests(TestCase):
         self.assertTrue(root_file in files)
         self.assertTrue(group_file in files)
 
+    # derived data
+
+    def test_files__gives_same_object__when_called_twice(self):
+        group = self.fixture.any_group(files=set([XcFile('/MyGroup/MyFile')]))
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=set(), groups=[group], files=set())
+
+        self.assertIs(project.files, project.files)
+
+    def test_files__are_updated__when_groups_assigned(self):
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=set(), groups=[], files=set())
+        self.assertFalse(project.files)
+
+        group_file = XcFile('/MyGroup/MyFile')
+        project.groups = [self.fixture.any_group(files=set([group_file]))]
+
+        self.assertEqual(project.files, {group_file})
+
+    def test_target_files__are_updated__when_target_files_modified_and_derived_data_invalidated(self):
+        target = self.fixture.any_target(resource_files=set())
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target], groups=[], files=set())
+        self.assertFalse(project.target_files)
+
+        resource_file = XcFile('/MyFile')
+        target.resource_files.add(resource_file)
+        self.assertFalse(project.target_files)  # Modified in place
+
+        project.invalidate_derived_data()
+
+        self.assertEqual(project.target_files, {resource_file})
+        self.assertEqual(target.files, {resource_file})
+
+    def test_derived_data__are_not_pickled(self):
+        group = self.fixture.any_group(files=set([XcFile('/MyGroup/MyFile')]))
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=set(), groups=[group], files=set())
+        project.files
+
+        unpickled_project = pickle.loads(pickle.dumps(project))
+
+        self.assertFalse(unpickled_project._derived_data)
+        self.assertEqual(unpickled_project.files, project.files)
+
 
 class XcTargetTests(TestCase):
 
@@ -559,3 +769,72 @@ class XcTargetTests(TestCase):
         
         expected_files = {source_file, resource_file, header_file, linked_file}
         self.assertEqual(expected_files, files)
+
+    # dependencies_all
+
+    def test_dependencies_all__gives_transitive_dependencies(self):
+        target_d = self.fixture.any_target(name='D')
+        target_c = self.fixture.any_target(name='C')
+        target_b = self.fixture.any_target(name='B')
+        target_a = self.fixture.any_target(name='A')
+        target_a.dependencies = {target_b}
+        target_b.dependencies = {target_c}
+        target_c.dependencies = {target_d}
+
+        self.assertEqual(target_a.dependencies_all, {target_b, target_c, target_d})
+
+    def test_dependencies_all__excludes_target__when_dependency_cycle(self):
+        target_b = self.fixture.any_target(name='B')
+        target_a = self.fixture.any_target(name='A')
+        target_a.dependencies = {target_b}
+        target_b.dependencies = {target_a}
+
+        self.assertEqual(target_a.dependencies_all, {target_b})
+        self.assertEqual(target_b.dependencies_all, {target_a})
+
+    # view_controllers
+
+    def test_view_controllers__gives_new_list__when_called_twice(self):
+        swift_file = XcFile('/MyViewController.swift')
+        swift_file.swift_types = [SwiftType(SwiftTypeType.CLASS, 'MyViewController', SwiftAccessibility.INTERNAL, raw_inherited_types={'UIViewController'}),
+                                  SwiftType(SwiftTypeType.CLASS, 'MyClass', SwiftAccessibility.INTERNAL)]
+        xc_target = self.fixture.any_target()
+        xc_target.source_files = {swift_file}
+
+        view_controllers = xc_target.view_controllers
+        view_controllers.append(swift_file.swift_types[1])
+
+        self.assertEqual(type(view_controllers), list)
+        self.assertEqual([vc.name for vc in xc_target.view_controllers], ['MyViewController'])
+
+    # derived data
+
+    def test_swift_files__are_updated__when_source_files_assigned(self):
+        xc_target = self.fixture.any_target()
+        self.assertFalse(xc_target.swift_files)
+
+        swift_file = XcFile('/MyFile.swift')
+        xc_target.source_files = {swift_file, XcFile('/MyFile.m')}
+
+        self.assertEqual(xc_target.swift_files, {swift_file})
+
+    def test_dependant_derived_data__are_updated__when_dependency_files_and_dependencies_assigned(self):
+        target_c = self.fixture.any_target(name='C')
+        target_b = self.fixture.any_target(name='B')
+        target_a = self.fixture.any_target(name='A')
+        target_a.dependencies = {target_b}
+        project = XcProject(dirpath='/', name="MyProject", build_configurations=list(), targets=[target_a, target_b, target_c], groups=[], files=set())
+        self.assertEqual(target_a.dependencies_all, {target_b})
+        self.assertFalse(target_a.dependant_source_files)
+        self.assertFalse(project.target_files)
+
+        swift_file = XcFile('/MyFile.swift')
+        swift_type = SwiftType(SwiftTypeType.CLASS, 'MyType', SwiftAccessibility.INTERNAL)
+        swift_file.swift_types = [swift_type]
+        target_b.source_files = {swift_file}
+        target_b.dependencies = {target_c}
+
+        self.assertEqual(target_a.dependencies_all, {target_b, target_c})
+        self.assertEqual(target_a.dependant_source_files, {swift_file})
+        self.assertEqual(target_a.swift_types_dependencies_filtered(), {swift_type})
+        self.assertEqual(project.target_files, {swift_file})
@@ -2,13 +2,22 @@ from unittest import TestCase
 
 import json
 import os
+import shlex
+import sys
+import tempfile
+
+from unittest import mock
 
 from ...language.models import SwiftType
 
-from ..models import XcTarget, XcGroup, XcFile
-from ..parsers import XcProjectParser, SwiftFileParser
+from ..models import XcTarget, XcGroup, XcFile, XcProject
+
+from ..exceptions import XcodeProjectReadException
+from ..parsers import XcProjectParser, SwiftFileParser, ObjcFileParser, SourceKittenServerStructureReader
+from ..parsers import file_lines_matching_names, names_by_first_part, searched_types_indexes, swift_file_type_occurrences
 
-from .fixtures import SampleXcodeProjectFixture, XcProjectParserFixture, SwiftCodeParserFixture
+from .fixtures import SampleXcodeProjectFixture, XcProjectParserFixture, SwiftCodeParserFixture, SourceKittenStubFixture
+from .helpers import generate_flat_tree, generate_tree, legacy_find_files_that_contains, occurrences_summary, project_summary, write_project
 
 
 class XcProjectParserTests(TestCase):
@@ -29,6 +38,47 @@ class XcProjectParserTests(TestCase):
 
         project_parser.load()
 
+    # load - lean loader
+
+    def test_xc_project_parser_load__gives_same_project__with_lean_loader_or_xcode_project(self):
+        path = SampleXcodeProjectFixture().project_folder_path
+
+        lean_parser = XcProjectParser(path, verbose=False, cache_active=False, lean_load=True)
+        lean_parser.load()
+        wrapper_parser = XcProjectParser(path, verbose=False, cache_active=False, lean_load=False)
+        wrapper_parser.load()
+
+        self.assertEqual(project_summary(lean_parser.xc_project), project_summary(wrapper_parser.xc_project))
+
+    def test_xc_project_parser_load__gives_same_project__with_lean_loader_or_xcode_project__for_large_pbxproj(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            write_project(folder_path, generate_tree(copies_count=3))
+
+            lean_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, lean_load=True)
+            lean_parser.load()
+            wrapper_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, lean_load=False)
+            wrapper_parser.load()
+
+        lean_summary = project_summary(lean_parser.xc_project)
+        self.assertEqual(len(lean_summary['targets']), 3 * 7)
+        self.assertEqual(lean_summary, project_summary(wrapper_parser.xc_project))
+
+    # build_project
+
+    def test_xc_project_parser_build_project__gives_files_of_flat_group_and_dependencies_of_targets(self):
+        project_parser = XcProjectParser('/Bench', verbose=False, cache_active=False)
+        project_parser.xcode_proj_name = 'Bench.xcodeproj'
+        project_parser.build_project(generate_flat_tree(files_count=250))
+
+        xc_project = project_parser.xc_project
+        self.assertEqual([g.group_path for g in xc_project.groups], ['/Generated'])
+        self.assertEqual(len(xc_project.groups[0].files), 250)
+        self.assertIn(XcFile('/Generated/File249.swift'), xc_project.groups[0].files)
+
+        self.assertEqual([t.name for t in xc_project.targets], ['Target0', 'Target1', 'Target2'])
+        self.assertEqual([sorted(d.name for d in t.dependencies) for t in xc_project.targets], [[], ['Target0'], ['Target1']])
+        self.assertEqual([len(t.source_files) for t in xc_project.targets], [100, 100, 50])
+
     # targets
 
     def test_xc_project_parser__gives_xcproject_with_name(self):
@@ -272,6 +322,370 @@ class XcProjectParserTests(TestCase):
         self.assertTrue(XcFile('/SampleCore/RelativeToProject/InsideRelativeToProject.swift') in bar_group.files)
         self.assertTrue(XcFile('/SampleCore/InsideRelativeToProjectWithoutFolder.swift') in foo_group.files)
 
+    # parse_swift_files
+
+    def _parsed_sample_xc_project_parser(self, jobs, swift_backend='sourcekitten', start_method=None):
+        path = SampleXcodeProjectFixture().project_folder_path
+        project_parser = XcProjectParser(path, verbose=False, cache_active=False, jobs=jobs, swift_backend=swift_backend, start_method=start_method)
+        project_parser.load()
+
+        with SourceKittenStubFixture().stub_on_path():
+            project_parser.parse_swift_files()
+
+        return project_parser
+
+    def _parsed_sample_xc_project(self, jobs, swift_backend='sourcekitten'):
+        return self._parsed_sample_xc_project_parser(jobs, swift_backend=swift_backend).xc_project
+
+    def test_xc_project_parser__parse_swift_files__sets_swift_types_of_every_swift_file(self):
+        xcode_project = self._parsed_sample_xc_project(jobs=4)
+
+        self.assertTrue(xcode_project.swift_files_parsed)
+        for swift_file in xcode_project.target_swift_files:
+            self.assertIsNotNone(swift_file.swift_types, swift_file)
+
+        swift_file = xcode_project.file_with_name('MyTypes.swift')
+        self.assertEqual([t.name for t in swift_file.swift_types],
+                         ['MyProtocol', 'MyProtocol', 'String', 'MyStruct', 'MyStruct', 'MyEnum', 'ContainerStruct', 'MyEnum', 'MyClass', 'MyClass'])
+        for swift_type in swift_file.swift_types:
+            self.assertEqual(swift_type.file, swift_file)
+
+    def test_xc_project_parser__parse_swift_files__gives_same_types__with_one_or_several_jobs(self):
+        serial_project = self._parsed_sample_xc_project(jobs=1)
+        concurrent_project = self._parsed_sample_xc_project(jobs=4)
+
+        for serial_file in serial_project.target_swift_files:
+            concurrent_file = concurrent_project.file_with_name(serial_file.filename)
+
+            serial_types = [(t.type_identifier, t.fullname, t.discriminant) for t in serial_file.swift_types]
+            concurrent_types = [(t.type_identifier, t.fullname, t.discriminant) for t in concurrent_file.swift_types]
+            self.assertEqual(serial_types, concurrent_types)
+
+    # parse_swift_files - native backend
+
+    def _swift_types_tree(self, swift_types):
+        return [(t.type_identifier,
+                 t.fullname,
+                 t.accessibility,
+                 sorted(t.raw_inherited_types),
+                 sorted(t.used_types),
+                 t.discriminant,
+                 self._swift_types_tree(t.inner_types)) for t in swift_types]
+
+    def test_xc_project_parser__parse_swift_files__gives_same_types_as_sourcekitten__with_native_backend(self):
+        sourcekitten_project = self._parsed_sample_xc_project(jobs=1)
+        native_project = self._parsed_sample_xc_project(jobs=1, swift_backend='native')
+
+        # Files with a recorded sourcekitten structure
+        for filename in ['MyTypes.swift', 'SampleCore.swift', '3generationViewControllers.swift']:
+            sourcekitten_file = sourcekitten_project.file_with_name(filename)
+            native_file = native_project.file_with_name(filename)
+
+            self.assertTrue(sourcekitten_file.swift_types)
+            self.assertEqual(self._swift_types_tree(native_file.swift_types),
+                             self._swift_types_tree(sourcekitten_file.swift_types))
+
+    def test_xc_project_parser__raises_value_error__when_unknown_swift_backend(self):
+        path = SampleXcodeProjectFixture().project_folder_path
+
+        with self.assertRaises(ValueError):
+            XcProjectParser(path, verbose=False, swift_backend='unknown')
+
+    # parse_swift_files - sourcekitten server backend
+
+    def test_xc_project_parser__parse_swift_files__gives_same_types_as_sourcekitten__with_sourcekitten_server_backend(self):
+        sourcekitten_project = self._parsed_sample_xc_project(jobs=4)
+        server_project = self._parsed_sample_xc_project(jobs=4, swift_backend='sourcekitten-server')
+
+        for sourcekitten_file in sourcekitten_project.target_swift_files:
+            server_file = server_project.file_with_name(sourcekitten_file.filename)
+
+            self.assertEqual(self._swift_types_tree(server_file.swift_types),
+                             self._swift_types_tree(sourcekitten_file.swift_types))
+
+    def test_sourcekitten_server_structure_reader__reads_every_structure_from_one_process(self):
+        project_folder_path = SampleXcodeProjectFixture().project_folder_path
+        filepaths = [os.path.join(project_folder_path, 'SampleCore', 'Normal', 'MyTypes.swift'),
+                     os.path.join(project_folder_path, 'SampleCore', 'SampleCore.swift'),
+                     os.path.join(project_folder_path, 'SampleiOSApp', 'AppDelegate.swift')]
+        reader = SourceKittenServerStructureReader()
+
+        with SourceKittenStubFixture().stub_on_path():
+            structures = list(reader.structures(filepaths))
+            process = reader.process
+            structure = reader.structure(filepaths[0])
+
+            self.assertIs(reader.process, process)
+            reader.close()
+
+        self.assertEqual(process.returncode, 0)
+        self.assertIsNone(reader.process)
+        self.assertEqual([len(s.get('key.substructure', [])) > 0 for s in structures], [True, True, False])
+        self.assertEqual(structure, structures[0])
+
+    def test_sourcekitten_server_structure_reader__raises_exception__when_server_stops(self):
+        reader = SourceKittenServerStructureReader()
+
+        with mock.patch.dict(os.environ, {SourceKittenServerStructureReader.COMMAND_ENVIRONMENT_VARIABLE: 'true'}):
+            with self.assertRaises(XcodeProjectReadException):
+                list(reader.structures(['/MyFile.swift']))
+            reader.close()
+
+    def test_sourcekitten_server_structure_reader__raises_exception__when_no_server_command(self):
+        reader = SourceKittenServerStructureReader()
+        environment = {k: v for (k, v) in os.environ.items() if k != SourceKittenServerStructureReader.COMMAND_ENVIRONMENT_VARIABLE}
+
+        with mock.patch.dict(os.environ, environment, clear=True):
+            with self.assertRaises(XcodeProjectReadException):
+                reader.structure('/MyFile.swift')
+
+        self.assertIsNone(reader.process)
+
+    def test_sourcekitten_server_structure_reader__raises_exception__when_server_command_not_found(self):
+        reader = SourceKittenServerStructureReader()
+
+        with mock.patch.dict(os.environ, {SourceKittenServerStructureReader.COMMAND_ENVIRONMENT_VARIABLE: 'xcanalyzer-missing-server'}):
+            with self.assertRaises(XcodeProjectReadException):
+                list(reader.structures(['/MyFile.swift']))
+
+        self.assertIsNone(reader.process)
+
+    def test_sourcekitten_server_structure_reader__raises_exception__when_server_exits_after_first_structure(self):
+        reader = SourceKittenServerStructureReader()
+        server_code = 'import sys; sys.stdin.readline(); print("{}", flush=True)'
+        filepaths = ['/MyFile{}.swift'.format(i) for i in range(20000)]
+
+        with mock.patch.dict(os.environ, {SourceKittenServerStructureReader.COMMAND_ENVIRONMENT_VARIABLE: ' '.join([sys.executable, '-c', shlex.quote(server_code)])}):
+            structures = reader.structures(filepaths)
+            self.assertEqual(next(structures), {})
+            with self.assertRaises(XcodeProjectReadException):
+                list(structures)
+
+        self.assertIsNone(reader.process)
+
+    def test_sourcekitten_server_structure_reader__stops_server__when_structure_is_invalid(self):
+        reader = SourceKittenServerStructureReader()
+        server_code = 'import sys, time; sys.stdin.readline(); print("{}"); print("invalid", flush=True); time.sleep(60)'
+        filepaths = ['/MyFile{}.swift'.format(i) for i in range(20000)]
+
+        with mock.patch.dict(os.environ, {SourceKittenServerStructureReader.COMMAND_ENVIRONMENT_VARIABLE: ' '.join([sys.executable, '-c', shlex.quote(server_code)])}):
+            with self.assertRaises(ValueError):
+                list(reader.structures(filepaths))
+
+        self.assertIsNone(reader.process)
+
+    # parse_objc_files
+
+    def test_xc_project_parser__parse_objc_files__gives_types_of_header(self):
+        project_parser = XcProjectParser(SampleXcodeProjectFixture().project_folder_path, verbose=False, cache_active=False)
+        project_parser.load()
+        project_parser.parse_objc_files()
+
+        objc_file = project_parser.xc_project.file_with_name('MyObjcClass.h')
+
+        self.assertEqual([(t.type_identifier, t.name) for t in objc_file.objc_types],
+                         [('macro_constant', 'myDefinedStringConstant'),
+                          ('macro_constant', 'myDefinedFloatConstant'),
+                          ('macro_constant', 'myDefinedParameterConstant'),
+                          ('constant', 'myObjcExternConstant'),
+                          ('constant', 'myStaticConstant'),
+                          ('protocol', 'MyObjcProtocol'),
+                          ('enum', 'MyDirectObjcEnum'),
+                          ('enum', 'ValidationState'),
+                          ('class', 'ObjcViewController')])
+        self.assertEqual([(i.class_name, i.super_class_name) for i in objc_file.objc_interfaces],
+                         [('MyObjcClass', 'NSObject'), ('ObjcViewController', 'UIViewController')])
+
+    def _parsed_duplicate_interfaces_xc_project(self, folder_path, jobs):
+        sources = {
+            '/A/Duplicate.h': '@interface Duplicate : NSObject\n@end\n',
+            '/A/Duplicate.m': '@implementation Duplicate\n@end\n',
+            '/B/Duplicate.h': '@interface Duplicate : UIView\n@end\n',
+            '/C/Duplicate.h': '@interface Duplicate : UIViewController\n@end\n',
+        }
+        for (filepath, source) in sources.items():
+            os.makedirs(os.path.dirname(folder_path + filepath), exist_ok=True)
+            with open(folder_path + filepath, 'w') as opened_file:
+                opened_file.write(source)
+
+        files = {filepath: XcFile(filepath) for filepath in sources.keys()}
+        first_target = XcTarget('First', XcTarget.Type.FRAMEWORK, product_name='First', build_configurations=list(),
+                                source_files={files['/A/Duplicate.m']},
+                                header_files={files['/B/Duplicate.h'], files['/A/Duplicate.h']})
+        second_target = XcTarget('Second', XcTarget.Type.FRAMEWORK, product_name='Second', build_configurations=list(),
+                                 source_files={files['/A/Duplicate.m']})
+        xc_project = XcProject(folder_path, 'MyXcProject', build_configurations=list(), targets=[first_target, second_target],
+                               groups=list(), files=set(files.values()))
+
+        project_parser = XcProjectParser(folder_path, verbose=False, cache_active=False, jobs=jobs)
+        project_parser.xc_project = xc_project
+        project_parser.parse_objc_files()
+
+        return xc_project
+
+    def test_xc_project_parser__parse_objc_files__gives_superclass_of_last_interface__with_one_or_several_jobs(self):
+        for jobs in [1, 4]:
+            with tempfile.TemporaryDirectory() as folder_path:
+                xc_project = self._parsed_duplicate_interfaces_xc_project(folder_path, jobs=jobs)
+
+            # Target less header last, after the targets' headers sorted by path
+            objc_class = xc_project.file_with_path('/A/Duplicate.m').objc_classes[0]
+            self.assertEqual(objc_class.super_class_name, 'UIViewController', jobs)
+
+            for filepath in ['/A/Duplicate.h', '/B/Duplicate.h', '/C/Duplicate.h']:
+                self.assertEqual(len(xc_project.file_with_path(filepath).objc_interfaces), 1, jobs)
+
+    def test_xc_project_parser__parse_objc_files__gives_same_types__with_spawned_processes(self):
+        results = list()
+
+        for (jobs, start_method) in [(1, None), (2, 'spawn')]:
+            project_parser = XcProjectParser(SampleXcodeProjectFixture().project_folder_path, verbose=False, cache_active=False,
+                                             jobs=jobs, start_method=start_method)
+            project_parser.load()
+            project_parser.parse_objc_files()
+
+            results.append(sorted((f.filepath, [(t.type_identifier, t.name) for t in f.objc_types])
+                                  for f in project_parser.xc_project.target_objc_files))
+
+        self.assertTrue(results[0])
+        self.assertEqual(results[0], results[1])
+
+    # parse_objc_files - cache
+
+    def test_xc_project_parser__parse_objc_files__reuses_cached_results__when_files_unchanged(self):
+        path = SampleXcodeProjectFixture().project_folder_path
+
+        with tempfile.TemporaryDirectory() as cache_folder_path:
+            first_parser = XcProjectParser(path, verbose=False, cache_folder_path=cache_folder_path)
+            first_parser.load()
+            first_parser.parse_objc_files()
+
+            second_parser = XcProjectParser(path, verbose=False, cache_folder_path=cache_folder_path, jobs=1)
+            second_parser.load()
+            with mock.patch('xcanalyzer.xcodeproject.parsers.objc_file_declarations') as objc_file_declarations:
+                second_parser.parse_objc_files()
+
+        self.assertFalse(objc_file_declarations.called)
+
+        first_types = sorted([(t.type_identifier, t.name, t.super_class_name, t.file.filepath) for t in first_parser.xc_project.target_objc_types])
+        second_types = sorted([(t.type_identifier, t.name, t.super_class_name, t.file.filepath) for t in second_parser.xc_project.target_objc_types])
+        self.assertTrue(second_types)
+        self.assertEqual(first_types, second_types)
+
+    # _find_files_that_contains
+
+    def test_xc_project_parser__find_files_that_contains__gives_same_occurrences_as_one_regex_by_type(self):
+        path = SampleXcodeProjectFixture().project_folder_path
+        project_parser = XcProjectParser(path, verbose=False, cache_active=False)
+        project_parser.load()
+        project_parser.parse_objc_files()
+
+        objc_types = set(project_parser.xc_project.target_objc_types)
+        source_files = project_parser.xc_project.source_files
+
+        occurrences = project_parser._find_files_that_contains(objc_types, source_files)
+        expected_occurrences = legacy_find_files_that_contains(project_parser, objc_types, source_files)
+
+        self.assertEqual(occurrences_summary(occurrences), occurrences_summary(expected_occurrences))
+        self.assertTrue([o for o in occurrences if o.source_files_that_use])
+
+    def test_xc_project_parser__find_files_that_contains__gives_same_occurrences__with_one_or_several_jobs(self):
+        results = list()
+
+        for (jobs, start_method) in [(1, None), (4, None), (2, 'spawn')]:
+            project_parser = self._parsed_sample_xc_project_parser(jobs=jobs, start_method=start_method)
+            project_parser.parse_objc_files()
+            xc_project = project_parser.xc_project
+
+            swift_objc_types = set(xc_project.target_objc_types) | set(xc_project.target_swift_types)
+            occurrences = project_parser._find_files_that_contains(swift_objc_types, xc_project.source_files)
+            results.append(occurrences_summary(occurrences))
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+    # _find_types_that_contains
+
+    def test_xc_project_parser__find_types_that_contains__gives_same_occurrences__with_one_or_several_jobs(self):
+        results = list()
+
+        for (jobs, start_method) in [(1, None), (4, None), (2, 'spawn')]:
+            project_parser = self._parsed_sample_xc_project_parser(jobs=jobs, start_method=start_method)
+            xc_project = project_parser.xc_project
+
+            swift_types = set(xc_project.target_swift_types)
+            with mock.patch('builtins.print'):
+                occurrences = project_parser._find_types_that_contains(swift_types, xc_project.source_files)
+
+            results.append(sorted((o.swift_or_objc_type.fullname,
+                                   o.swift_or_objc_type.file.filepath,
+                                   o.occurrences_count_in_type_body,
+                                   sorted(t.fullname for t in o.swift_objc_types_that_use),
+                                   sorted(f.filepath for f in o.files_that_use)) for o in occurrences))
+
+        self.assertTrue([r for r in results[0] if r[3] or r[4]])
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(results[0], results[2])
+
+
+class FileOccurrencesTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _source_filepath(self, content):
+        filepath = os.path.join(self.temporary_directory.name, 'MyFile.swift')
+
+        with open(filepath, 'w') as opened_file:
+            opened_file.write(content)
+
+        return filepath
+
+    # file_lines_matching_names
+
+    def test_file_lines_matching_names__gives_lines_of_dotted_names__outside_comments_and_strings(self):
+        filepath = self._source_filepath('\n'.join([
+            'extension Outer.Inner {}',
+            '// Outer.Inner',
+            'let a = "Outer.Inner"; let b = Outer . Inner()',
+            'let c = Outer.Other',
+        ]))
+
+        self.assertEqual(file_lines_matching_names(names_by_first_part(['Outer.Inner']), filepath), {'Outer.Inner': [1, 3]})
+
+    # swift_file_type_occurrences
+
+    def test_swift_file_type_occurrences__gives_occurrences_by_enclosing_type(self):
+        searched_types = (('class', 'MyClass', 'MyClass'), ('struct', 'MyStruct', 'MyStruct'))
+        filepath = self._source_filepath('\n'.join([
+            'class MyClass {',
+            '    let value: MyStruct',
+            '    static let shared = MyClass(); let other = MyClass()',
+            '    let text = "}"',
+            '}',
+            'struct MyStruct { /* MyClass */ }',
+            'let global = MyStruct()',
+        ]))
+
+        results = swift_file_type_occurrences(searched_types_indexes(searched_types), filepath)
+
+        self.assertEqual(results[0], [1, set(), False])
+        self.assertEqual(results[1], [0, {0}, True])
+
+    def test_swift_file_type_occurrences__gives_occurrences_of_fullname__after_its_outer_types(self):
+        searched_types = (('struct', 'Inner', 'Outer.Inner'),)
+        filepath = self._source_filepath('\n'.join([
+            'let a: Other.Inner',
+            'let b = [Outer.Inner]()',
+            'let c: Inner',
+        ]))
+
+        self.assertEqual(swift_file_type_occurrences(searched_types_indexes(searched_types), filepath), {0: [0, set(), True]})
+        self.assertEqual(swift_file_type_occurrences(searched_types_indexes(searched_types + (('class', 'Deep', 'A.B.Deep'),)), filepath), {0: [0, set(), True]})
+
 
 class SwiftCodeParserTests(TestCase):
     
@@ -0,0 +1,74 @@
+from unittest import TestCase
+
+import os
+import pstats
+import tempfile
+import time
+from unittest import mock
+
+from ..profilers import Profiler, StackSampler, script_profiler
+
+
+def busy_function(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+class ProfilerTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.prefix = os.path.join(self.temporary_directory.name, 'profile')
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    # write
+
+    def test_write__gives_pstats_and_collapsed_stacks(self):
+        with Profiler(self.prefix, sampling_interval=0.001) as profiler:
+            busy_function(0.05)
+
+        filepaths = profiler.write()
+
+        stats = pstats.Stats(self.prefix + '.pstats')
+        self.assertTrue([f for f in stats.stats if f[2] == 'busy_function'])
+
+        if StackSampler.is_available():
+            self.assertEqual(filepaths, [self.prefix + '.pstats', self.prefix + '.collapsed'])
+            with open(self.prefix + '.collapsed') as collapsed_file:
+                lines = collapsed_file.read().splitlines()
+            self.assertTrue([l for l in lines if 'busy_function (test_profilers.py:' in l])
+            self.assertTrue(all(int(l.rsplit(' ', 1)[1]) > 0 for l in lines))
+
+    def test_write__gives_memory_peak_and_top_allocations(self):
+        with Profiler(memory_prefix=self.prefix) as profiler:
+            allocated = [bytearray(1024) for _ in range(1000)]
+
+        self.assertEqual(profiler.write(), [self.prefix + '.memory.txt'])
+        self.assertGreaterEqual(profiler.memory_peak, 1000 * 1024)
+
+        with open(self.prefix + '.memory.txt') as memory_file:
+            lines = memory_file.read().splitlines()
+        self.assertTrue(lines[0].startswith('Peak traced memory: '))
+        self.assertIn('test_profilers.py', lines[1])
+        del allocated
+
+    # output
+
+    def test_output__prints_summary_and_written_files(self):
+        profiler = Profiler(self.prefix)
+        profiler.start()
+        busy_function(0.01)
+
+        with mock.patch('builtins.print') as print_mock:
+            profiler.output()
+
+        printed_lines = [c[0][0] for c in print_mock.call_args_list if c[0]]
+        self.assertIn('Profile written: {}.pstats'.format(self.prefix), printed_lines)
+
+    # script_profiler
+
+    def test_script_profiler__gives_none__without_prefix(self):
+        self.assertIsNone(script_profiler(None, None))
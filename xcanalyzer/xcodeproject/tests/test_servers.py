@@ -0,0 +1,130 @@
+from unittest import TestCase
+
+import os
+import stat
+import tempfile
+import threading
+
+from ..exceptions import XcodeProjectReadException
+from ..servers import AnalysisClient, AnalysisServer, default_socket_path, make_private_folder, user_socket_folder_path
+from .fixtures import SampleXcodeProjectFixture
+
+
+class AnalysisServerTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.socket_path = os.path.join(self.temporary_directory.name, 'server.sock')
+
+        self.server = AnalysisServer(SampleXcodeProjectFixture().project_folder_path,
+                                     socket_path=self.socket_path,
+                                     swift_backend='native',
+                                     cache_active=False,
+                                     verbose=False)
+        self.server.load()
+
+        self.thread = threading.Thread(target=self.server.serve)
+        self.thread.start()
+
+        # The socket accepts connections once restricted to the current user
+        self.client = AnalysisClient(socket_path=self.socket_path)
+        while not self._answers_ping():
+            self.thread.join(0.01)
+
+    def _answers_ping(self):
+        try:
+            self.client.query('ping')
+        except XcodeProjectReadException:
+            return False
+        return True
+
+    def tearDown(self):
+        if self.thread.is_alive():
+            self.client.query('stop')
+        self.thread.join()
+
+        self.temporary_directory.cleanup()
+
+    # queries
+
+    def test_ping__returns_project_summary(self):
+        result = self.client.query('ping')
+
+        self.assertEqual(result['project'], 'SampleiOSApp.xcodeproj')
+        self.assertEqual(result['targets'], len(self.server.xc_project.targets))
+
+    def test_types__returns_types_of_target(self):
+        result = self.client.query('types', target='SampleiOSApp', languages=['swift'])
+
+        expected_names = {t.fullname for t in self.server.xc_project.target_with_name('SampleiOSApp').swift_types}
+        self.assertEqual({t['fullname'] for t in result}, expected_names)
+        self.assertEqual({t['language'] for t in result}, {'swift'})
+
+    def test_orphans__returns_files_not_referenced_in_project(self):
+        result = self.client.query('orphans', mode='project')
+
+        self.assertIn('BadPlacedRootFile.swift', result)
+
+    def test_report__returns_output_of_script(self):
+        result = self.client.query('report', script='find-orphan-files', mode='project')
+
+        self.assertEqual(result.splitlines(), self.client.query('orphans', mode='project'))
+
+    def test_report__returns_dead_types_of_app(self):
+        result = self.client.query('report', script='find-dead-types', app='SampleiOSApp')
+
+        self.assertIn('MyObjcProtocol [protocol]', result)
+
+    # socket
+
+    def test_socket__is_only_accessible_by_current_user(self):
+        self.assertEqual(stat.S_IMODE(os.stat(self.socket_path).st_mode), 0o600)
+
+    # errors
+
+    def test_query__raises_exception__when_query_not_supported(self):
+        with self.assertRaises(XcodeProjectReadException):
+            self.client.query('unknown')
+
+    def test_query__raises_exception__when_target_not_found(self):
+        with self.assertRaises(XcodeProjectReadException):
+            self.client.query('types', target='MissingTarget')
+
+    def test_stop__stops_server__and_removes_socket(self):
+        self.assertEqual(self.client.query('stop'), True)
+
+        self.thread.join()
+        self.assertFalse(os.path.exists(self.socket_path))
+
+
+class AnalysisClientTests(TestCase):
+
+    def test_query__raises_exception__when_no_server(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            client = AnalysisClient(socket_path=os.path.join(folder_path, 'server.sock'))
+
+            with self.assertRaises(XcodeProjectReadException):
+                client.query('ping')
+
+    def test_default_socket_path__is_same__for_same_project_folder(self):
+        self.assertEqual(default_socket_path('MyFolder/'), default_socket_path('MyFolder'))
+        self.assertNotEqual(default_socket_path('MyFolder'), default_socket_path('MyOtherFolder'))
+
+    def test_default_socket_path__is_in_folder_of_current_user(self):
+        self.assertEqual(os.path.dirname(default_socket_path('MyFolder')), user_socket_folder_path())
+        self.assertIn(str(os.getuid()), os.path.basename(user_socket_folder_path()))
+
+    def test_make_private_folder__creates_folder_only_accessible_by_current_user(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            socket_folder_path = os.path.join(folder_path, 'sockets')
+
+            make_private_folder(socket_folder_path)
+
+            self.assertEqual(stat.S_IMODE(os.stat(socket_folder_path).st_mode), 0o700)
+
+    def test_make_private_folder__raises_exception__when_folder_accessible_by_others(self):
+        with tempfile.TemporaryDirectory() as folder_path:
+            os.chmod(folder_path, 0o755)
+
+            with self.assertRaises(XcodeProjectReadException):
+                make_private_folder(folder_path)
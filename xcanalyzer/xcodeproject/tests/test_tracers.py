@@ -0,0 +1,143 @@
+from unittest import TestCase
+
+import json
+import os
+import tempfile
+
+from ..parsers import XcProjectParser
+from ..tracers import NullTracer, Tracer
+from .fixtures import SampleXcodeProjectFixture, SourceKittenStubFixture
+
+
+class TracerTests(TestCase):
+
+    # span
+
+    def test_span__gives_nested_spans_with_their_path_and_duration(self):
+        tracer = Tracer()
+
+        with tracer.span('load'):
+            with tracer.span('groups', count=2):
+                pass
+        with tracer.span('parse'):
+            pass
+
+        self.assertEqual([(s.path, s.depth) for s in tracer.spans], [('load', 0), ('load/groups', 1), ('parse', 0)])
+        self.assertEqual(tracer.spans[1].arguments, {'count': 2})
+        self.assertTrue(all(s.duration >= 0 for s in tracer.spans))
+
+    def test_span__closes_span__when_exception_is_raised(self):
+        tracer = Tracer()
+
+        with self.assertRaises(ValueError):
+            with tracer.span('load'):
+                raise ValueError()
+
+        with tracer.span('parse'):
+            pass
+
+        self.assertIsNotNone(tracer.spans[0].duration)
+        self.assertEqual(tracer.spans[1].path, 'parse')
+
+    # count
+
+    def test_count_bytes__adds_sizes_of_existing_files(self):
+        tracer = Tracer()
+
+        with tempfile.TemporaryDirectory() as folder_path:
+            filepath = os.path.join(folder_path, 'File.swift')
+            with open(filepath, 'w') as opened_file:
+                opened_file.write('class A {}\n')
+
+            tracer.count_bytes('swift_bytes', [filepath, os.path.join(folder_path, 'Missing.swift')])
+        tracer.count('swift_files', 2)
+
+        self.assertEqual(tracer.counters, {'swift_bytes': 11, 'swift_files': 2})
+
+    # chrome_trace
+
+    def test_chrome_trace__gives_complete_events_and_counters(self):
+        tracer = Tracer()
+
+        with tracer.span('load'):
+            tracer.count('files', 3)
+
+        chrome_trace = json.loads(json.dumps(tracer.chrome_trace()))
+
+        self.assertEqual([(e['name'], e['ph']) for e in chrome_trace['traceEvents']], [('load', 'X'), ('counters', 'C')])
+        self.assertGreaterEqual(chrome_trace['traceEvents'][0]['dur'], 0)
+        self.assertEqual(chrome_trace['otherData']['counters'], {'files': 3})
+
+    # summary_lines
+
+    def test_summary_lines__gives_spans_merged_by_path_under_their_parent(self):
+        tracer = Tracer()
+
+        with tracer.span('parse'):
+            with tracer.span('scan'):
+                pass
+        with tracer.span('find'):
+            pass
+        with tracer.span('parse'):
+            with tracer.span('save'):
+                pass
+
+        span_lines = tracer.summary_lines()[1:5]
+
+        self.assertEqual([l.split()[0] for l in span_lines], ['parse', 'scan', 'save', 'find'])
+        self.assertEqual(span_lines[0].split()[1], '2')
+
+    # NullTracer
+
+    def test_null_tracer__records_nothing(self):
+        tracer = NullTracer()
+
+        with tracer.span('load'):
+            tracer.count('files')
+
+        self.assertEqual(tracer.spans, [])
+        self.assertEqual(tracer.counters, {})
+
+
+class XcProjectParserTracingTests(TestCase):
+
+    def setUp(self):
+        self.tracer = Tracer()
+        self.project_parser = XcProjectParser(SampleXcodeProjectFixture().project_folder_path,
+                                              verbose=False,
+                                              cache_active=False,
+                                              jobs=1,
+                                              tracer=self.tracer)
+
+    def _span_paths(self):
+        return {s.path for s in self.tracer.spans}
+
+    def test_load__traces_build_phases_and_counts_project_objects(self):
+        self.project_parser.load()
+
+        self.assertTrue({'load', 'load/decode_pbxproj', 'load/build_project/groups', 'load/build_project/targets'} <= self._span_paths())
+        self.assertEqual(self.tracer.counters['targets'], len(self.project_parser.xc_project.targets))
+        self.assertGreater(self.tracer.counters['pbxproj_bytes'], 0)
+
+    def test_parse_files__traces_parsing_and_counts_files_types_and_subprocesses(self):
+        self.project_parser.load()
+        with SourceKittenStubFixture().stub_on_path():
+            self.project_parser.parse_swift_files()
+        self.project_parser.parse_objc_files()
+
+        self.assertTrue({'parse_swift_files/read_swift_structures', 'parse_objc_files/scan_objc_files'} <= self._span_paths())
+
+        swift_files_count = self.tracer.counters['swift_files_parsed']
+        self.assertGreater(swift_files_count, 0)
+        self.assertEqual(self.tracer.counters['subprocess_calls'], swift_files_count)
+        self.assertGreater(self.tracer.counters['swift_bytes_parsed'], 0)
+        self.assertGreater(self.tracer.counters['objc_types_parsed'], 0)
+
+    def test_find_type_and_occurrences_from_files__traces_token_indexing(self):
+        self.project_parser.load()
+        self.project_parser.parse_objc_files()
+
+        self.project_parser.find_type_and_occurrences_from_files('MyObjcClass')
+
+        self.assertIn('find_files_that_contains/index_tokens', self._span_paths())
+        self.assertGreater(self.tracer.counters['files_indexed'], 0)
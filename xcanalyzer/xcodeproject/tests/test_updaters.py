@@ -0,0 +1,168 @@
+from unittest import TestCase
+
+import os
+import shutil
+import tempfile
+
+from ..parsers import XcProjectParser
+from ..updaters import PollWatcher, ProjectUpdater
+from .fixtures import SampleXcodeProjectFixture
+
+
+class PollWatcherTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.filepath = os.path.join(self.temporary_directory.name, 'MyFile.swift')
+        self._write(self.filepath, 'class MyClass {}\n')
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _write(self, filepath, content, mtime=None):
+        with open(filepath, 'w') as opened_file:
+            opened_file.write(content)
+
+        if mtime is not None:
+            os.utime(filepath, ns=(mtime, mtime))
+
+    # poll
+
+    def test_poll__returns_nothing__when_no_file_changed(self):
+        watcher = PollWatcher([self.filepath])
+
+        self.assertEqual(watcher.poll(), set())
+
+    def test_poll__returns_modified_file__once(self):
+        watcher = PollWatcher([self.filepath])
+
+        self._write(self.filepath, 'class MyOtherClass {}\n', mtime=10 ** 18)
+
+        self.assertEqual(watcher.poll(), {self.filepath})
+        self.assertEqual(watcher.poll(), set())
+
+    def test_poll__returns_created_and_removed_files(self):
+        new_filepath = os.path.join(self.temporary_directory.name, 'MyNewFile.swift')
+        watcher = PollWatcher([self.filepath, new_filepath])
+
+        self._write(new_filepath, 'class MyNewClass {}\n')
+        os.remove(self.filepath)
+
+        self.assertEqual(watcher.poll(), {self.filepath, new_filepath})
+
+    # watch
+
+    def test_watch__keeps_state_of_already_watched_files(self):
+        watcher = PollWatcher([self.filepath])
+
+        self._write(self.filepath, 'class MyOtherClass {}\n', mtime=10 ** 18)
+        watcher.watch([self.filepath])
+
+        self.assertEqual(watcher.poll(), {self.filepath})
+
+
+class ProjectUpdaterTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.project_folder_path = os.path.join(self.temporary_directory.name, 'SampleiOSApp')
+        shutil.copytree(SampleXcodeProjectFixture().project_folder_path, self.project_folder_path)
+
+        self.reader = XcProjectParser(self.project_folder_path, verbose=False, cache_active=False, swift_backend='native')
+        self.reader.load()
+        self.reader.parse_swift_files()
+        self.reader.parse_objc_files()
+
+        self.updater = ProjectUpdater(self.reader)
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _path(self, filepath):
+        return ''.join([self.project_folder_path, filepath])
+
+    def _append(self, filepath, content):
+        with open(self._path(filepath), 'a') as opened_file:
+            opened_file.write(content)
+
+        os.utime(self._path(filepath), ns=(10 ** 18, 10 ** 18))
+
+    def _swift_types_of(self, filepath):
+        return self.reader.xc_project.file_with_path(filepath).swift_types
+
+    # update - source files
+
+    def test_update__parses_again_changed_swift_file_only(self):
+        unchanged_types = self._swift_types_of('/SampleCore/Normal/MyClass+Extension.swift')
+        self._append('/SampleCore/Normal/MyTypes.swift', '\nclass MyNewClass {}\n')
+
+        updated_files = self.updater.update([self._path('/SampleCore/Normal/MyTypes.swift')])
+
+        self.assertEqual([f.filepath for f in updated_files], ['/SampleCore/Normal/MyTypes.swift'])
+        self.assertEqual([t.name for t in self.reader.xc_project.types_with_name('MyNewClass')], ['MyNewClass'])
+        self.assertIs(self._swift_types_of('/SampleCore/Normal/MyClass+Extension.swift'), unchanged_types)
+
+    def test_update__invalidates_view_controllers__when_objc_file_changed(self):
+        sample_core = self.reader.xc_project.target_with_name('SampleCore')
+        self.assertNotIn('MyNewViewController', {vc.name for vc in sample_core.view_controllers})
+
+        self._append('/SampleCore/Normal/MyObjcClass.m', '\n@interface MyNewViewController : UIViewController\n@end\n'
+                                                         '\n@implementation MyNewViewController\n@end\n')
+        self.updater.update([self._path('/SampleCore/Normal/MyObjcClass.m')])
+
+        self.assertIn('MyNewViewController', {vc.name for vc in sample_core.view_controllers})
+
+    def test_update__removes_types__when_file_removed(self):
+        os.remove(self._path('/SampleCore/Normal/MyTypes.swift'))
+
+        self.updater.update([self._path('/SampleCore/Normal/MyTypes.swift')])
+
+        self.assertEqual(self._swift_types_of('/SampleCore/Normal/MyTypes.swift'), [])
+        self.assertEqual(self.reader.xc_project.types_with_name('MyStruct'), [])
+
+    def test_update__removes_occurrences__when_file_removed(self):
+        self.assertIn('/SampleCore/Normal/Uses.swift',
+                      {f.filepath for f in self.reader.find_type_and_occurrences_from_files('MySwiftClass').source_files_that_use})
+
+        os.remove(self._path('/SampleCore/Normal/Uses.swift'))
+        self.updater.poll()
+
+        occurrence = self.reader.find_type_and_occurrences_from_files('MySwiftClass')
+
+        self.assertNotIn('/SampleCore/Normal/Uses.swift', {f.filepath for f in occurrence.source_files_that_use})
+
+    def test_update__ignores_files_out_of_project(self):
+        updated_files = self.updater.update([self._path('/README.md'), '/MyFolder/MyFile.swift'])
+
+        self.assertEqual(updated_files, [])
+
+    # update - pbxproj
+
+    def test_update__loads_project_again__and_keeps_types_of_unchanged_files__when_pbxproj_changed(self):
+        previous_project = self.reader.xc_project
+        unchanged_types = self._swift_types_of('/SampleCore/Normal/MyTypes.swift')
+
+        # MyClass+Extension.swift removed from the sources of SampleCore
+        with open(self.reader.pbxproj_path) as opened_file:
+            content = opened_file.read()
+        with open(self.reader.pbxproj_path, 'w') as opened_file:
+            opened_file.write(content.replace('DF64A40B226F8F2700B0833F /* MyClass+Extension.swift in Sources */,\n', ''))
+
+        updated_files = self.updater.update([self.reader.pbxproj_path])
+
+        self.assertIsNot(self.reader.xc_project, previous_project)
+        self.assertEqual(updated_files, [])
+        self.assertIs(self._swift_types_of('/SampleCore/Normal/MyTypes.swift'), unchanged_types)
+        self.assertIs(unchanged_types[0].file, self.reader.xc_project.file_with_path('/SampleCore/Normal/MyTypes.swift'))
+        self.assertNotIn('/SampleCore/Normal/MyClass+Extension.swift',
+                         {f.filepath for f in self.reader.xc_project.target_with_name('SampleCore').swift_files})
+
+    # poll
+
+    def test_poll__updates_project_from_changed_files(self):
+        self._append('/SampleCore/Normal/MyTypes.swift', '\nclass MyNewClass {}\n')
+
+        updated_files = self.updater.poll()
+
+        self.assertEqual([f.filepath for f in updated_files], ['/SampleCore/Normal/MyTypes.swift'])
+        self.assertEqual(self.updater.poll(), [])
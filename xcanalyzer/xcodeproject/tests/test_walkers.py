@@ -0,0 +1,63 @@
+from unittest import TestCase
+
+import os
+import tempfile
+
+from ..walkers import FolderWalker
+
+
+class FolderWalkerTests(TestCase):
+
+    def setUp(self):
+        self.temporary_directory = tempfile.TemporaryDirectory()
+        self.folder_path = self.temporary_directory.name
+
+        for dirpath in ['A/B', 'A/Pods/Pod', 'C/D/E', 'C/F', 'G', '.git/objects']:
+            os.makedirs(os.path.join(self.folder_path, dirpath))
+        for filepath in ['A/File.swift', 'A/Pods/Pod/File.m', 'C/D/E/File.h', 'G/.hidden']:
+            open(os.path.join(self.folder_path, filepath), 'w').close()
+
+    def tearDown(self):
+        self.temporary_directory.cleanup()
+
+    def _walked(self, walker):
+        return walker.map(lambda dirpath, dirnames, filenames: (dirpath, sorted(dirnames), sorted(filenames)))
+
+    # map
+
+    def test_map__gives_same_folders_as_os_walk__in_same_order(self):
+        expected = [(dirpath[len(self.folder_path):], sorted(dirnames), sorted(filenames))
+                    for (dirpath, dirnames, filenames) in os.walk(self.folder_path)]
+
+        self.assertEqual(self._walked(FolderWalker(self.folder_path, jobs=1)), expected)
+        self.assertEqual(self._walked(FolderWalker(self.folder_path, jobs=4)), expected)
+
+    def test_map__does_not_walk_ignored_folders__but_lists_them(self):
+        walker = FolderWalker(self.folder_path, ignored_dirpaths={'C/D'}, ignored_dirs={'Pods', '.git'})
+
+        walked = self._walked(walker)
+
+        self.assertEqual(sorted(w[0] for w in walked), ['', '/A', '/A/B', '/C', '/C/F', '/G'])
+        self.assertIn(('/A', ['B', 'Pods'], ['File.swift']), walked)
+
+    def test_map__does_not_walk_folders_removed_from_dirnames(self):
+        def function(dirpath, dirnames, filenames):
+            if dirpath == '/C':
+                dirnames.remove('D')
+            return dirpath
+
+        walked = FolderWalker(self.folder_path, jobs=1).map(function)
+
+        self.assertNotIn('/C/D', walked)
+        self.assertIn('/C/F', walked)
+
+    def test_map__does_not_walk_symbolic_links_to_folders(self):
+        os.symlink(os.path.join(self.folder_path, 'C'), os.path.join(self.folder_path, 'G', 'LinkToC'))
+
+        walked = self._walked(FolderWalker(self.folder_path))
+
+        self.assertIn(('/G', ['LinkToC'], ['.hidden']), walked)
+        self.assertNotIn('/G/LinkToC', [w[0] for w in walked])
+
+    def test_map__returns_nothing__when_folder_not_found(self):
+        self.assertEqual(FolderWalker(os.path.join(self.folder_path, 'Missing')).map(lambda *args: args), [])
@@ -0,0 +1,186 @@
+import atexit
+import collections
+import contextlib
+import json
+import os
+import sys
+import threading
+import time
+
+
+class TraceSpan():
+    """ Timed span of a tracer, without duration while it is open. """
+
+    def __init__(self, name, path, depth, start, thread_id, arguments):
+        self.name = name
+        self.path = path
+        self.depth = depth
+        self.start = start
+        self.duration = None
+        self.thread_id = thread_id
+        self.arguments = arguments
+
+
+class Tracer():
+    """ Recorder of nested timed spans and of counters, written as a Chrome trace or printed as a summary table.
+
+    Spans are opened with `with tracer.span(name):`, a span opened in another one
+    being nested in it. Counters are incremented with `tracer.count(name, value)`.
+    """
+
+    def __init__(self):
+        self.started_at = time.perf_counter()
+        self.spans = list()
+        self.counters = collections.Counter()
+
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _open_spans(self):
+        if not hasattr(self._local, 'open_spans'):
+            self._local.open_spans = list()
+        return self._local.open_spans
+
+    @contextlib.contextmanager
+    def span(self, name, **arguments):
+        """ Context of a timed span, with optional arguments shown in the trace. """
+        open_spans = self._open_spans()
+        path = '{}/{}'.format(open_spans[-1].path, name) if open_spans else name
+
+        trace_span = TraceSpan(name, path, len(open_spans), time.perf_counter(), threading.get_ident(), arguments)
+        with self._lock:
+            self.spans.append(trace_span)
+
+        open_spans.append(trace_span)
+        try:
+            yield trace_span
+        finally:
+            trace_span.duration = time.perf_counter() - trace_span.start
+            open_spans.pop()
+
+    def count(self, name, value=1):
+        with self._lock:
+            self.counters[name] += value
+
+    def count_bytes(self, name, filepaths):
+        """ Counts the sizes of the files, the missing ones being skipped. """
+        total_size = 0
+        for filepath in filepaths:
+            try:
+                total_size += os.path.getsize(filepath)
+            except OSError:
+                pass
+
+        self.count(name, total_size)
+
+    # Output
+
+    def chrome_trace(self):
+        """ Trace in the Chrome trace event format, readable by `chrome://tracing` and Perfetto. """
+        process_id = os.getpid()
+        end = time.perf_counter()
+
+        events = list()
+        for trace_span in self.spans:
+            duration = trace_span.duration if trace_span.duration is not None else end - trace_span.start
+            events.append({
+                'name': trace_span.name,
+                'cat': trace_span.path.split('/')[0],
+                'ph': 'X',
+                'ts': (trace_span.start - self.started_at) * 1e6,
+                'dur': duration * 1e6,
+                'pid': process_id,
+                'tid': trace_span.thread_id,
+                'args': trace_span.arguments,
+            })
+
+        if self.counters:
+            events.append({
+                'name': 'counters',
+                'ph': 'C',
+                'ts': (end - self.started_at) * 1e6,
+                'pid': process_id,
+                'args': dict(self.counters),
+            })
+
+        return {
+            'traceEvents': events,
+            'displayTimeUnit': 'ms',
+            'otherData': {'counters': dict(self.counters), 'total_seconds': end - self.started_at},
+        }
+
+    def write_chrome_trace(self, filepath):
+        with open(filepath, 'w') as trace_file:
+            json.dump(self.chrome_trace(), trace_file, indent=1)
+
+    def summary_lines(self):
+        """ Lines of the table of the spans, merged by path, then of the counters. """
+        total_seconds = time.perf_counter() - self.started_at
+
+        calls_by_path = collections.Counter()
+        seconds_by_path = collections.Counter()
+        first_spans = dict()
+        for trace_span in self.spans:
+            calls_by_path[trace_span.path] += 1
+            seconds_by_path[trace_span.path] += trace_span.duration or 0.0
+            first_spans.setdefault(trace_span.path, trace_span)
+
+        # Spans under their parent span, in the order they were first opened
+        first_indexes = {path: index for (index, path) in enumerate(first_spans)}
+
+        def tree_order(path):
+            parts = path.split('/')
+            return [first_indexes['/'.join(parts[:i + 1])] for i in range(len(parts))]
+
+        lines = ['{:<40} {:>7} {:>10} {:>6}'.format('Span', 'Calls', 'Seconds', '%')]
+        for path in sorted(first_spans, key=tree_order):
+            trace_span = first_spans[path]
+            lines.append('{:<40} {:>7} {:>10.4f} {:>6.1f}'.format('  ' * trace_span.depth + trace_span.name,
+                                                                  calls_by_path[path],
+                                                                  seconds_by_path[path],
+                                                                  100 * seconds_by_path[path] / total_seconds if total_seconds else 0.0))
+        lines.append('{:<40} {:>7} {:>10.4f}'.format('Total', '', total_seconds))
+
+        if self.counters:
+            lines.append('')
+            lines.append('{:<40} {:>18}'.format('Counter', 'Value'))
+            for (name, value) in sorted(self.counters.items()):
+                lines.append('{:<40} {:>18}'.format(name, value))
+
+        return lines
+
+    def print_summary(self, file=None):
+        for line in self.summary_lines():
+            print(line, file=file or sys.stderr)
+
+    def output(self, destination):
+        """ Writes the Chrome trace to the destination file, or prints the summary table to stderr when it is `-`. """
+        if destination == '-':
+            self.print_summary()
+        else:
+            self.write_chrome_trace(destination)
+
+
+class NullTracer(Tracer):
+    """ Tracer recording nothing, used when tracing is not asked. """
+
+    @contextlib.contextmanager
+    def span(self, name, **arguments):
+        yield None
+
+    def count(self, name, value=1):
+        pass
+
+    def count_bytes(self, name, filepaths):
+        pass
+
+
+def script_tracer(destination):
+    """ Tracer written to the destination when the script exits, as `Tracer.output` does, or a null tracer without destination. """
+    if not destination:
+        return NullTracer()
+
+    tracer = Tracer()
+    atexit.register(tracer.output, destination)
+
+    return tracer
@@ -0,0 +1,116 @@
+import os
+
+from .parsers import ObjcFileParser, SwiftFileParser
+
+
+class PollWatcher():
+    """ Watcher of files, giving at each poll the files modified, created or removed since the previous poll.
+
+    A file is considered modified when its modification time or its size changed.
+    """
+
+    def __init__(self, filepaths=()):
+        self.stats = dict()
+        self.watch(filepaths)
+
+    def _stat(self, filepath):
+        try:
+            stat = os.stat(filepath)
+        except FileNotFoundError:
+            return None
+
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def watch(self, filepaths):
+        """ Sets the watched files. Already watched files keep the state of the previous poll. """
+        self.stats = {f: self.stats[f] if f in self.stats else self._stat(f) for f in filepaths}
+
+    def poll(self):
+        """ Set of the watched files which changed since the previous poll. """
+        changed_filepaths = set()
+
+        for (filepath, stat) in self.stats.items():
+            new_stat = self._stat(filepath)
+            if new_stat != stat:
+                changed_filepaths.add(filepath)
+                self.stats[filepath] = new_stat
+
+        return changed_filepaths
+
+
+class ProjectUpdater():
+    """ Updates the loaded project of a parser from the paths of the changed files.
+
+    Only the changed source files are parsed again. When the pbxproj file changed,
+    the project is loaded again and the types of the unchanged source files are
+    moved to the new project instead of being parsed again. The paths can be given
+    by the poll watcher of the updater, with `poll`, or by any other watcher, with
+    `update`.
+    """
+
+    def __init__(self, xcode_project_reader):
+        self.xcode_project_reader = xcode_project_reader
+        self.watcher = PollWatcher(self.watched_filepaths())
+
+    def _absolute_path(self, xc_file):
+        return os.path.abspath(self.xcode_project_reader.xc_project.relative_path_for_file(xc_file))
+
+    def watched_filepaths(self):
+        """ Absolute paths of the pbxproj file and of the source files of the project. """
+        filepaths = [self._absolute_path(f) for f in self.xcode_project_reader.xc_project.source_files]
+        filepaths.append(os.path.abspath(self.xcode_project_reader.pbxproj_path))
+
+        return filepaths
+
+    def poll(self):
+        """ Updates the project from the files changed since the previous poll. """
+        return self.update(self.watcher.poll())
+
+    def update(self, changed_filepaths):
+        """ Updates the project from the given changed paths, and returns the source files parsed again, sorted by path.
+
+        The paths of the files out of the project are ignored.
+        """
+        changed_filepaths = {os.path.abspath(f) for f in changed_filepaths}
+        if not changed_filepaths:
+            return []
+
+        if os.path.abspath(self.xcode_project_reader.pbxproj_path) in changed_filepaths:
+            xc_files = self._reload_project(changed_filepaths)
+        else:
+            xc_files = [f for f in self.xcode_project_reader.xc_project.source_files
+                        if self._absolute_path(f) in changed_filepaths]
+            self.xcode_project_reader.update_source_files(xc_files)
+
+        # Source files added to or removed from the project
+        self.watcher.watch(self.watched_filepaths())
+
+        return sorted(xc_files, key=lambda f: f.filepath)
+
+    def _reload_project(self, changed_filepaths):
+        reader = self.xcode_project_reader
+        previous_project = reader.xc_project
+        previous_files_by_path = {f.filepath: f for f in previous_project.source_files}
+
+        reader.load()
+
+        # Types of the unchanged source files
+        parsed_files = list()
+        for xc_file in reader.xc_project.source_files:
+            previous_file = previous_files_by_path.get(xc_file.filepath)
+
+            if previous_file is None or self._absolute_path(xc_file) in changed_filepaths:
+                parsed_files.append(xc_file)
+            elif xc_file.is_swift and previous_file.swift_types is not None:
+                SwiftFileParser(reader.xc_project.dirpath, xc_file).set_swift_types(previous_file.swift_types)
+            elif xc_file.is_objc and previous_file.objc_types is not None:
+                ObjcFileParser(reader.xc_project, xc_file).set_objc_types(previous_file.objc_types,
+                                                                          previous_file.objc_interfaces)
+
+        # New and changed source files
+        if previous_project.swift_files_parsed:
+            reader.parse_swift_files()
+        if previous_project.objc_files_parsed:
+            reader.parse_objc_files()
+
+        return parsed_files
@@ -0,0 +1,98 @@
+import concurrent.futures
+import os
+
+
+class FolderWalker():
+    """ Walker of the folders of a root folder, with paths relative to it: `''` for the root folder, `'/A/B'` below.
+
+    The folders to ignore, by relative path or by name at any level, are not
+    descended into. Each folder is listed once with `os.scandir`, its subfolders,
+    ignored ones included, and its files being given as `os.walk` does.
+    """
+
+    def __init__(self, folder_path, ignored_dirpaths=frozenset(), ignored_dirs=frozenset(), jobs=None):
+        self.folder_path = folder_path
+        self.ignored_dirpaths = {'/{}'.format(p) for p in ignored_dirpaths}
+        self.ignored_dirs = ignored_dirs
+        self.jobs = jobs or os.cpu_count() or 1
+
+    def _listing(self, relative_dirpath):
+        """ Subfolder names, file names and names of the symbolic links to folders of the folder, or None if unreadable. """
+        dirnames = list()
+        filenames = list()
+        linked_dirnames = set()
+
+        try:
+            with os.scandir(self.folder_path + relative_dirpath) as entries:
+                for entry in entries:
+                    try:
+                        is_dir = entry.is_dir()
+                    except OSError:
+                        is_dir = False
+
+                    if not is_dir:
+                        filenames.append(entry.name)
+                        continue
+
+                    dirnames.append(entry.name)
+                    if entry.is_symlink():
+                        linked_dirnames.add(entry.name)
+        except OSError:
+            return None
+
+        return dirnames, filenames, linked_dirnames
+
+    def _subfolder_dirpaths(self, relative_dirpath, dirnames, linked_dirnames):
+        """ Relative paths of the subfolders to descend into: neither ignored nor symbolic links. """
+        results = list()
+
+        for dirname in dirnames:
+            if dirname in self.ignored_dirs or dirname in linked_dirnames:
+                continue
+
+            dirpath = '{}/{}'.format(relative_dirpath, dirname)
+            if dirpath not in self.ignored_dirpaths:
+                results.append(dirpath)
+
+        return results
+
+    def _walk(self, function, relative_dirpath, results):
+        listing = self._listing(relative_dirpath)
+        if listing is None:
+            return results
+
+        dirnames, filenames, linked_dirnames = listing
+        results.append(function(relative_dirpath, dirnames, filenames))
+
+        for dirpath in self._subfolder_dirpaths(relative_dirpath, dirnames, linked_dirnames):
+            self._walk(function, dirpath, results)
+
+        return results
+
+    def map(self, function):
+        """ Results of `function(relative_dirpath, dirnames, filenames)` for each walked folder, in the top-down order of `os.walk`.
+
+        The function can remove names from `dirnames` not to descend into these
+        subfolders. With several jobs, the subfolders of the root folder are walked
+        concurrently on a thread pool, so the function must be thread safe.
+        """
+        listing = self._listing('')
+        if listing is None:
+            return []
+
+        dirnames, filenames, linked_dirnames = listing
+        results = [function('', dirnames, filenames)]
+
+        dirpaths = self._subfolder_dirpaths('', dirnames, linked_dirnames)
+
+        # Listing a folder mostly waits for the file system: a thread pool is enough
+        if self.jobs > 1 and len(dirpaths) > 1:
+            with concurrent.futures.ThreadPoolExecutor(max_workers=self.jobs) as executor:
+                subfolders_results = list(executor.map(lambda p: self._walk(function, p, list()), dirpaths))
+        else:
+            subfolders_results = [self._walk(function, p, list()) for p in dirpaths]
+
+        for subfolder_results in subfolders_results:
+            results.extend(subfolder_results)
+
+        return results